@@ -0,0 +1,175 @@
+"""Benchmark suite for the combination searches and impedance sweeps
+
+Runs a fixed grid of cases over synthetic E12-E192 libraries and sweep
+sizes, records runtime, peak traced memory, nodes visited and result
+counts, and optionally compares them against a stored baseline:
+
+    python -m benchmarks.bench --output results.json
+    python -m benchmarks.bench --compare benchmarks/baseline.json
+    python -m benchmarks.bench --update-baseline
+
+Nodes are the search budget's count: every recursion node plus every
+pair/triple table candidate examined in the search tails. Node counts are
+deterministic, so any increase fails the comparison. Runtime fails only when
+it exceeds the baseline by more than --threshold (a ratio) and by more than
+--min-delta seconds, to keep timer noise out; peak memory likewise fails
+beyond --memory-threshold and --min-memory-delta bytes.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from src.calculator import DecapCalculator
+from src.search import ParallelSearch, SearchBudget, SeriesSearch
+
+BASELINE_PATH = "benchmarks/baseline.json"
+
+def e_series(count: int, decades: int) -> List[float]:
+    """Synthetic E-series library: count values per decade, centred on 1 µF"""
+    start_exponent = -6 - decades // 2
+    digits = 2 if count <= 24 else 3
+    base = [float(f"{10 ** (i / count):.{digits}g}") for i in range(count)]
+    return [b * 10 ** (start_exponent + d) for d in range(decades) for b in base]
+
+def search_cases() -> List[Dict[str, object]]:
+    """Combination search grid over library size and max_components"""
+    cases = []
+    for topology, target in (("parallel", 4.7e-6), ("series", 2.2e-6)):
+        for series_count, decades in ((12, 3), (24, 3), (48, 2), (96, 2), (192, 1)):
+            for max_components in (2, 3, 4):
+                if series_count * decades > 200 and max_components > 3:
+                    continue  # Output-bound and slow; keeps the suite short
+                cases.append({
+                    "name": f"{topology}/E{series_count}x{decades}/k{max_components}",
+                    "kind": topology, "series": series_count, "decades": decades,
+                    "max_components": max_components, "target": target,
+                })
+    return cases
+
+def sweep_cases() -> List[Dict[str, object]]:
+    """Impedance sweep grid over part count and point count"""
+    return [{"name": f"impedance/parts{parts}/points{points}", "kind": "impedance",
+             "parts": parts, "points": points}
+            for parts in (1, 100, 1000) for points in (1000, 10000)
+            if parts * points <= 1_000_000]
+
+def build_case(case: Dict[str, object]) -> Callable[[], Tuple[int, Optional[int]]]:
+    """Return a callable that runs the case and reports (results, nodes)"""
+    if case["kind"] in ("parallel", "series"):
+        library = e_series(case["series"], case["decades"])
+        engine_type = ParallelSearch if case["kind"] == "parallel" else SeriesSearch
+
+        def run() -> Tuple[int, Optional[int]]:
+            budget = SearchBudget()
+            engine = engine_type(library, case["max_components"])
+            found = sum(1 for _ in engine.iter_indices(case["target"], 0.01, budget))
+            return found, budget.nodes
+        return run
+
+    calculator = DecapCalculator()
+    rng = np.random.default_rng(0)
+    caps = 10 ** rng.uniform(-9, -4, case["parts"])
+    esrs = rng.uniform(0.005, 0.05, case["parts"])
+    esls = rng.uniform(0.2e-9, 2e-9, case["parts"])
+
+    def run() -> Tuple[int, Optional[int]]:
+        if case["parts"] == 1:
+            curve = calculator.calculate_impedance_vs_frequency(
+                caps[0], esrs[0], (1e3, 1e9), case["points"], esl=esls[0])
+            return len(curve), None
+        _, z = calculator.calculate_impedance_matrix(caps, esrs, (1e3, 1e9), case["points"], esls)
+        return z.size, None
+    return run
+
+def run_case(case: Dict[str, object], repeat: int = 3) -> Dict[str, object]:
+    """Time a case (best of `repeat`) and measure its peak traced memory"""
+    run = build_case(case)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results, nodes = run()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"name": case["name"], "seconds": min(timings), "peak_bytes": peak,
+            "nodes": nodes, "results": results}
+
+def compare(results: List[Dict[str, object]], baseline: Dict[str, object],
+            threshold: float = 2.0, min_delta: float = 0.005,
+            memory_threshold: float = 1.5, min_memory_delta: int = 65536) -> List[str]:
+    """List regressions of the results against a baseline"""
+    reference = {r["name"]: r for r in baseline.get("results", [])}
+    failures = []
+    for result in results:
+        base = reference.get(result["name"])
+        if base is None:
+            continue
+        if base.get("nodes") is not None and result["nodes"] is not None \
+                and result["nodes"] > base["nodes"]:
+            failures.append(f"{result['name']}: nodes {result['nodes']} > baseline {base['nodes']}")
+        if base.get("results") is not None and result["results"] != base["results"]:
+            failures.append(f"{result['name']}: results {result['results']} != baseline {base['results']}")
+        slower = result["seconds"] - base["seconds"]
+        if result["seconds"] > base["seconds"] * threshold and slower > min_delta:
+            failures.append(f"{result['name']}: {result['seconds'] * 1e3:.2f} ms > "
+                            f"{threshold:g}x baseline {base['seconds'] * 1e3:.2f} ms")
+        if base.get("peak_bytes") is not None \
+                and result["peak_bytes"] > base["peak_bytes"] * memory_threshold \
+                and result["peak_bytes"] - base["peak_bytes"] > min_memory_delta:
+            failures.append(f"{result['name']}: peak {result['peak_bytes'] / 1024:.0f} KiB > "
+                            f"{memory_threshold:g}x baseline {base['peak_bytes'] / 1024:.0f} KiB")
+    return failures
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the calculator hot paths")
+    parser.add_argument("--output", help="write machine-readable results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="fail on regressions against a baseline")
+    parser.add_argument("--update-baseline", action="store_true", help=f"rewrite {BASELINE_PATH}")
+    parser.add_argument("--threshold", type=float, default=2.0, help="allowed runtime ratio")
+    parser.add_argument("--min-delta", type=float, default=0.005,
+                        help="ignore runtime regressions smaller than this many seconds")
+    parser.add_argument("--memory-threshold", type=float, default=1.5, help="allowed peak memory ratio")
+    parser.add_argument("--min-memory-delta", type=int, default=65536,
+                        help="ignore peak memory regressions smaller than this many bytes")
+    parser.add_argument("--repeat", type=int, default=3, help="timing repetitions per case")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    args = parser.parse_args(argv)
+
+    results = []
+    for case in search_cases() + sweep_cases():
+        if args.filter not in case["name"]:
+            continue
+        result = run_case(case, args.repeat)
+        results.append(result)
+        nodes = "-" if result["nodes"] is None else result["nodes"]
+        print(f"{result['name']:<32} {result['seconds'] * 1e3:10.2f} ms "
+              f"{result['peak_bytes'] / 1024:10.0f} KiB  nodes={nodes}  results={result['results']}")
+
+    report = {"python": platform.python_version(), "numpy": np.__version__,
+              "machine": platform.machine(), "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.update_baseline:
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            failures = compare(results, json.load(f), args.threshold, args.min_delta,
+                               args.memory_threshold, args.min_memory_delta)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        return 1 if failures else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""Concurrent load generator for the JSON service
+
+Opens --concurrency keep-alive connections, sends --requests requests drawn
+from a mix of calculator and combination queries, and reports throughput
+and latency percentiles:
+
+    python -m benchmarks.loadgen --concurrency 32 --requests 5000
+    python -m benchmarks.loadgen --port 8080 --output load.json
+
+Without --port an in-process server is started on a free local port.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from src.server import DecapServer
+from benchmarks.bench import e_series
+
+Request = Tuple[str, str, Optional[Dict[str, object]]]
+
+async def send(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, method: str, path: str,
+               payload: Optional[Dict[str, object]] = None) -> Tuple[int, object]:
+    """Send one request on an open keep-alive connection and read the JSON response"""
+    body = b"" if payload is None else json.dumps(payload).encode()
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+async def request(host: str, port: int, method: str, path: str,
+                  payload: Optional[Dict[str, object]] = None) -> Tuple[int, object]:
+    """Send one request on a fresh connection"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        return await send(reader, writer, method, path, payload)
+    finally:
+        writer.close()
+
+def request_mix(count: int, seed: int = 0, distinct: int = 50) -> List[Request]:
+    """Calculator and combination requests drawn from `distinct` variants each, so some repeat"""
+    rng = random.Random(seed)
+    library = e_series(24, 3)
+    variants = [
+        lambda i: ("POST", "/power-decoupling", {"voltage": 1.0 + i / 10, "current_draw": 2.0,
+                                                  "switching_freq": 500e3}),
+        lambda i: ("POST", "/signal-decoupling", {"signal_freq": 1e6 * (i + 1)}),
+        lambda i: ("POST", "/impedance", {"capacitance": 1e-7 * (i + 1), "esr": 0.01,
+                                          "freq_range": [1e3, 1e9], "points": 200, "esl": 0.5e-9}),
+        lambda i: ("POST", "/combinations/parallel", {"target": 1e-6 * (1 + i / 7),
+                                                      "available_values": library, "max_components": 3}),
+        lambda i: ("POST", "/combinations/series", {"target": 1e-6 * (1 + i / 7),
+                                                    "available_values": library, "max_components": 3}),
+    ]
+    return [rng.choice(variants)(rng.randrange(distinct)) for _ in range(count)]
+
+async def run_load(host: str, port: int, requests: Sequence[Request],
+                   concurrency: int = 32) -> Dict[str, object]:
+    """Replay requests over `concurrency` connections and summarize latency"""
+    queue = list(reversed(requests))
+    latencies: List[float] = []
+    errors = 0
+
+    async def client() -> None:
+        nonlocal errors
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            while queue:
+                method, path, payload = queue.pop()
+                start = time.perf_counter()
+                status, _ = await send(reader, writer, method, path, payload)
+                latencies.append(time.perf_counter() - start)
+                errors += status != 200
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) if latencies else (0.0, 0.0, 0.0)
+    return {"requests": len(latencies), "errors": errors, "concurrency": concurrency,
+            "seconds": elapsed, "throughput": len(latencies) / elapsed if elapsed else 0.0,
+            "p50_ms": p50 * 1e3, "p90_ms": p90 * 1e3, "p99_ms": p99 * 1e3,
+            "max_ms": max(latencies, default=0.0) * 1e3}
+
+async def _run(args: argparse.Namespace) -> Dict[str, object]:
+    """Run the load against a given port or an in-process server"""
+    server = None
+    host, port = args.host, args.port
+    if port is None:
+        server = DecapServer(host, 0, args.workers, args.cache_size)
+        host, port = await server.start()
+    try:
+        report = await run_load(host, port, request_mix(args.requests, args.seed, args.distinct),
+                                args.concurrency)
+        _, report["server"] = await request(host, port, "GET", "/stats")
+        return report
+    finally:
+        if server is not None:
+            await server.stop()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the calculator JSON service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="target a running server instead of starting one")
+    parser.add_argument("--concurrency", type=int, default=32, help="simultaneous connections")
+    parser.add_argument("--requests", type=int, default=5000, help="total requests to send")
+    parser.add_argument("--distinct", type=int, default=50, help="variants per request type")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, help="worker processes for an in-process server")
+    parser.add_argument("--cache-size", type=int, default=1024, help="cache entries for an in-process server")
+    parser.add_argument("--output", help="write the report to this JSON file")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(_run(args))
+    print(f"{report['requests']} requests, {report['errors']} errors in {report['seconds']:.2f} s "
+          f"({report['throughput']:.0f} req/s)")
+    print(f"latency p50 {report['p50_ms']:.2f} ms  p90 {report['p90_ms']:.2f} ms  "
+          f"p99 {report['p99_ms']:.2f} ms  max {report['max_ms']:.2f} ms")
+    cache = report["server"]["cache"]
+    print(f"cache hits {cache['hits']}  misses {cache['misses']}  coalesced {report['server']['coalesced']}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if report["errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,27 @@
 from src.calculator import DecapCalculator
 from src.combinations import CapacitorCombinations
 from src.utils import format_capacitance, format_frequency, format_impedance
+from src.batch import BatchRunner, detect_format, read_jobs, write_results
+from src.parallel import ParallelRunner
+from src.server import serve
+import argparse
 import sys
 
+def run_batch(job_path: str, output_path: str = None, output_format: str = None,
+              chunk_size: int = 4096, workers: int = 1) -> int:
+    """Stream a CSV or JSON-lines job file through the calculators"""
+    output_format = output_format or (detect_format(output_path) if output_path else "jsonl")
+    with open(job_path, newline='') as jobs:
+        rows = read_jobs(jobs, detect_format(job_path))
+        if workers > 1:
+            results = ParallelRunner(workers).run_jobs(rows, chunk_size)
+        else:
+            results = BatchRunner(chunk_size=chunk_size).run(rows)
+        if output_path:
+            with open(output_path, 'w', newline='') as out:
+                return write_results(results, out, output_format)
+        return write_results(results, sys.stdout, output_format)
+
 def main():
     calculator = DecapCalculator()
     combinations = CapacitorCombinations()
@@ -37,6 +56,8 @@ def main():
                 print(f"Number of Capacitors: {result['num_capacitors']}")
                 print(f"Capacitance per Device: {format_capacitance(result['capacitance_per_device'])}")
                 print(f"Temperature Derated Capacitance: {format_capacitance(result['temp_derated_capacitance'])}")
+                print(f"DC-Bias Derated Capacitance (X7R 0805): {format_capacitance(result['bias_derated_capacitance'])}")
+                print(f"Required Nominal Capacitance: {format_capacitance(result['required_nominal_capacitance'])}")
                 
             except ValueError as e:
                 print("Error: Please enter valid numerical values")
@@ -118,4 +139,22 @@ def main():
         input("\nPress Enter to continue...")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Decoupling Capacitor Calculator")
+    parser.add_argument("--batch", metavar="JOBS",
+                        help="run a CSV or JSON-lines job file non-interactively")
+    parser.add_argument("--output", metavar="FILE", help="write batch results here (default: stdout)")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="batch result format")
+    parser.add_argument("--chunk-size", type=int, default=4096, help="rows computed per vectorized chunk")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes for batch and server mode")
+    parser.add_argument("--serve", action="store_true", help="run the HTTP/JSON service")
+    parser.add_argument("--host", default="127.0.0.1", help="service listen address")
+    parser.add_argument("--port", type=int, default=8080, help="service port")
+    parser.add_argument("--cache-size", type=int, default=1024, help="service result cache entries")
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.host, args.port, args.workers, args.cache_size)
+    elif args.batch:
+        run_batch(args.batch, args.output, args.format, args.chunk_size, args.workers)
+    else:
+        main()
\ No newline at end of file
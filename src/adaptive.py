@@ -0,0 +1,96 @@
+import math
+from typing import Callable, Optional, Sequence, Tuple
+import numpy as np
+
+def resonance_seeds(capacitances: Sequence[float], esls: Sequence[float],
+                    esrs: Optional[Sequence[float]] = None) -> np.ndarray:
+    """Analytic series-resonance and anti-resonance frequencies of parts in parallel
+
+    Each part with ESL resonates at f0 = 1/(2π√(LC)); its half-power edges at
+    f0·(1 ± 1/2Q) are added when the ESR is known. Between two parts, the
+    bank anti-resonates roughly where the inductance of one cancels the
+    capacitance of the other, at 1/(2π√(L_i·C_j)).
+    """
+    c = np.asarray(capacitances, dtype=float).ravel()
+    esl = np.broadcast_to(np.asarray(esls, dtype=float).ravel(), c.shape)
+    esr = np.zeros_like(c) if esrs is None else np.broadcast_to(np.asarray(esrs, dtype=float).ravel(), c.shape)
+    parts = np.unique(np.column_stack([c, esl, esr]), axis=0)
+    c, esl, esr = parts[parts[:, 1] > 0].T
+    if not len(c):
+        return np.empty(0)
+
+    f0 = 1 / (2 * np.pi * np.sqrt(esl * c))
+    seeds = [f0]
+    q = np.sqrt(esl / c) / np.where(esr > 0, esr, np.inf)
+    sharp = q > 1
+    seeds += [f0[sharp] * (1 + 1 / (2 * q[sharp])), f0[sharp] * (1 - 1 / (2 * q[sharp]))]
+    if len(c) > 1:
+        cross = 1 / (2 * np.pi * np.sqrt(np.outer(esl, c)))
+        seeds.append(cross[~np.eye(len(c), dtype=bool)])
+    return np.unique(np.concatenate(seeds))
+
+class AdaptiveSweep:
+    """Sample a positive function of frequency where it is least linear in log-log
+
+    The sweep starts from a coarse log-spaced grid plus any seed
+    frequencies, then repeatedly evaluates the midpoint (in log f) of each
+    open interval. When the midpoint differs from the straight line
+    between the interval ends by more than `tolerance` (relative), or the
+    interval is wider than `max_interval` decades, both halves stay open;
+    otherwise the interval is done. Each pass is one vectorized call of
+    `evaluate`. Linear interpolation in log-log between the returned points
+    then tracks the function to about `tolerance`.
+    """
+
+    def __init__(self, evaluate: Callable[[np.ndarray], np.ndarray], tolerance: float = 0.01,
+                 initial_points: int = 16, max_points: int = 10_000, max_interval: float = 0.5,
+                 min_interval: float = 1e-7):
+        if tolerance <= 0:
+            raise ValueError("Tolerance must be positive")
+        if initial_points < 2:
+            raise ValueError("At least two initial points are required")
+        self.evaluate = evaluate
+        self.tolerance = tolerance
+        self.initial_points = initial_points
+        self.max_points = max_points
+        self.max_interval = max_interval
+        self.min_interval = min_interval
+        self.evaluations = 0
+
+    def run(self, freq_range: Tuple[float, float],
+            seeds: Sequence[float] = ()) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the sampled frequencies and function values, in frequency order"""
+        low, high = math.log10(freq_range[0]), math.log10(freq_range[1])
+        seeds = np.log10(np.asarray(seeds, dtype=float))
+        x = np.unique(np.concatenate([np.linspace(low, high, self.initial_points),
+                                      seeds[(seeds > low) & (seeds < high)]]))
+        y = self._log_eval(x)
+        xs, ys = [x], [y]
+        limit = math.log(1 + self.tolerance)
+
+        xa, ya, xb, yb = x[:-1], y[:-1], x[1:], y[1:]
+        while len(xa) and self.evaluations + len(xa) <= self.max_points:
+            xm = (xa + xb) / 2
+            ym = self._log_eval(xm)
+            xs.append(xm)
+            ys.append(ym)
+            width = xb - xa
+            refine = (np.abs(ym - (ya + yb) / 2) > limit) | (width > self.max_interval)
+            refine &= width > 2 * self.min_interval
+            xa, ya, xb, yb = (np.concatenate([xa[refine], xm[refine]]),
+                              np.concatenate([ya[refine], ym[refine]]),
+                              np.concatenate([xm[refine], xb[refine]]),
+                              np.concatenate([ym[refine], yb[refine]]))
+
+        x, y = np.concatenate(xs), np.concatenate(ys)
+        order = np.argsort(x, kind='stable')
+        return 10 ** x[order], np.exp(y[order])
+
+    def _log_eval(self, x: np.ndarray) -> np.ndarray:
+        """Natural log of the function at log10 frequencies, counting evaluations"""
+        self.evaluations += len(x)
+        return np.log(self.evaluate(10 ** x))
+
+def interpolate_loglog(frequencies: np.ndarray, values: np.ndarray, at: Sequence[float]) -> np.ndarray:
+    """Linear interpolation in log-log between sampled points"""
+    return np.exp(np.interp(np.log10(at), np.log10(frequencies), np.log(values)))
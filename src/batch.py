@@ -0,0 +1,166 @@
+import csv
+import json
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+import numpy as np
+from .calculator import DecapCalculator
+
+# Input columns per job type, with defaults for the optional ones
+JOB_FIELDS = {
+    "power": {"voltage": None, "current_draw": None, "voltage_ripple_percent": 5.0,
+              "switching_freq": float('nan')},
+    "signal": {"signal_freq": None, "impedance": 50.0, "bypass_factor": 0.1},
+    "lambda10": {"frequency": None},
+}
+
+# Key of the placeholder row read_jobs yields for a line it cannot parse
+READ_ERROR = "_read_error"
+
+RESULT_FIELDS = [
+    "id", "type", "error",
+    "total_capacitance", "voltage_rating", "max_esr", "num_capacitors",
+    "capacitance_per_device", "temp_derated_capacitance",
+    "bias_derated_capacitance", "required_nominal_capacitance",
+    "capacitance", "min_srf", "recommended_type", "placement_max_distance",
+    "distance",
+]
+
+class BatchRunner:
+    """Stream job rows through the decoupling calculators in vectorized chunks
+
+    Rows are read lazily, grouped into chunks of `chunk_size`, split by job
+    type and computed with the array versions of the calculators. Results
+    come back one row at a time in input order, so memory stays flat no
+    matter how long the job file is. A row that cannot be parsed produces
+    an error row instead of stopping the run.
+    """
+
+    def __init__(self, calculator: Optional[DecapCalculator] = None, chunk_size: int = 4096):
+        self.calculator = calculator or DecapCalculator()
+        self.chunk_size = chunk_size
+
+    def run(self, jobs: Iterable[Dict[str, object]], start: int = 0) -> Iterator[Dict[str, object]]:
+        """Yield one result dict per job row, in input order
+
+        Rows without an id are numbered by their position in the input,
+        counting from `start`.
+        """
+        jobs = iter(jobs)
+        while True:
+            chunk = list(islice(jobs, self.chunk_size))
+            if not chunk:
+                return
+            yield from self._run_chunk(chunk, start)
+            start += len(chunk)
+
+    def _run_chunk(self, rows: List[Dict[str, object]], start: int = 0) -> List[Dict[str, object]]:
+        """Compute a chunk of rows starting at input row `start`, one vectorized call per job type"""
+        results: List[Dict[str, object]] = []
+        groups: Dict[str, List[int]] = {job_type: [] for job_type in JOB_FIELDS}
+        columns: Dict[str, Dict[str, List[float]]] = {
+            job_type: {field: [] for field in fields} for job_type, fields in JOB_FIELDS.items()
+        }
+
+        for position, row in enumerate(rows):
+            job_type = str(row.get("type", "")).strip().lower()
+            result = {"id": row.get("id", start + position), "type": job_type}
+            results.append(result)
+            if READ_ERROR in row:
+                result["error"] = row[READ_ERROR]
+                continue
+            try:
+                if job_type not in JOB_FIELDS:
+                    raise ValueError(f"Unknown job type: {job_type!r}")
+                values = {field: self._parse(row, field, default)
+                          for field, default in JOB_FIELDS[job_type].items()}
+            except ValueError as e:
+                result["error"] = str(e)
+                continue
+            groups[job_type].append(position)
+            for field, value in values.items():
+                columns[job_type][field].append(value)
+
+        computed = {}
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if groups["power"]:
+                c = columns["power"]
+                computed["power"] = self.calculator.calculate_power_decoupling_batch(
+                    c["voltage"], c["current_draw"], c["voltage_ripple_percent"], c["switching_freq"])
+            if groups["signal"]:
+                c = columns["signal"]
+                computed["signal"] = self.calculator.calculate_signal_decoupling_batch(
+                    c["signal_freq"], c["impedance"], c["bypass_factor"])
+            if groups["lambda10"]:
+                computed["lambda10"] = {"distance": self.calculator.calculate_lambda10_distance_batch(
+                    columns["lambda10"]["frequency"])}
+
+        for job_type, output in computed.items():
+            # Zero or negative inputs divide by zero; report them like the scalar calculators' errors
+            numeric = {key: array for key, array in output.items() if array.dtype.kind == 'f'}
+            invalid = np.zeros(len(groups[job_type]), dtype=bool)
+            for array in numeric.values():
+                invalid |= ~np.isfinite(array)
+            lists = {key: array.tolist() for key, array in output.items()}
+            for k, position in enumerate(groups[job_type]):
+                if invalid[k]:
+                    fields = [key for key, array in numeric.items() if not np.isfinite(array[k])]
+                    results[position]["error"] = \
+                        f"Non-finite result for {', '.join(fields)}: check for zero inputs"
+                    continue
+                results[position].update({key: values[k] for key, values in lists.items()})
+        return results
+
+    @staticmethod
+    def _parse(row: Dict[str, object], field: str, default: Optional[float]) -> float:
+        """Read one numeric field, falling back to its default when blank"""
+        raw = row.get(field)
+        if raw is None or (isinstance(raw, str) and not raw.strip()):
+            if default is None:
+                raise ValueError(f"Missing required field: {field}")
+            return default
+        try:
+            return float(raw)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid value for {field}: {raw!r}")
+
+
+def detect_format(path: str) -> str:
+    """Pick 'csv' or 'jsonl' from a file name"""
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+def read_jobs(stream: TextIO, fmt: str) -> Iterator[Dict[str, object]]:
+    """Lazily read job rows from a CSV or JSON-lines stream"""
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+    elif fmt == "jsonl":
+        for number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield {READ_ERROR: f"Line {number}: invalid JSON: {e.msg}"}
+                continue
+            if not isinstance(row, dict):
+                yield {READ_ERROR: f"Line {number}: expected a JSON object"}
+                continue
+            yield row
+    else:
+        raise ValueError(f"Unknown job format: {fmt}")
+
+def write_results(results: Iterable[Dict[str, object]], stream: TextIO, fmt: str) -> int:
+    """Write results row by row as CSV or JSON lines, returning the row count"""
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(stream, fieldnames=RESULT_FIELDS, restval="", extrasaction="ignore")
+        writer.writeheader()
+        for result in results:
+            writer.writerow(result)
+            count += 1
+    elif fmt == "jsonl":
+        for result in results:
+            stream.write(json.dumps(result) + "\n")
+            count += 1
+    else:
+        raise ValueError(f"Unknown result format: {fmt}")
+    return count
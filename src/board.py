@@ -0,0 +1,223 @@
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, Optional, Sequence, Set, Tuple, Union
+import numpy as np
+from .calculator import DecapCalculator
+from .catalog import CapacitorCatalog
+from .optimizer import PDNOptimizer
+from .touchstone import MeasuredImpedanceStore
+
+Node = Tuple[str, str]
+
+RAIL_SETTINGS = ("voltage", "current_draw", "voltage_ripple_percent", "switching_freq",
+                 "source", "efficiency")
+
+class Board:
+    """Rails, their capacitor banks and cached results in a dependency graph
+
+    Every rail shares one part library, optionally with measured impedance
+    curves for some parts. Part admittances are computed once
+    per frequency grid (a PDNOptimizer per distinct grid), so a bank's
+    impedance is a quantity-weighted sum of cached rows. Cached values are
+    graph nodes:
+
+    - ("load", rail): the rail's own current plus the input current of
+      every rail it sources, through a linear regulator or a switcher with
+      the given efficiency
+    - ("bank", rail): the bank admittance, depending on ("part", name) for
+      each part in the bank
+    - ("result", rail): sizing, target impedance and compliance, depending
+      on the rail's load and bank
+
+    An edit invalidates the edited node and everything downstream of it;
+    `evaluate` recomputes only what is missing.
+    """
+
+    def __init__(self, library: Union[Sequence[Dict[str, Union[float, str]]], CapacitorCatalog],
+                 freq_range: Tuple[float, float] = (1e3, 1e9), points: int = 200,
+                 calculator: Optional[DecapCalculator] = None,
+                 measured: Optional[MeasuredImpedanceStore] = None):
+        parts = library.parts() if isinstance(library, CapacitorCatalog) else [dict(p) for p in library]
+        names = [p.get("name") for p in parts]
+        if None in names or len(set(names)) != len(names):
+            raise ValueError("Library parts need unique names")
+        self.parts = parts
+        self.part_index = {name: idx for idx, name in enumerate(names)}
+        self.freq_range = freq_range
+        self.points = points
+        self.calculator = calculator or DecapCalculator()
+        self.measured = measured
+        self.rails: Dict[str, Dict[str, object]] = {}
+        self.recomputed: Counter = Counter()
+        self._grids: Dict[Tuple[Tuple[float, float], int], PDNOptimizer] = {}
+        self._dependents: Dict[Node, Set[Node]] = defaultdict(set)
+        self._cache: Dict[Node, object] = {}
+
+    def grid(self, freq_range: Optional[Tuple[float, float]] = None,
+             points: Optional[int] = None) -> PDNOptimizer:
+        """The shared library evaluated on a frequency grid, built once per grid"""
+        key = (tuple(freq_range or self.freq_range), points or self.points)
+        if key not in self._grids:
+            self._grids[key] = PDNOptimizer(self.parts, key[0], key[1], self.calculator, self.measured)
+        return self._grids[key]
+
+    def add_rail(self, name: str, voltage: float, current_draw: float,
+                 voltage_ripple_percent: float = 5, switching_freq: Optional[float] = None,
+                 bank: Optional[Dict[str, int]] = None, source: Optional[str] = None,
+                 efficiency: Optional[float] = None, freq_range: Optional[Tuple[float, float]] = None,
+                 points: Optional[int] = None) -> None:
+        """Add a rail, optionally fed from another rail and with a bank of {part name: quantity}"""
+        if name in self.rails:
+            raise ValueError(f"Rail {name} already exists")
+        self.rails[name] = {"voltage": voltage, "current_draw": current_draw,
+                            "voltage_ripple_percent": voltage_ripple_percent,
+                            "switching_freq": switching_freq, "source": None, "efficiency": efficiency,
+                            "bank": {}, "grid": self.grid(freq_range, points)}
+        self._depend(("result", name), [("load", name), ("bank", name)])
+        try:
+            self.set_rail(name, source=source)
+            self.set_bank(name, bank or {})
+        except ValueError:
+            self.remove_rail(name)
+            raise
+
+    def remove_rail(self, name: str) -> None:
+        """Remove a rail; rails it sourced become top-level"""
+        self._rail(name)
+        for other, settings in self.rails.items():
+            if settings["source"] == name:
+                self.set_rail(other, source=None)
+        self.set_rail(name, source=None)
+        self.set_bank(name, {})
+        self._invalidate(("load", name))
+        del self.rails[name]
+        for node in (("load", name), ("bank", name), ("result", name)):
+            self._dependents.pop(node, None)
+
+    def set_rail(self, name: str, **settings: object) -> None:
+        """Change rail settings (voltage, current_draw, source, ...) and invalidate what depends on them"""
+        rail = self._rail(name)
+        unknown = set(settings) - set(RAIL_SETTINGS)
+        if unknown:
+            raise ValueError(f"Unknown rail settings: {', '.join(sorted(unknown))}")
+        if "source" in settings and settings["source"] != rail["source"]:
+            source = settings["source"]
+            ancestor = source
+            while ancestor is not None:
+                if ancestor == name:
+                    raise ValueError(f"Rail {name} cannot be fed from {source}: cycle")
+                ancestor = self._rail(ancestor)["source"]
+            if rail["source"] is not None:
+                self._invalidate(("load", rail["source"]))
+                self._dependents[("load", name)].discard(("load", rail["source"]))
+            if source is not None:
+                self._depend(("load", source), [("load", name)])
+        rail.update(settings)
+        self._invalidate(("load", name))
+
+    def set_bank(self, name: str, bank: Dict[str, int]) -> None:
+        """Replace a rail's bank of {part name: quantity}"""
+        rail = self._rail(name)
+        missing = [part for part in bank if part not in self.part_index]
+        if missing:
+            raise ValueError(f"Unknown parts: {', '.join(missing)}")
+        for part in rail["bank"]:
+            self._dependents[("part", part)].discard(("bank", name))
+        rail["bank"] = {part: int(q) for part, q in bank.items() if q > 0}
+        for part in rail["bank"]:
+            self._depend(("bank", name), [("part", part)])
+        self._invalidate(("bank", name))
+
+    def update_part(self, name: str, **fields: Union[float, str]) -> None:
+        """Change a library part (ESR, ESL, cost, ...) on every grid and in the banks that use it"""
+        if name not in self.part_index:
+            raise ValueError(f"Unknown part: {name}")
+        idx = self.part_index[name]
+        self.parts[idx] = dict(self.parts[idx], **fields, name=name)
+        for grid in self._grids.values():
+            grid.update_part(idx, self.parts[idx])
+        self._invalidate(("part", name))
+
+    def optimize_rail(self, name: str, **options: object) -> Dict[str, object]:
+        """Pick the cheapest compliant bank for a rail from the shared library and install it"""
+        z_target = self.evaluate([name])[name]["target_impedance"]
+        result = self._rail(name)["grid"].optimize(z_target, **options)
+        self.set_bank(name, {entry["part"]["name"]: entry["quantity"] for entry in result["bank"]})
+        return result
+
+    def evaluate(self, names: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, object]]:
+        """Results per rail, recomputing only rails whose inputs changed"""
+        return {name: self._get(("result", name)) for name in (self.rails if names is None else names)}
+
+    def _rail(self, name: str) -> Dict[str, object]:
+        """Look up a rail by name"""
+        if name not in self.rails:
+            raise ValueError(f"Unknown rail: {name}")
+        return self.rails[name]
+
+    def _depend(self, node: Node, dependencies: Iterable[Node]) -> None:
+        """Record that `node` is computed from `dependencies`"""
+        for dependency in dependencies:
+            self._dependents[dependency].add(node)
+
+    def _invalidate(self, node: Node) -> None:
+        """Drop a node and everything downstream of it from the cache"""
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            self._cache.pop(current, None)
+            stack.extend(n for n in self._dependents.get(current, ()) if n in self._cache)
+
+    def _get(self, node: Node) -> object:
+        """Cached value of a node, computed on demand"""
+        if node not in self._cache:
+            kind, name = node
+            self._cache[node] = getattr(self, f"_compute_{kind}")(name)
+            self.recomputed[kind] += 1
+        return self._cache[node]
+
+    def _compute_load(self, name: str) -> float:
+        """Own current plus the input current of every rail fed from this one"""
+        rail = self.rails[name]
+        current = float(rail["current_draw"])
+        for other, settings in self.rails.items():
+            if settings["source"] == name:
+                load = self._get(("load", other))
+                if settings["efficiency"]:
+                    # Switcher: input power is output power over efficiency
+                    load = load * settings["voltage"] / (rail["voltage"] * settings["efficiency"])
+                current += load
+        return current
+
+    def _compute_bank(self, name: str) -> np.ndarray:
+        """Bank admittance on the rail's grid"""
+        rail = self.rails[name]
+        grid: PDNOptimizer = rail["grid"]
+        admittance = np.zeros(len(grid.frequencies), dtype=complex)
+        for part, quantity in rail["bank"].items():
+            admittance += quantity * grid.admittance[self.part_index[part]]
+        return admittance
+
+    def _compute_result(self, name: str) -> Dict[str, object]:
+        """Sizing, target impedance and bank compliance of a rail"""
+        rail = self.rails[name]
+        load = self._get(("load", name))
+        result = self.calculator.calculate_power_decoupling(
+            rail["voltage"], load, rail["voltage_ripple_percent"], rail["switching_freq"])
+        z_target = self.calculator.calculate_target_impedance(rail["voltage"], load,
+                                                              rail["voltage_ripple_percent"])
+        grid: PDNOptimizer = rail["grid"]
+        with np.errstate(divide='ignore'):
+            impedance = 1 / np.abs(self._get(("bank", name)))
+        worst = int(np.argmax(impedance))
+        parts = [self.part_index[part] for part in rail["bank"]]
+        quantities = np.array(list(rail["bank"].values()), dtype=float)
+        result.update({
+            "load_current": load,
+            "target_impedance": z_target,
+            "max_impedance": float(impedance[worst]),
+            "worst_frequency": float(grid.frequencies[worst]),
+            "compliant": bool((impedance <= z_target).all()),
+            "bank_cost": float(quantities @ grid.costs[parts]) if parts else 0.0,
+            "bank": dict(rail["bank"]),
+        })
+        return result
@@ -1,5 +1,12 @@
 import math
-from typing import Dict, Union, List, Tuple
+from typing import Dict, Union, List, Tuple, Optional, Sequence
+import numpy as np
+from .adaptive import AdaptiveSweep, resonance_seeds
+from .catalog import CapacitorCatalog
+from .derating import DEFAULT_PACKAGE, DeratingLibrary
+from .instrumentation import instrumented
+from .touchstone import MeasuredImpedanceStore
+from .transient import TransientSimulator, load_pulse
 from .utils import format_capacitance, format_frequency
 
 class DecapCalculator:
@@ -11,11 +18,15 @@ class DecapCalculator:
             'C0G': (-0.03, 0.03),   # ±0.3% over temp range
             'Y5V': (-0.82, 0.22)    # -82% to +22% over temp range
         }
+        self.derating = DeratingLibrary.load()  # DC-bias and temperature curves, cached per file
 
+    @instrumented("DecapCalculator.calculate_power_decoupling")
     def calculate_power_decoupling(self, voltage: float, current_draw: float, 
                                  voltage_ripple_percent: float = 5, 
                                  switching_freq: float = None,
-                                 temp_range: Tuple[float, float] = (25, 85)) -> Dict[str, float]:
+                                 temp_range: Tuple[float, float] = (25, 85),
+                                 package: str = DEFAULT_PACKAGE,
+                                 catalog: Optional[CapacitorCatalog] = None) -> Dict[str, float]:
         """Calculate power line decoupling capacitor requirements with temperature considerations"""
         # Base calculations
         voltage_ripple = (voltage_ripple_percent/100) * voltage
@@ -50,57 +61,157 @@ class DecapCalculator:
             temp_range
         )
         
+        # MLCCs lose capacitance under DC bias; size the parts for what is left at rail voltage
+        bias_ratio = float(self.derating.worst_ratio('X7R', voltage, temp_range, package))
+        
         result.update({
             "temp_derated_capacitance": temp_derated_cap,
-            "temperature_range": temp_range
+            "temperature_range": temp_range,
+            "bias_derated_capacitance": design_capacitance * bias_ratio,
+            "required_nominal_capacitance": design_capacitance / bias_ratio
         })
         
+        if catalog is not None:
+            # Cheapest parts rated for the rail that can each supply their share
+            candidates = catalog.query(min_voltage=voltage_rating, min_capacitance=cap_per_device,
+                                       max_esr=max_esr * num_caps)
+            result["suggested_parts"] = candidates.cheapest(5).parts()
+        
         return result
 
+    def calculate_target_impedance(self, voltage: float, current_step: float,
+                                   voltage_ripple_percent: float = 5) -> float:
+        """Calculate PDN target impedance Z_target = ΔV / ΔI"""
+        return (voltage_ripple_percent / 100) * voltage / current_step
+
+    @instrumented("DecapCalculator.calculate_load_step_droop")
+    def calculate_load_step_droop(self, voltage: float, current_draw: float,
+                                  voltage_ripple_percent: float = 5,
+                                  switching_freq: float = None,
+                                  parts: Optional[Sequence[Dict[str, float]]] = None,
+                                  esr: float = 0.005, esl: float = 1e-9,
+                                  steps_per_period: int = 20_000,
+                                  **simulator_options) -> Dict[str, float]:
+        """Simulate a load step lasting one switching period and check the droop against the ripple
+
+        Without `parts`, the bank is the one sized by calculate_power_decoupling,
+        each device with the given ESR and ESL. The step ramps up and down over
+        1% of the period and the rail is simulated for two periods.
+        """
+        period = 1 / (switching_freq or 120)
+        if parts is None:
+            sizing = self.calculate_power_decoupling(voltage, current_draw, voltage_ripple_percent,
+                                                     switching_freq)
+            parts = [{"capacitance": sizing["capacitance_per_device"], "esr": esr, "esl": esl,
+                      "quantity": sizing["num_capacitors"]}]
+        dt = period / steps_per_period
+        simulator = TransientSimulator(parts, dt, **simulator_options)
+        load = load_pulse(current_draw, 0.99 * period, 2 * period, dt, rise_time=0.01 * period)
+        return simulator.peak_droop(load, voltage, voltage_ripple_percent)
+
+    @instrumented("DecapCalculator.calculate_impedance_vs_frequency")
     def calculate_impedance_vs_frequency(self, capacitance: float, esr: float, 
                                       freq_range: Tuple[float, float], 
-                                      points: int = 100) -> List[Tuple[float, float]]:
+                                      points: int = 100,
+                                      esl: float = 0.0) -> List[Tuple[float, float]]:
         """Calculate impedance vs frequency curve for a capacitor"""
-        freq_points = []
-        impedance_points = []
-        
-        # Calculate frequency points logarithmically
-        freq_start = math.log10(freq_range[0])
-        freq_end = math.log10(freq_range[1])
-        freq_step = (freq_end - freq_start) / (points - 1)
-        
-        for i in range(points):
-            freq = 10 ** (freq_start + i * freq_step)
-            
-            # Calculate impedance components
-            xc = 1 / (2 * math.pi * freq * capacitance)  # Capacitive reactance
-            z = math.sqrt(esr**2 + xc**2)  # Total impedance
-            
-            freq_points.append(freq)
-            impedance_points.append(z)
-            
-        return list(zip(freq_points, impedance_points))
+        freqs, z = self.calculate_impedance_matrix([capacitance], [esr], freq_range,
+                                                   points=points, esls=[esl])
+        return list(zip(freqs.tolist(), z[0].tolist()))
+
+    @instrumented("DecapCalculator.calculate_impedance_adaptive")
+    def calculate_impedance_adaptive(self, capacitances: Sequence[float], esrs: Sequence[float],
+                                     freq_range: Tuple[float, float],
+                                     esls: Optional[Sequence[float]] = None,
+                                     tolerance: float = 0.01,
+                                     max_points: int = 10_000) -> Tuple[np.ndarray, np.ndarray]:
+        """Calculate the impedance of parts in parallel on an adaptively refined sweep
+
+        Resonance and anti-resonance frequencies are seeded into the grid;
+        log-log interpolation between the returned points stays within
+        about `tolerance` of the true curve.
+        """
+        esls = [0.0] if esls is None else esls
+        sweep = AdaptiveSweep(lambda f: self.bank_impedance_at(capacitances, esrs, f, esls),
+                              tolerance=tolerance, max_points=max_points)
+        return sweep.run(freq_range, resonance_seeds(capacitances, esls, esrs))
+
+    def bank_impedance_at(self, capacitances: Sequence[float], esrs: Sequence[float],
+                          frequencies: Sequence[float],
+                          esls: Optional[Sequence[float]] = None) -> np.ndarray:
+        """Calculate the impedance magnitude of parts in parallel"""
+        admittance = (1 / self.complex_impedance_at(capacitances, esrs, frequencies, esls)).sum(axis=0)
+        return 1 / np.abs(admittance)
 
+    def frequency_points(self, freq_range: Tuple[float, float], points: int = 100) -> np.ndarray:
+        """Calculate logarithmically spaced frequency points"""
+        if points < 2:
+            raise ValueError("At least two frequency points are required")
+        return np.logspace(math.log10(freq_range[0]), math.log10(freq_range[1]), points)
+
+    @instrumented("DecapCalculator.calculate_impedance_matrix")
+    def calculate_impedance_matrix(self, capacitances: Sequence[float], esrs: Sequence[float],
+                                   freq_range: Tuple[float, float], points: int = 100,
+                                   esls: Optional[Sequence[float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Calculate impedance magnitude for many capacitors over one frequency sweep
+
+        Returns the frequency points and a (parts x points) impedance matrix.
+        """
+        freqs = self.frequency_points(freq_range, points)
+        return freqs, self.impedance_at(capacitances, esrs, freqs, esls)
+
+    @instrumented("DecapCalculator.calculate_measured_impedance")
+    def calculate_measured_impedance(self, store: MeasuredImpedanceStore, parts: Sequence[str],
+                                     freq_range: Tuple[float, float],
+                                     points: int = 100) -> Tuple[np.ndarray, np.ndarray]:
+        """Calculate impedance magnitude of measured parts on a sweep, like calculate_impedance_matrix"""
+        freqs = self.frequency_points(freq_range, points)
+        return freqs, np.abs(store.impedance_at(parts, freqs))
+
+    def impedance_at(self, capacitances: Sequence[float], esrs: Sequence[float],
+                     frequencies: Sequence[float],
+                     esls: Optional[Sequence[float]] = None) -> np.ndarray:
+        """Calculate the (parts x frequencies) impedance magnitude matrix"""
+        c, esr, esl = self._part_columns(capacitances, esrs, esls)
+        omega = 2 * np.pi * np.asarray(frequencies, dtype=float)[np.newaxis, :]
+        reactance = omega * esl - 1 / (omega * c)  # Inductive minus capacitive reactance
+        return np.hypot(esr, reactance)
+
+    def complex_impedance_at(self, capacitances: Sequence[float], esrs: Sequence[float],
+                             frequencies: Sequence[float],
+                             esls: Optional[Sequence[float]] = None) -> np.ndarray:
+        """Calculate the complex (parts x frequencies) impedance matrix"""
+        c, esr, esl = self._part_columns(capacitances, esrs, esls)
+        omega = 2 * np.pi * np.asarray(frequencies, dtype=float)[np.newaxis, :]
+        return esr + 1j * (omega * esl - 1 / (omega * c))
+
+    @staticmethod
+    def _part_columns(capacitances: Sequence[float], esrs: Sequence[float],
+                      esls: Optional[Sequence[float]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Broadcast per-part parameters into column vectors"""
+        c = np.asarray(capacitances, dtype=float).reshape(-1, 1)
+        esr = np.broadcast_to(np.asarray(esrs, dtype=float).reshape(-1, 1), c.shape)
+        esl = np.zeros_like(c) if esls is None else \
+            np.broadcast_to(np.asarray(esls, dtype=float).reshape(-1, 1), c.shape)
+        return c, esr, esl
+
+    @instrumented("DecapCalculator.calculate_temperature_derating")
     def calculate_temperature_derating(self, capacitance: float, 
                                     dielectric_type: str,
                                     temp_range: Tuple[float, float]) -> float:
-        """Calculate temperature-derated capacitance"""
+        """Calculate temperature-derated capacitance (worst case over the range, no bias)"""
         if dielectric_type not in self.TEMP_COEFFICIENTS:
             raise ValueError(f"Unknown dielectric type: {dielectric_type}")
-            
-        min_coef, max_coef = self.TEMP_COEFFICIENTS[dielectric_type]
-        temp_min, temp_max = temp_range
-        
-        # Calculate worst-case capacitance change
-        temp_delta = temp_max - 25  # Reference to room temperature
-        if temp_delta > 0:
-            worst_case_coef = min_coef  # Usually capacitance decreases with temperature
-        else:
-            worst_case_coef = max_coef
-            
-        derated_capacitance = capacitance * (1 + worst_case_coef)
-        return derated_capacitance 
+        return capacitance * float(self.derating.worst_ratio(dielectric_type, 0.0, temp_range))
 
+    @instrumented("DecapCalculator.calculate_dc_bias_derating")
+    def calculate_dc_bias_derating(self, capacitance: float, dielectric_type: str, voltage: float,
+                                   temp_range: Tuple[float, float] = (25, 25),
+                                   package: str = DEFAULT_PACKAGE) -> float:
+        """Calculate effective capacitance at a DC bias, worst case over the temperature range"""
+        return capacitance * float(self.derating.worst_ratio(dielectric_type, voltage, temp_range, package))
+
+    @instrumented("DecapCalculator.calculate_signal_decoupling")
     def calculate_signal_decoupling(self, signal_freq: float, impedance: float = 50, 
                                   bypass_factor: float = 0.1) -> Dict[str, Union[float, str]]:
         """Calculate signal line decoupling/bypass capacitor requirements"""
@@ -126,8 +237,117 @@ class DecapCalculator:
             "placement_max_distance": placement_distance
         }
 
-    def calculate_lambda10_distance(self, frequency: float) -> float:
-        """Calculate maximum decoupling capacitor distance using λ/10 rule"""
-        speed_in_fr4 = 299792458 / math.sqrt(self.FR4_ER)  # Speed of light in FR4
+    @instrumented("DecapCalculator.calculate_lambda10_distance")
+    def calculate_lambda10_distance(self, frequency: float,
+                                    dielectric_constant: Optional[float] = None) -> float:
+        """Calculate maximum decoupling capacitor distance using λ/10 rule (FR4 unless εr is given)"""
+        speed_in_fr4 = 299792458 / math.sqrt(dielectric_constant or self.FR4_ER)  # Speed of light in FR4
         wavelength = speed_in_fr4 / frequency
-        return (wavelength / 10) * 1000  # Convert to mm
\ No newline at end of file
+        return (wavelength / 10) * 1000  # Convert to mm
+
+    @instrumented("DecapCalculator.calculate_power_decoupling_batch")
+    def calculate_power_decoupling_batch(self, voltages: Sequence[float], current_draws: Sequence[float],
+                                         voltage_ripple_percents: Sequence[float] = 5,
+                                         switching_freqs: Optional[Sequence[float]] = None,
+                                         temp_range: Tuple[float, float] = (25, 85),
+                                         package: str = DEFAULT_PACKAGE) -> Dict[str, np.ndarray]:
+        """Vectorized calculate_power_decoupling over arrays of rails
+
+        A NaN switching frequency selects the 120 Hz AC-supply case, like None
+        does for a single rail.
+        """
+        voltage = np.asarray(voltages, dtype=float)
+        current_draw = np.asarray(current_draws, dtype=float)
+        voltage_ripple = (np.asarray(voltage_ripple_percents, dtype=float) / 100) * voltage
+        freq = np.full(voltage.shape, np.nan) if switching_freqs is None else \
+            np.asarray(switching_freqs, dtype=float)
+        freq = np.where(np.isnan(freq) | (freq == 0), 120.0, freq)
+
+        design_capacitance = current_draw / (voltage_ripple * freq) * 1.5
+        MAX_CAP_SIZE = 1000e-6  # Maximum practical capacitor size (1000µF)
+        num_caps = np.maximum(np.ceil(design_capacitance / MAX_CAP_SIZE), 1).astype(int)
+        derated = self.calculate_temperature_derating(1.0, 'X7R', temp_range)
+        bias_ratio = self.derating.worst_ratio('X7R', voltage, temp_range, package)
+
+        return {
+            "total_capacitance": design_capacitance,
+            "voltage_rating": voltage * 1.5,
+            "max_esr": voltage_ripple / current_draw,
+            "num_capacitors": num_caps,
+            "capacitance_per_device": design_capacitance / num_caps,
+            "temp_derated_capacitance": design_capacitance * derated,
+            "bias_derated_capacitance": design_capacitance * bias_ratio,
+            "required_nominal_capacitance": design_capacitance / bias_ratio,
+        }
+
+    @instrumented("DecapCalculator.calculate_signal_decoupling_batch")
+    def calculate_signal_decoupling_batch(self, signal_freqs: Sequence[float],
+                                          impedances: Sequence[float] = 50,
+                                          bypass_factors: Sequence[float] = 0.1) -> Dict[str, np.ndarray]:
+        """Vectorized calculate_signal_decoupling over arrays of nets"""
+        signal_freq = np.asarray(signal_freqs, dtype=float)
+        min_capacitance = 1 / (2 * np.pi * signal_freq * np.asarray(impedances, dtype=float)
+                               * np.asarray(bypass_factors, dtype=float))
+        cap_type = np.select([signal_freq < 1e6, signal_freq < 100e6],
+                             ["Ceramic X7R/X5R", "Ceramic C0G/NP0"], "RF Ceramic")
+        return {
+            "capacitance": min_capacitance * 2,
+            "min_srf": signal_freq * 3,
+            "recommended_type": cap_type,
+            "placement_max_distance": self.calculate_lambda10_distance_batch(signal_freq),
+        }
+
+    @instrumented("DecapCalculator.plan_signal_decoupling")
+    def plan_signal_decoupling(self, signal_freqs: Sequence[float], impedances: Sequence[float] = 50,
+                               bypass_factors: Sequence[float] = 0.1,
+                               catalog: Optional[CapacitorCatalog] = None) -> Dict[str, np.ndarray]:
+        """Signal decoupling for many nets, computed once per distinct requirement
+
+        Nets are grouped by (frequency, impedance, bypass factor); each group
+        is sized by calculate_signal_decoupling_batch and, given a catalog,
+        assigned its cheapest part with at least the design capacitance and
+        minimum SRF. Every array has one entry per net: "group" numbers the
+        distinct requirements and "part_row" is -1 where no part qualifies.
+        """
+        columns = np.broadcast_arrays(*(np.asarray(v, dtype=float).ravel()
+                                        for v in (signal_freqs, impedances, bypass_factors)))
+        group, first = self._group_rows(columns)
+        freq, impedance, bypass = (column[first] for column in columns)
+        plan = self.calculate_signal_decoupling_batch(freq, impedance, bypass)
+        if catalog is not None:
+            rows = catalog.cheapest_matches(plan["capacitance"], plan["min_srf"])
+            # Unmatched groups (-1) gather a blank appended to each column, which also covers an
+            # empty catalog
+            gather = np.where(rows >= 0, rows, len(catalog))
+            columns = {"part_number": (catalog.part_numbers, ""),
+                       "part_capacitance": (catalog.columns["capacitance"], np.nan),
+                       "part_srf": (catalog.srf(), np.nan),
+                       "part_price": (catalog.columns["price"], np.nan)}
+            plan["part_row"] = rows
+            plan.update({name: np.append(values, blank)[gather] for name, (values, blank) in columns.items()})
+        result = {name: values[group] for name, values in plan.items()}
+        result["group"] = group
+        return result
+
+    @staticmethod
+    def _group_rows(columns: Sequence[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """Group number of each row by its values across columns, and the first row of each group"""
+        key = np.zeros(len(columns[0]), dtype=np.int64)
+        for column in columns:
+            # Codes per column are small, so the combined key is recompressed after each column
+            values, codes = np.unique(column, return_inverse=True)
+            key = np.unique(key * len(values) + codes.ravel(), return_inverse=True)[1].ravel()
+        first = np.unique(key, return_index=True)[1]
+        # Number groups in order of first appearance
+        order = np.argsort(first)
+        renumber = np.empty_like(order)
+        renumber[order] = np.arange(len(order))
+        return renumber[key], first[order]
+
+    @instrumented("DecapCalculator.calculate_lambda10_distance_batch")
+    def calculate_lambda10_distance_batch(self, frequencies: Sequence[float],
+                                          dielectric_constants: Optional[Sequence[float]] = None) -> np.ndarray:
+        """Vectorized calculate_lambda10_distance"""
+        er = self.FR4_ER if dielectric_constants is None else np.asarray(dielectric_constants, dtype=float)
+        speed_in_fr4 = 299792458 / np.sqrt(er)
+        return (speed_in_fr4 / np.asarray(frequencies, dtype=float) / 10) * 1000
@@ -0,0 +1,284 @@
+import csv
+import re
+from typing import Dict, Iterator, List, Optional, Sequence, TextIO, Tuple, Union
+import numpy as np
+
+NUMERIC_COLUMNS = ("capacitance", "voltage_rating", "esr", "esl", "price")
+CATEGORY_COLUMNS = ("dielectric", "package")
+
+# Common vendor header spellings mapped to catalog columns
+COLUMN_ALIASES = {
+    "part": "part_number", "mpn": "part_number", "value": "capacitance",
+    "voltage": "voltage_rating", "rated_voltage": "voltage_rating",
+    "cost": "price", "case": "package", "size": "package", "tc": "dielectric",
+}
+
+SI_PREFIXES = {'p': 1e-12, 'n': 1e-9, 'u': 1e-6, 'µ': 1e-6, 'm': 1e-3, 'k': 1e3, 'M': 1e6}
+_QUANTITY = re.compile(r'^\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*([pnuµmkM]?)\s*'
+                       r'(?:F|V|H|Ω|ohms?|R)?\s*$')
+
+def parse_quantity(text: str) -> float:
+    """Parse a number with an optional SI prefix and unit, e.g. "4.7uF" or "25 mΩ" """
+    match = _QUANTITY.match(text)
+    if not match:
+        raise ValueError(f"Invalid quantity: {text!r}")
+    return float(match.group(1)) * SI_PREFIXES.get(match.group(2), 1.0)
+
+class CapacitorCatalog:
+    """Columnar, array-backed part catalog with indexed filtered queries
+
+    Each column is one NumPy array; dielectric and package are stored as
+    small integer codes into category lists. On the first query the
+    catalog builds sorted indexes on capacitance and voltage rating, a
+    packed bitmap per dielectric and package, and each category's rows in
+    capacitance order. A query starts from whichever index gives the fewest
+    candidates inside the capacitance window and checks the remaining
+    filters on just those rows, category filters by bitmap lookup.
+
+    A catalog is also a sequence of its capacitance values, so a query
+    result can be passed straight to the combination finders.
+    """
+
+    def __init__(self, part_numbers: Sequence[str], columns: Dict[str, Sequence[float]],
+                 dielectric_codes: Sequence[int], dielectrics: List[str],
+                 package_codes: Sequence[int], packages: List[str]):
+        self.part_numbers = np.asarray(part_numbers, dtype=str)
+        count = len(self.part_numbers)
+        self.columns = {name: np.asarray(columns.get(name, np.full(count, np.nan)), dtype=float)
+                        for name in NUMERIC_COLUMNS}
+        self.dielectric_codes = np.asarray(dielectric_codes, dtype=np.uint16)
+        self.package_codes = np.asarray(package_codes, dtype=np.uint16)
+        self.dielectrics = dielectrics
+        self.packages = packages
+        self._indexes = None
+
+    @classmethod
+    def from_csv(cls, source: Union[str, TextIO]) -> 'CapacitorCatalog':
+        """Ingest a vendor CSV; values may carry SI prefixes and units"""
+        if isinstance(source, str):
+            with open(source, newline='') as f:
+                return cls.from_csv(f)
+
+        reader = csv.reader(source)
+        header = [COLUMN_ALIASES.get(h.strip().lower(), h.strip().lower()) for h in next(reader, [])]
+        if "capacitance" not in header:
+            raise ValueError("Catalog needs a capacitance column")
+        position = {name: header.index(name) for name in header}
+        numeric = {name: [] for name in NUMERIC_COLUMNS}
+        categories = {name: ({}, []) for name in CATEGORY_COLUMNS}  # name -> (code map, codes)
+        part_numbers = []
+
+        def cell(row: List[str], name: str) -> str:
+            i = position.get(name)
+            return row[i].strip() if i is not None and i < len(row) else ""
+
+        for line, row in enumerate(reader, start=2):
+            if not any(text.strip() for text in row):
+                continue
+            try:
+                for name in NUMERIC_COLUMNS:
+                    text = cell(row, name)
+                    numeric[name].append(parse_quantity(text) if text else np.nan)
+            except ValueError as e:
+                raise ValueError(f"Line {line}: {e}")
+            if np.isnan(numeric["capacitance"][-1]):
+                raise ValueError(f"Line {line}: missing capacitance")
+            for name, (codes, column) in categories.items():
+                column.append(codes.setdefault(cell(row, name), len(codes)))
+            part_numbers.append(cell(row, "part_number") or f"row{line - 1}")
+
+        return cls(part_numbers, numeric,
+                   categories["dielectric"][1], list(categories["dielectric"][0]),
+                   categories["package"][1], list(categories["package"][0]))
+
+    def save(self, path: str) -> None:
+        """Write the columns to one .npz file"""
+        np.savez(path, part_numbers=self.part_numbers, dielectric_codes=self.dielectric_codes,
+                 package_codes=self.package_codes, dielectrics=np.array(self.dielectrics, dtype=str),
+                 packages=np.array(self.packages, dtype=str), **self.columns)
+
+    @classmethod
+    def load(cls, path: str) -> 'CapacitorCatalog':
+        """Read a catalog written by save"""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data["part_numbers"], {name: data[name] for name in NUMERIC_COLUMNS},
+                       data["dielectric_codes"], data["dielectrics"].tolist(),
+                       data["package_codes"], data["packages"].tolist())
+
+    def __len__(self) -> int:
+        return len(self.part_numbers)
+
+    def __getitem__(self, i: int) -> float:
+        return float(self.columns["capacitance"][i])
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.columns["capacitance"].tolist())
+
+    def values(self) -> List[float]:
+        """Capacitance of every row, for APIs that take bare values"""
+        return self.columns["capacitance"].tolist()
+
+    def parts(self) -> List[Dict[str, Union[float, str]]]:
+        """Rows as part dicts in the PDNOptimizer format; blank fields are left out"""
+        parts = []
+        for row in range(len(self)):
+            part = {"name": str(self.part_numbers[row]),
+                    "dielectric": self.dielectrics[self.dielectric_codes[row]],
+                    "package": self.packages[self.package_codes[row]]}
+            for name in NUMERIC_COLUMNS:
+                value = self.columns[name][row]
+                if not np.isnan(value):
+                    part["cost" if name == "price" else name] = float(value)
+            parts.append(part)
+        return parts
+
+    def take(self, rows: Sequence[int]) -> 'CapacitorCatalog':
+        """Sub-catalog of the given rows, in that order"""
+        rows = np.asarray(rows, dtype=np.intp)
+        return CapacitorCatalog(self.part_numbers[rows],
+                                {name: column[rows] for name, column in self.columns.items()},
+                                self.dielectric_codes[rows], self.dielectrics,
+                                self.package_codes[rows], self.packages)
+
+    def cheapest(self, limit: int) -> 'CapacitorCatalog':
+        """The `limit` lowest-priced rows, unpriced rows last"""
+        order = np.lexsort((self.columns["capacitance"], np.nan_to_num(self.columns["price"], nan=np.inf)))
+        return self.take(order[:limit])
+
+    def srf(self) -> np.ndarray:
+        """Self-resonant frequency of every row from capacitance and ESL; NaN where ESL is blank"""
+        return 1 / (2 * np.pi * np.sqrt(self.columns["capacitance"] * self.columns["esl"]))
+
+    def cheapest_matches(self, min_capacitances: Sequence[float], min_srfs: Sequence[float],
+                         block_size: int = 1 << 22) -> np.ndarray:
+        """Row of the cheapest part meeting each (capacitance, SRF) requirement, -1 where none does
+
+        Rows are ranked once by price (unpriced last), then capacitance; each
+        requirement takes the first ranked row that satisfies it. Rows without
+        an ESL have no known SRF and never match.
+        """
+        min_capacitance = np.asarray(min_capacitances, dtype=float).ravel()
+        min_srf = np.broadcast_to(np.asarray(min_srfs, dtype=float).ravel(), min_capacitance.shape)
+        ranked = np.lexsort((self.columns["capacitance"], np.nan_to_num(self.columns["price"], nan=np.inf)))
+        srf = self.srf()[ranked]
+        usable = ~np.isnan(srf)
+        ranked, caps, srf = ranked[usable], self.columns["capacitance"][ranked][usable], srf[usable]
+
+        rows = np.full(len(min_capacitance), -1, dtype=np.intp)
+        if not len(ranked):
+            return rows
+        step = max(1, block_size // len(ranked))
+        for first in range(0, len(min_capacitance), step):
+            block = slice(first, first + step)
+            ok = (caps >= min_capacitance[block, np.newaxis]) & (srf >= min_srf[block, np.newaxis])
+            best = ok.argmax(axis=1)
+            rows[block] = np.where(ok[np.arange(len(best)), best], ranked[best], -1)
+        return rows
+
+    def query(self, dielectric: Union[None, str, Sequence[str]] = None,
+              package: Union[None, str, Sequence[str]] = None,
+              min_voltage: Optional[float] = None, max_voltage: Optional[float] = None,
+              min_capacitance: Optional[float] = None, max_capacitance: Optional[float] = None,
+              max_esr: Optional[float] = None, max_price: Optional[float] = None) -> 'CapacitorCatalog':
+        """Sub-catalog of rows matching every given filter, in capacitance order"""
+        return self.take(self.query_rows(dielectric, package, min_voltage, max_voltage,
+                                         min_capacitance, max_capacitance, max_esr, max_price))
+
+    def query_rows(self, dielectric: Union[None, str, Sequence[str]] = None,
+                   package: Union[None, str, Sequence[str]] = None,
+                   min_voltage: Optional[float] = None, max_voltage: Optional[float] = None,
+                   min_capacitance: Optional[float] = None, max_capacitance: Optional[float] = None,
+                   max_esr: Optional[float] = None, max_price: Optional[float] = None) -> np.ndarray:
+        """Row numbers matching every given filter, in capacitance order"""
+        index = self._build_indexes()
+        filters = {"dielectric": self._codes(self.dielectrics, dielectric),
+                   "package": self._codes(self.packages, package)}
+
+        # Candidate sources, each already cut to the capacitance window; start from the smallest
+        order, caps = index["capacitance"]
+        lo, hi = self._window(caps, min_capacitance, max_capacitance)
+        sources = [("capacitance", [order[lo:hi]])]
+        for name, codes in filters.items():
+            if codes is not None:
+                slices = []
+                for code in codes:
+                    rows, row_caps = index[name][code]
+                    a, b = self._window(row_caps, min_capacitance, max_capacitance)
+                    slices.append(rows[a:b])
+                sources.append((name, slices))
+        if min_voltage is not None or max_voltage is not None:
+            v_order, v_sorted = index["voltage_rating"]
+            a, b = self._window(v_sorted, min_voltage, max_voltage)
+            sources.append(("voltage_rating", [v_order[a:b]]))
+        source, slices = min(sources, key=lambda item: sum(len(rows) for rows in item[1]))
+        rows = slices[0] if len(slices) == 1 else np.concatenate(slices or [np.empty(0, dtype=np.intp)])
+
+        mask = np.ones(len(rows), dtype=bool)
+        for name, codes in filters.items():
+            if codes is not None and name != source:
+                mask &= self._bitmap_test(self._category_bitmap(index["bitmaps"][name], codes), rows)
+        capacitance = self.columns["capacitance"][rows]
+        voltage = self.columns["voltage_rating"][rows]
+        for values, low, high in ((capacitance, min_capacitance, max_capacitance),
+                                  (voltage, min_voltage, max_voltage)):
+            if low is not None:
+                mask &= values >= low
+            if high is not None:
+                mask &= values <= high
+        if max_esr is not None:
+            mask &= self.columns["esr"][rows] <= max_esr
+        if max_price is not None:
+            mask &= self.columns["price"][rows] <= max_price
+        rows = rows[mask]
+
+        if source == "capacitance" or (len(slices) == 1 and source != "voltage_rating"):
+            return rows  # Sources other than the voltage index are already in capacitance order
+        return rows[np.lexsort((rows, self.columns["capacitance"][rows]))]
+
+    def _build_indexes(self) -> Dict[str, object]:
+        """Sorted indexes, category bitmaps and per-category row lists, built once on first use"""
+        if self._indexes is None:
+            indexes = {"bitmaps": {}}
+            for name in ("capacitance", "voltage_rating"):
+                order = np.argsort(self.columns[name], kind='stable')
+                known = len(order) - int(np.isnan(self.columns[name]).sum())  # NaN sorts last; leave it out
+                indexes[name] = (order[:known], self.columns[name][order[:known]])
+            order, caps = indexes["capacitance"]
+            for name, codes, categories in (("dielectric", self.dielectric_codes, self.dielectrics),
+                                            ("package", self.package_codes, self.packages)):
+                indexes["bitmaps"][name] = [np.packbits(codes == code) for code in range(len(categories))]
+                # Rows of each category in capacitance order, so a capacitance range is one slice
+                in_order = codes[order]
+                indexes[name] = [(order[in_order == code], caps[in_order == code])
+                                 for code in range(len(categories))]
+            self._indexes = indexes
+        return self._indexes
+
+    @staticmethod
+    def _codes(categories: List[str], wanted: Union[None, str, Sequence[str]]) -> Optional[List[int]]:
+        """Codes of the wanted category names; unknown names match nothing"""
+        if wanted is None:
+            return None
+        names = [wanted] if isinstance(wanted, str) else list(wanted)
+        return [categories.index(n) for n in names if n in categories]
+
+    @staticmethod
+    def _window(sorted_values: np.ndarray, low: Optional[float], high: Optional[float]) -> Tuple[int, int]:
+        """Slice bounds of a closed value range in a sorted array"""
+        lo = 0 if low is None else int(np.searchsorted(sorted_values, low, side='left'))
+        hi = len(sorted_values) if high is None else int(np.searchsorted(sorted_values, high, side='right'))
+        return lo, max(lo, hi)
+
+    def _category_bitmap(self, bitmaps: List[np.ndarray], codes: List[int]) -> np.ndarray:
+        """OR of the packed bitmaps of several category codes"""
+        if len(codes) == 1:
+            return bitmaps[codes[0]]
+        combined = np.zeros((len(self) + 7) // 8, dtype=np.uint8)
+        for code in codes:
+            combined |= bitmaps[code]
+        return combined
+
+    @staticmethod
+    def _bitmap_test(bitmap: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """Look up the bits of the given rows in a packed bitmap"""
+        return ((bitmap[rows >> 3] >> (7 - (rows & 7)).astype(np.uint8)) & 1).astype(bool)
@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+
+class CombinationIndex:
+    """Precomputed index of every k-part parallel and series value of a library
+
+    All combinations of 1..max_components parts (with repetition) are
+    enumerated once and stored as value-sorted arrays next to a compact
+    matrix of part indices, padded with -1. The arrays are saved as plain
+    .npy files so a saved index can be memory-mapped, and each target query
+    is a binary search over the tolerance window. Unlike the recursive
+    finders, the index returns every combination inside the window,
+    including ones that extend a smaller matching combination.
+    """
+
+    FORMAT_VERSION = 1
+    TOPOLOGIES = ('parallel', 'series')
+
+    def __init__(self, library: np.ndarray, max_components: int,
+                 values: dict, parts: dict):
+        self.library = library
+        self.max_components = max_components
+        self.values = values
+        self.parts = parts
+        self.fingerprint = self.library_fingerprint(library, max_components)
+
+    @staticmethod
+    def library_fingerprint(available_values: Sequence[float], max_components: int) -> str:
+        """Hash a library so a stale index can be detected"""
+        library = np.sort(np.asarray(available_values, dtype=np.float64))
+        digest = hashlib.sha256(library.tobytes())
+        digest.update(f"{max_components}:{CombinationIndex.FORMAT_VERSION}".encode())
+        return digest.hexdigest()
+
+    @classmethod
+    def build(cls, available_values: Sequence[float], max_components: int = 3) -> 'CombinationIndex':
+        """Enumerate all combinations of up to max_components parts"""
+        library = np.sort(np.asarray(available_values, dtype=np.float64))
+        if len(library) == 0 or max_components < 1:
+            raise ValueError("Index needs a non-empty library and at least one component")
+        index_type = np.int16 if len(library) < np.iinfo(np.int16).max else np.int32
+
+        # Grow non-decreasing index tuples one part at a time
+        blocks = []
+        current = np.arange(len(library), dtype=index_type).reshape(-1, 1)
+        blocks.append(current)
+        for _ in range(1, max_components):
+            extended = []
+            for j in range(len(library)):
+                rows = current[current[:, -1] <= j]
+                extended.append(np.hstack([rows, np.full((len(rows), 1), j, dtype=index_type)]))
+            current = np.concatenate(extended)
+            blocks.append(current)
+
+        parts = np.full((sum(len(b) for b in blocks), max_components), -1, dtype=index_type)
+        offset = 0
+        for block in blocks:
+            parts[offset:offset + len(block), :block.shape[1]] = block
+            offset += len(block)
+
+        used = parts >= 0
+        caps = np.where(used, library[np.maximum(parts, 0)], 0.0)
+        reciprocals = np.where(used, 1 / np.where(used, caps, 1.0), 0.0)
+        totals = {'parallel': caps.sum(axis=1), 'series': 1 / reciprocals.sum(axis=1)}
+
+        values, sorted_parts = {}, {}
+        for topology in cls.TOPOLOGIES:
+            order = np.argsort(totals[topology], kind='stable')
+            values[topology] = totals[topology][order]
+            sorted_parts[topology] = parts[order]
+        return cls(library, max_components, values, sorted_parts)
+
+    def save(self, directory: str) -> None:
+        """Write the index as memory-mappable .npy files plus metadata"""
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, 'library.npy'), self.library)
+        for topology in self.TOPOLOGIES:
+            np.save(os.path.join(directory, f'{topology}_values.npy'), self.values[topology])
+            np.save(os.path.join(directory, f'{topology}_parts.npy'), self.parts[topology])
+        meta = {
+            "format_version": self.FORMAT_VERSION,
+            "max_components": self.max_components,
+            "fingerprint": self.fingerprint,
+        }
+        with open(os.path.join(directory, 'index.json'), 'w') as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, directory: str, available_values: Optional[Sequence[float]] = None,
+             mmap: bool = True) -> 'CombinationIndex':
+        """Load a saved index, checking it still matches the given library"""
+        with open(os.path.join(directory, 'index.json')) as f:
+            meta = json.load(f)
+        if meta.get("format_version") != cls.FORMAT_VERSION:
+            raise ValueError(f"Unsupported index format: {meta.get('format_version')}")
+
+        mode = 'r' if mmap else None
+        library = np.load(os.path.join(directory, 'library.npy'))
+        max_components = meta["max_components"]
+        if available_values is not None and \
+                cls.library_fingerprint(available_values, max_components) != meta["fingerprint"]:
+            raise ValueError("Combination index is stale: the library has changed")
+
+        values = {t: np.load(os.path.join(directory, f'{t}_values.npy'), mmap_mode=mode)
+                  for t in cls.TOPOLOGIES}
+        parts = {t: np.load(os.path.join(directory, f'{t}_parts.npy'), mmap_mode=mode)
+                 for t in cls.TOPOLOGIES}
+        return cls(library, max_components, values, parts)
+
+    @classmethod
+    def open_or_build(cls, directory: str, available_values: Sequence[float],
+                      max_components: int = 3) -> 'CombinationIndex':
+        """Load the index from disk, rebuilding it when missing or stale"""
+        try:
+            index = cls.load(directory, available_values)
+            if index.max_components == max_components:
+                return index
+        except (OSError, ValueError, KeyError):
+            pass
+        index = cls.build(available_values, max_components)
+        index.save(directory)
+        return index
+
+    def is_current(self, available_values: Sequence[float]) -> bool:
+        """Check whether the index was built from this library"""
+        return self.library_fingerprint(available_values, self.max_components) == self.fingerprint
+
+    def find_parallel(self, target: float, tolerance: float = 0.01) -> List[List[float]]:
+        """Find parallel combinations within tolerance of the target"""
+        return self._lookup('parallel', target, tolerance)
+
+    def find_series(self, target: float, tolerance: float = 0.01) -> List[List[float]]:
+        """Find series combinations within tolerance of the target"""
+        return self._lookup('series', target, tolerance)
+
+    def window(self, topology: str, target: float, tolerance: float = 0.01) -> Tuple[int, int]:
+        """Return the [start, end) row range whose values lie within tolerance"""
+        values = self.values[topology]
+        tol = target * tolerance
+        start = int(np.searchsorted(values, target - tol, side='right'))
+        end = int(np.searchsorted(values, target + tol, side='left'))
+        return start, max(start, end)
+
+    def _lookup(self, topology: str, target: float, tolerance: float) -> List[List[float]]:
+        """Convert a tolerance window into lists of capacitor values"""
+        start, end = self.window(topology, target, tolerance)
+        library = self.library.tolist()
+        return [[library[i] for i in row if i >= 0]
+                for row in np.asarray(self.parts[topology][start:end]).tolist()]
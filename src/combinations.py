@@ -1,5 +1,10 @@
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Iterator, Optional, Union
+import heapq
 import math
+import numpy as np
+from .derating import DeratingLibrary
+from .instrumentation import instrumented
+from .search import ParallelSearch, SeriesSearch, SearchBudget
 
 class CapacitorCombinations:
     @staticmethod
@@ -15,50 +20,96 @@ class CapacitorCombinations:
         return 1 / sum(1/c for c in capacitors)
     
     @staticmethod
+    @instrumented("CapacitorCombinations.find_parallel_combination")
     def find_parallel_combination(target: float, available_values: List[float], 
-                                max_components: int = 3) -> List[List[float]]:
+                                max_components: int = 3,
+                                tolerance: float = 0.01) -> List[List[float]]:
         """Find possible parallel combinations to achieve target capacitance"""
-        results = []
-        available_values = sorted(available_values)
-        
-        def find_combinations(remaining: float, current: List[float], start_idx: int):
-            if len(current) > max_components:
-                return
-            
-            if abs(remaining) < target * 0.01:  # 1% tolerance
-                results.append(current.copy())
-                return
-                
-            for i in range(start_idx, len(available_values)):
-                if available_values[i] <= remaining:
-                    current.append(available_values[i])
-                    find_combinations(remaining - available_values[i], current, i)
-                    current.pop()
-        
-        find_combinations(target, [], 0)
-        return results
+        return ParallelSearch(available_values, max_components).find(target, tolerance)
     
     @staticmethod
+    @instrumented("CapacitorCombinations.find_series_combination")
     def find_series_combination(target: float, available_values: List[float], 
-                              max_components: int = 3) -> List[List[float]]:
+                              max_components: int = 3,
+                              tolerance: float = 0.01) -> List[List[float]]:
         """Find possible series combinations to achieve target capacitance"""
-        results = []
-        available_values = sorted(available_values, reverse=True)
-        
-        def find_combinations(current: List[float], start_idx: int):
-            current_cap = CapacitorCombinations.series_combination(current) if current else float('inf')
-            
-            if len(current) > max_components:
-                return
-                
-            if abs(current_cap - target) < target * 0.01:  # 1% tolerance
-                results.append(current.copy())
-                return
-                
-            for i in range(start_idx, len(available_values)):
-                current.append(available_values[i])
-                find_combinations(current, i)
-                current.pop()
-        
-        find_combinations([], 0)
-        return results 
\ No newline at end of file
+        return SeriesSearch(available_values, max_components).find(target, tolerance)
+    
+    @staticmethod
+    @instrumented("CapacitorCombinations.find_derated_parallel_combination")
+    def find_derated_parallel_combination(target: float, available_values: List[float], voltage: float,
+                                          dielectric: Union[str, List[str]] = 'X7R',
+                                          package: Union[None, str, List[str]] = None,
+                                          temperature: float = 25, max_components: int = 3,
+                                          tolerance: float = 0.01,
+                                          derating: Optional[DeratingLibrary] = None) -> List[List[float]]:
+        """Find parallel combinations whose capacitance at the bias voltage meets the target
+
+        Combinations are returned as nominal values; dielectric and package
+        may be given per value.
+        """
+        library = derating or DeratingLibrary.load()
+        effective = library.derate(available_values, dielectric, voltage, temperature, package)
+        order = np.argsort(effective, kind='stable')
+        engine = ParallelSearch(effective[order].tolist(), max_components)
+        nominal = [available_values[i] for i in order]
+        return [[nominal[i] for i in combo] for combo in sorted(engine.iter_indices(target, tolerance))]
+    
+    @staticmethod
+    def iter_parallel_combination(target: float, available_values: List[float],
+                                  max_components: int = 3, tolerance: float = 0.01,
+                                  budget: Optional[SearchBudget] = None) -> Iterator[List[float]]:
+        """Yield parallel combinations as they are found"""
+        engine = ParallelSearch(available_values, max_components)
+        for combo in engine.iter_indices(target, tolerance, budget):
+            yield [engine.values[i] for i in combo]
+    
+    @staticmethod
+    def iter_series_combination(target: float, available_values: List[float],
+                                max_components: int = 3, tolerance: float = 0.01,
+                                budget: Optional[SearchBudget] = None) -> Iterator[List[float]]:
+        """Yield series combinations as they are found"""
+        engine = SeriesSearch(available_values, max_components)
+        for combo in engine.iter_indices(target, tolerance, budget):
+            yield [engine.values[i] for i in combo]
+    
+    @staticmethod
+    @instrumented("CapacitorCombinations.top_parallel_combinations")
+    def top_parallel_combinations(target: float, available_values: List[float], top_k: int = 10,
+                                  max_components: int = 3, tolerance: float = 0.01,
+                                  time_limit: Optional[float] = None,
+                                  max_nodes: Optional[int] = None) -> List[List[float]]:
+        """Find the best parallel combinations, stopping early when a budget runs out"""
+        budget = SearchBudget(time_limit, max_nodes)
+        matches = CapacitorCombinations.iter_parallel_combination(
+            target, available_values, max_components, tolerance, budget)
+        return CapacitorCombinations._best(matches, target, top_k,
+                                           CapacitorCombinations.parallel_combination)
+    
+    @staticmethod
+    @instrumented("CapacitorCombinations.top_series_combinations")
+    def top_series_combinations(target: float, available_values: List[float], top_k: int = 10,
+                                max_components: int = 3, tolerance: float = 0.01,
+                                time_limit: Optional[float] = None,
+                                max_nodes: Optional[int] = None) -> List[List[float]]:
+        """Find the best series combinations, stopping early when a budget runs out"""
+        budget = SearchBudget(time_limit, max_nodes)
+        matches = CapacitorCombinations.iter_series_combination(
+            target, available_values, max_components, tolerance, budget)
+        return CapacitorCombinations._best(matches, target, top_k,
+                                           CapacitorCombinations.series_combination)
+    
+    @staticmethod
+    def _best(matches: Iterator[List[float]], target: float, top_k: int,
+              combine) -> List[List[float]]:
+        """Keep the top_k matches by absolute error, then part count, in a bounded heap"""
+        if top_k <= 0:
+            return []
+        heap = []  # Max-heap on (error, parts) via negated keys
+        for order, combo in enumerate(matches):
+            key = (-abs(combine(combo) - target), -len(combo), -order)
+            if len(heap) < top_k:
+                heapq.heappush(heap, (key, combo))
+            elif key > heap[0][0]:
+                heapq.heapreplace(heap, (key, combo))
+        return [combo for _, combo in sorted(heap, reverse=True)]
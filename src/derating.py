@@ -0,0 +1,146 @@
+import csv
+import functools
+import os
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+
+DEFAULT_TABLE_PATH = os.path.join(os.path.dirname(__file__), "data", "derating.csv")
+DEFAULT_PACKAGE = '0805'
+
+class DeratingLibrary:
+    """Capacitance ratio C/C_nominal over DC bias and temperature per dielectric and package
+
+    Tables are read from a CSV with dielectric, package, voltage, temperature
+    and ratio columns, one row per grid point. On load every table is
+    resampled onto one shared (voltage x temperature) grid; bilinear
+    interpolation on the union of the axes reproduces each table's own
+    bilinear surface exactly, and it lets a query over many parts gather
+    from a single (tables x voltages x temperatures) array. Queries outside
+    the grid are clamped to its edges.
+    """
+
+    def __init__(self, tables: Dict[Tuple[str, str], Tuple[Sequence[float], Sequence[float], np.ndarray]]):
+        if not tables:
+            raise ValueError("No derating tables")
+        self.voltages = np.unique(np.concatenate([np.asarray(v, dtype=float) for v, _, _ in tables.values()]))
+        self.temperatures = np.unique(np.concatenate([np.asarray(t, dtype=float) for _, t, _ in tables.values()]))
+        self.keys: List[Tuple[str, str]] = sorted(tables)
+        self._ids = {key: i for i, key in enumerate(self.keys)}
+        self.grid = np.empty((len(self.keys), len(self.voltages), len(self.temperatures)))
+        volts, temps = np.meshgrid(self.voltages, self.temperatures, indexing='ij')
+        for i, key in enumerate(self.keys):
+            v, t, ratios = tables[key]
+            self.grid[i] = self._bilinear(np.asarray(v, dtype=float), np.asarray(t, dtype=float),
+                                          np.asarray(ratios, dtype=float)[np.newaxis],
+                                          np.zeros(volts.size, dtype=int), volts.ravel(),
+                                          temps.ravel()).reshape(volts.shape)
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> 'DeratingLibrary':
+        """Load a table file, reusing the parsed library while the file is unchanged"""
+        path = os.path.abspath(path or DEFAULT_TABLE_PATH)
+        return _load_cached(path, os.path.getmtime(path))
+
+    @classmethod
+    def from_csv(cls, path: str) -> 'DeratingLibrary':
+        """Parse a table file without caching"""
+        points: Dict[Tuple[str, str], Dict[Tuple[float, float], float]] = {}
+        with open(path, newline='') as f:
+            for row in csv.DictReader(f):
+                key = (row["dielectric"].strip(), row["package"].strip())
+                points.setdefault(key, {})[(float(row["voltage"]), float(row["temperature"]))] = \
+                    float(row["ratio"])
+
+        tables = {}
+        for key, grid in points.items():
+            voltages = sorted({v for v, _ in grid})
+            temperatures = sorted({t for _, t in grid})
+            try:
+                ratios = np.array([[grid[(v, t)] for t in temperatures] for v in voltages])
+            except KeyError:
+                raise ValueError(f"Derating table {key[0]}/{key[1]} is not a full grid")
+            tables[key] = (voltages, temperatures, ratios)
+        return cls(tables)
+
+    def dielectrics(self) -> List[str]:
+        """Dielectric types with at least one table"""
+        return sorted({d for d, _ in self.keys})
+
+    def index(self, dielectric: str, package: Optional[str] = None) -> int:
+        """Table id of a dielectric and package, for use with ratio_by_index"""
+        key = (dielectric, package or DEFAULT_PACKAGE)
+        if key not in self._ids:
+            raise ValueError(f"No derating table for {key[0]} {key[1]}")
+        return self._ids[key]
+
+    def ratio(self, dielectric: Union[str, Sequence[str]], voltage: Union[float, Sequence[float]],
+              temperature: Union[float, Sequence[float]] = 25,
+              package: Union[None, str, Sequence[str]] = None) -> np.ndarray:
+        """Capacitance ratio at each (part, V, T); arguments broadcast against each other"""
+        voltage, temperature = np.broadcast_arrays(np.asarray(voltage, dtype=float),
+                                                   np.asarray(temperature, dtype=float))
+        if isinstance(dielectric, str) and (package is None or isinstance(package, str)):
+            ids = np.full(voltage.shape, self.index(dielectric, package))
+        else:
+            # Per-part lists set the part count; a single dielectric or package applies to every part
+            lists = [list(v) for v in (dielectric, package) if v is not None and not isinstance(v, str)]
+            if len({len(v) for v in lists}) > 1:
+                raise ValueError(f"Dielectric and package lists differ in length: {[len(v) for v in lists]}")
+            count = len(lists[0])
+            dielectrics = [dielectric] * count if isinstance(dielectric, str) else list(dielectric)
+            packages = [package] * count if package is None or isinstance(package, str) else list(package)
+            ids = np.array([self.index(d, p) for d, p in zip(dielectrics, packages)], dtype=int)
+        return self.ratio_by_index(ids, voltage, temperature)
+
+    def ratio_by_index(self, ids: Union[int, Sequence[int]], voltage: Union[float, Sequence[float]],
+                       temperature: Union[float, Sequence[float]]) -> np.ndarray:
+        """Capacitance ratio for precomputed table ids, vectorized over all arguments"""
+        ids, voltage, temperature = np.broadcast_arrays(np.asarray(ids, dtype=int),
+                                                        np.asarray(voltage, dtype=float),
+                                                        np.asarray(temperature, dtype=float))
+        ratios = self._bilinear(self.voltages, self.temperatures, self.grid,
+                                ids.ravel(), voltage.ravel(), temperature.ravel())
+        return ratios.reshape(ids.shape)
+
+    def worst_ratio(self, dielectric: str, voltage: Union[float, Sequence[float]],
+                    temp_range: Tuple[float, float], package: Optional[str] = None) -> np.ndarray:
+        """Lowest ratio over a temperature range at each bias voltage"""
+        low, high = sorted(temp_range)
+        # The surface is piecewise linear in temperature, so its minimum is at a grid line or an end
+        inside = self.temperatures[(self.temperatures > low) & (self.temperatures < high)]
+        temperatures = np.concatenate(([low, high], inside))
+        voltage = np.asarray(voltage, dtype=float)[..., np.newaxis]
+        return self.ratio(dielectric, voltage, temperatures, package).min(axis=-1)
+
+    def derate(self, capacitances: Sequence[float], dielectric: Union[str, Sequence[str]],
+               voltage: Union[float, Sequence[float]], temperature: Union[float, Sequence[float]] = 25,
+               package: Union[None, str, Sequence[str]] = None) -> np.ndarray:
+        """Effective capacitance of each part at its bias and temperature"""
+        return np.asarray(capacitances, dtype=float) * self.ratio(dielectric, voltage, temperature, package)
+
+    @staticmethod
+    def _bilinear(voltages: np.ndarray, temperatures: np.ndarray, grid: np.ndarray,
+                  ids: np.ndarray, voltage: np.ndarray, temperature: np.ndarray) -> np.ndarray:
+        """Bilinear interpolation of grid[ids] at (voltage, temperature), clamped to the axes"""
+        v = np.clip(voltage, voltages[0], voltages[-1])
+        t = np.clip(temperature, temperatures[0], temperatures[-1])
+        i = np.clip(np.searchsorted(voltages, v, side='right') - 1, 0, max(len(voltages) - 2, 0))
+        j = np.clip(np.searchsorted(temperatures, t, side='right') - 1, 0, max(len(temperatures) - 2, 0))
+        i1 = np.minimum(i + 1, len(voltages) - 1)
+        j1 = np.minimum(j + 1, len(temperatures) - 1)
+        dv = voltages[i1] - voltages[i]
+        dt = temperatures[j1] - temperatures[j]
+        fv = np.divide(v - voltages[i], dv, out=np.zeros_like(v), where=dv > 0)
+        ft = np.divide(t - temperatures[j], dt, out=np.zeros_like(t), where=dt > 0)
+        flat = grid.reshape(-1)
+        row = (ids * len(voltages) + i) * len(temperatures)
+        row1 = (ids * len(voltages) + i1) * len(temperatures)
+        low = flat[row + j] * (1 - ft) + flat[row + j1] * ft
+        high = flat[row1 + j] * (1 - ft) + flat[row1 + j1] * ft
+        return low * (1 - fv) + high * fv
+
+
+@functools.lru_cache(maxsize=8)
+def _load_cached(path: str, mtime: float) -> DeratingLibrary:
+    """Parsed library per file path and modification time"""
+    return DeratingLibrary.from_csv(path)
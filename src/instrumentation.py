@@ -0,0 +1,160 @@
+import functools
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, TextIO, Union
+
+class SearchStats:
+    """Counters a search engine fills in while a call is being profiled"""
+
+    __slots__ = ("nodes", "pruned", "emitted", "peak_depth")
+
+    def __init__(self):
+        self.nodes = 0
+        self.pruned = 0
+        self.emitted = 0
+        self.peak_depth = 0
+
+    def enter(self, depth: int) -> None:
+        """Count one visited node at the given recursion depth"""
+        self.nodes += 1
+        if depth > self.peak_depth:
+            self.peak_depth = depth
+
+
+class CallRecord:
+    """Wall time and search counters of one instrumented call"""
+
+    __slots__ = ("name", "wall_time", "search")
+
+    def __init__(self, name: str, wall_time: float, search: SearchStats):
+        self.name = name
+        self.wall_time = wall_time
+        self.search = search
+
+    def as_dict(self) -> Dict[str, object]:
+        """Flatten the record for JSON output"""
+        return {
+            "name": self.name,
+            "wall_time": self.wall_time,
+            "nodes": self.search.nodes,
+            "pruned": self.search.pruned,
+            "emitted": self.search.emitted,
+            "peak_depth": self.search.peak_depth,
+        }
+
+
+class CallStats:
+    """Aggregated records for every call of one function"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.nodes = 0
+        self.pruned = 0
+        self.emitted = 0
+        self.peak_depth = 0
+
+    def add(self, record: CallRecord) -> None:
+        """Fold one call record into the totals"""
+        self.calls += 1
+        self.total_time += record.wall_time
+        self.max_time = max(self.max_time, record.wall_time)
+        self.nodes += record.search.nodes
+        self.pruned += record.search.pruned
+        self.emitted += record.search.emitted
+        self.peak_depth = max(self.peak_depth, record.search.peak_depth)
+
+
+class Profiler:
+    """Context manager that switches instrumentation on for its block
+
+        with Profiler() as profiler:
+            CapacitorCombinations.find_parallel_combination(47e-6, values, 4)
+        print(profiler.report())
+        profiler.dump_collapsed("stacks.txt")  # flamegraph.pl / speedscope input
+
+    Outside a profiler every instrumented call goes straight to the wrapped
+    function after one global check, and the search engines skip their
+    counters entirely. Profilers nest; the innermost one records.
+    """
+
+    def __init__(self, max_records: int = 10_000):
+        self.records: Deque[CallRecord] = deque(maxlen=max_records)
+        self.stats: Dict[str, CallStats] = {}
+        self.collapsed: Dict[str, float] = {}  # call path -> self time in seconds
+        self._stack: List[List] = []  # [name, search stats, child time]
+        self._previous: Optional['Profiler'] = None
+
+    def __enter__(self) -> 'Profiler':
+        global _active
+        self._previous = _active
+        _active = self
+        return self
+
+    def __exit__(self, *exc) -> None:
+        global _active
+        _active = self._previous
+        self._previous = None
+
+    def report(self) -> str:
+        """Format the aggregated stats as a table, slowest first"""
+        lines = [f"{'function':<48} {'calls':>6} {'total ms':>10} {'max ms':>9} "
+                 f"{'nodes':>10} {'pruned':>9} {'emitted':>9} {'depth':>5}"]
+        for s in sorted(self.stats.values(), key=lambda s: -s.total_time):
+            lines.append(f"{s.name:<48} {s.calls:>6} {s.total_time * 1e3:>10.3f} {s.max_time * 1e3:>9.3f} "
+                         f"{s.nodes:>10} {s.pruned:>9} {s.emitted:>9} {s.peak_depth:>5}")
+        return "\n".join(lines)
+
+    def dump_collapsed(self, destination: Union[TextIO, str]) -> None:
+        """Write collapsed stacks ("a;b;c <microseconds>") for flamegraph tools"""
+        lines = "".join(f"{path} {max(1, round(seconds * 1e6))}\n"
+                        for path, seconds in sorted(self.collapsed.items()))
+        if isinstance(destination, str):
+            with open(destination, "w") as f:
+                f.write(lines)
+        else:
+            destination.write(lines)
+
+    def _call(self, name: str, func: Callable, args, kwargs):
+        """Run one instrumented call and record it"""
+        frame = [name, SearchStats(), 0.0]
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            path = ";".join(f[0] for f in self._stack)
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1][2] += elapsed
+            self.collapsed[path] = self.collapsed.get(path, 0.0) + elapsed - frame[2]
+            record = CallRecord(name, elapsed, frame[1])
+            self.records.append(record)
+            self.stats.setdefault(name, CallStats(name)).add(record)
+
+
+_active: Optional[Profiler] = None
+
+def active_profiler() -> Optional[Profiler]:
+    """The profiler currently recording, if any"""
+    return _active
+
+def current_search_stats() -> Optional[SearchStats]:
+    """Counters of the innermost instrumented call, or None when not profiling"""
+    if _active is None or not _active._stack:
+        return None
+    return _active._stack[-1][1]
+
+def instrumented(name: str) -> Callable[[Callable], Callable]:
+    """Decorate a function so an active Profiler records its calls"""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active is None:
+                return func(*args, **kwargs)
+            return _active._call(name, func, args, kwargs)
+        return wrapper
+    return decorator
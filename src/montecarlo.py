@@ -0,0 +1,198 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from .calculator import DecapCalculator
+
+# Temperature distance from 25 °C at which each dielectric reaches the edge of
+# its TEMP_COEFFICIENTS band (X7R/C0G: -55..125 °C, X5R: -55..85 °C, Y5V: -30..85 °C)
+RATED_SPAN = {'X7R': 100.0, 'X5R': 80.0, 'C0G': 100.0, 'Y5V': 60.0}
+
+DEFAULT_PERCENTILES = (1, 5, 50, 95, 99)
+
+# Percentile curves are accumulated as per-frequency histograms of ln(|Z| / |Z_nominal|)
+HISTOGRAM_BINS = 4096
+HISTOGRAM_RANGE = np.log(100.0)
+
+def _draw_spread(rng: np.random.Generator, tolerance: np.ndarray, shape: Tuple[int, ...],
+                 distribution: str) -> np.ndarray:
+    """Relative deviations bounded by ±tolerance (normal: tolerance is 3 sigma, clipped)"""
+    if distribution == 'uniform':
+        return rng.uniform(-1.0, 1.0, shape) * tolerance
+    return np.clip(rng.standard_normal(shape) / 3, -1.0, 1.0) * tolerance
+
+def _sample_capacitance(rng: np.random.Generator, model: Dict[str, np.ndarray],
+                        samples: int) -> np.ndarray:
+    """Draw (samples x parts) capacitances with tolerance and temperature drift"""
+    shape = (samples, len(model["capacitance"]))
+    spread = _draw_spread(rng, model["tolerance"], shape, model["distribution"])
+    # One board temperature per sample; each part drifts within its dielectric band,
+    # in proportion to its distance from 25 °C
+    temperature = rng.uniform(model["temp_range"][0], model["temp_range"][1], (samples, 1))
+    scale = np.minimum(np.abs(temperature - 25) / model["span"], 1.0)
+    drift = rng.uniform(model["drift_low"], model["drift_high"], shape) * scale
+    return model["capacitance"] * (1 + spread) * (1 + drift)
+
+def _combination_chunk(task: Tuple[Dict[str, np.ndarray], np.random.SeedSequence, int]) -> np.ndarray:
+    """Total capacitance of one chunk of sampled combinations"""
+    model, seed, samples = task
+    caps = _sample_capacitance(np.random.default_rng(seed), model, samples)
+    if model["topology"] == 'series':
+        return 1 / (1 / caps).sum(axis=1)
+    return caps.sum(axis=1)
+
+def _bank_chunk(task: Tuple[Dict[str, np.ndarray], np.random.SeedSequence, int]
+                ) -> Tuple[np.ndarray, np.ndarray]:
+    """Impedance histogram and worst-case impedance of one chunk of sampled banks"""
+    model, seed, samples = task
+    rng = np.random.default_rng(seed)
+    caps = _sample_capacitance(rng, model, samples)
+    esrs = model["esr"] * np.maximum(
+        1 + _draw_spread(rng, model["esr_tolerance"], caps.shape, model["distribution"]), 0.0)
+
+    omega = 2 * np.pi * model["frequencies"]
+    admittance = np.zeros((samples, len(omega)), dtype=complex)
+    for unit in range(caps.shape[1]):  # One unit at a time keeps memory at samples x points
+        reactance = omega * model["esl"][unit] - 1 / (omega * caps[:, unit:unit + 1])
+        admittance += 1 / (esrs[:, unit:unit + 1] + 1j * reactance)
+    impedance = 1 / np.abs(admittance)
+
+    ratio = np.log(impedance / model["nominal"])
+    bins = np.clip(((ratio + HISTOGRAM_RANGE) / (2 * HISTOGRAM_RANGE) * HISTOGRAM_BINS).astype(int),
+                   0, HISTOGRAM_BINS - 1)
+    offsets = np.arange(len(omega)) * HISTOGRAM_BINS
+    counts = np.bincount((bins + offsets).ravel(), minlength=len(omega) * HISTOGRAM_BINS)
+    return counts.reshape(len(omega), HISTOGRAM_BINS), impedance.max(axis=1)
+
+class MonteCarloAnalyzer:
+    """Monte Carlo tolerance, temperature and ESR analysis of combinations and banks
+
+    Every sample draws a capacitance tolerance and an ESR spread per part
+    (normal with the tolerance as 3 sigma, or uniform), one board
+    temperature in the operating range, and a temperature drift per part
+    inside its dielectric's TEMP_COEFFICIENTS band. Samples are drawn in
+    chunks of `chunk_size` as NumPy arrays, each chunk from its own child
+    of the seed, so results are reproducible and do not depend on
+    `workers`. With `workers` > 1 the chunks run in a process pool.
+    """
+
+    def __init__(self, calculator: Optional[DecapCalculator] = None, chunk_size: int = 10_000,
+                 workers: Optional[int] = None):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        self.calculator = calculator or DecapCalculator()
+        self.chunk_size = chunk_size
+        self.workers = workers
+
+    def analyze_combination(self, values: Sequence[float], target: float, topology: str = 'parallel',
+                            spec_tolerance: float = 0.1, tolerance: Union[float, Sequence[float]] = 0.1,
+                            dielectric: str = 'X7R', temp_range: Tuple[float, float] = (25, 85),
+                            samples: int = 1_000_000, seed: int = 0, distribution: str = 'normal',
+                            percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[str, object]:
+        """Sample a series or parallel combination and report its yield against the target"""
+        if topology not in ('parallel', 'series'):
+            raise ValueError(f"Unknown topology: {topology}")
+        model = self._model(values, tolerance, dielectric, temp_range, distribution)
+        model["topology"] = topology
+        totals = np.concatenate(self._run(_combination_chunk, model, samples, seed))
+
+        nominal = sum(values) if topology == 'parallel' else 1 / sum(1 / v for v in values)
+        return {
+            "samples": samples,
+            "nominal": nominal,
+            "target": target,
+            "mean": float(totals.mean()),
+            "std": float(totals.std()),
+            "percentiles": dict(zip(percentiles, np.percentile(totals, percentiles).tolist())),
+            "yield": float(np.mean(np.abs(totals - target) <= spec_tolerance * target)),
+        }
+
+    def analyze_bank(self, parts: Sequence[Dict[str, Union[float, str]]], z_target: float,
+                     freq_range: Tuple[float, float], quantities: Optional[Sequence[int]] = None,
+                     points: int = 200, tolerance: float = 0.1, esr_tolerance: float = 0.2,
+                     temp_range: Tuple[float, float] = (25, 85), samples: int = 100_000,
+                     seed: int = 0, distribution: str = 'normal',
+                     percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[str, object]:
+        """Sample a decoupling bank and report percentile impedance curves and yield
+
+        Parts use the PDNOptimizer format; "tolerance", "esr_tolerance" and
+        "dielectric" keys override the defaults per part.
+        """
+        if quantities is None:
+            quantities = [int(p.get("quantity", 1)) for p in parts]
+        units = [p for p, q in zip(parts, quantities) for _ in range(int(q))]
+        if not units:
+            raise ValueError("Bank is empty")
+
+        model = self._model([u["capacitance"] for u in units],
+                            [u.get("tolerance", tolerance) for u in units],
+                            [u.get("dielectric", 'X7R') for u in units], temp_range, distribution)
+        frequencies = self.calculator.frequency_points(freq_range, points)
+        esr = np.array([float(u["esr"]) for u in units])
+        esl = np.array([float(u.get("esl", 0.0)) for u in units])
+        with np.errstate(divide='ignore'):
+            nominal = 1 / np.abs((1 / self.calculator.complex_impedance_at(
+                model["capacitance"], esr, frequencies, esl)).sum(axis=0))
+        model.update({
+            "esr": esr, "esl": esl, "frequencies": frequencies, "nominal": nominal,
+            "esr_tolerance": np.array([float(u.get("esr_tolerance", esr_tolerance)) for u in units]),
+        })
+
+        counts = np.zeros((points, HISTOGRAM_BINS), dtype=np.int64)
+        worst = []
+        for chunk_counts, chunk_worst in self._run(_bank_chunk, model, samples, seed):
+            counts += chunk_counts
+            worst.append(chunk_worst)
+        worst = np.concatenate(worst)
+
+        # Percentile curves from the cumulative histograms, at bin centres
+        cumulative = counts.cumsum(axis=1)
+        centres = (np.arange(HISTOGRAM_BINS) + 0.5) / HISTOGRAM_BINS * 2 * HISTOGRAM_RANGE - HISTOGRAM_RANGE
+        curves = {}
+        for p in percentiles:
+            index = np.minimum((cumulative < p / 100 * samples).sum(axis=1), HISTOGRAM_BINS - 1)
+            curves[p] = nominal * np.exp(centres[index])
+
+        return {
+            "samples": samples,
+            "z_target": z_target,
+            "frequencies": frequencies,
+            "nominal": nominal,
+            "percentiles": curves,
+            "max_impedance": dict(zip(percentiles, np.percentile(worst, percentiles).tolist())),
+            "yield": float(np.mean(worst <= z_target)),
+        }
+
+    def _model(self, capacitances: Sequence[float], tolerance: Union[float, Sequence[float]],
+               dielectric: Union[str, Sequence[str]], temp_range: Tuple[float, float],
+               distribution: str) -> Dict[str, object]:
+        """Per-part sampling parameters as arrays"""
+        if distribution not in ('normal', 'uniform'):
+            raise ValueError(f"Unknown distribution: {distribution}")
+        count = len(capacitances)
+        if count == 0:
+            raise ValueError("No parts to sample")
+        dielectrics = [dielectric] * count if isinstance(dielectric, str) else list(dielectric)
+        for name in dielectrics:
+            if name not in self.calculator.TEMP_COEFFICIENTS:
+                raise ValueError(f"Unknown dielectric type: {name}")
+        return {
+            "capacitance": np.asarray(capacitances, dtype=float),
+            "tolerance": np.broadcast_to(np.asarray(tolerance, dtype=float), (count,)),
+            "drift_low": np.array([self.calculator.TEMP_COEFFICIENTS[d][0] for d in dielectrics]),
+            "drift_high": np.array([self.calculator.TEMP_COEFFICIENTS[d][1] for d in dielectrics]),
+            "span": np.array([RATED_SPAN.get(d, 100.0) for d in dielectrics]),
+            "temp_range": temp_range,
+            "distribution": distribution,
+        }
+
+    def _run(self, task_function, model: Dict[str, object], samples: int, seed: int) -> List:
+        """Run chunk tasks in order, in-process or over a process pool"""
+        if samples < 1:
+            raise ValueError("samples must be positive")
+        sizes = [min(self.chunk_size, samples - start) for start in range(0, samples, self.chunk_size)]
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        tasks = [(model, s, n) for s, n in zip(seeds, sizes)]
+        if self.workers and self.workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(self.workers) as pool:
+                return list(pool.map(task_function, tasks))
+        return [task_function(task) for task in tasks]
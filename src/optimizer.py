@@ -0,0 +1,175 @@
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from .calculator import DecapCalculator
+from .touchstone import MeasuredImpedanceStore
+
+class PDNOptimizer:
+    """Choose the cheapest capacitor bank that meets a PDN target impedance
+
+    Each part is a dict with "capacitance", "esr", "esl" and "cost" keys
+    (an optional "name" is passed through). Parts whose name is in the
+    `measured` store use their measured impedance curve instead of the
+    R-L-C model. The complex impedance of every
+    part is computed once over the frequency band, so the bank impedance of
+    any mix of parts is one admittance sum. A greedy pass adds the part with
+    the best excess-impedance reduction per unit cost until the bank is
+    compliant, then drops redundant parts. Branch-and-bound over the most
+    useful parts then looks for a cheaper compliant bank, using the greedy
+    cost as the initial bound.
+    """
+
+    def __init__(self, parts: Sequence[Dict[str, Union[float, str]]],
+                 freq_range: Tuple[float, float], points: int = 200,
+                 calculator: Optional[DecapCalculator] = None,
+                 measured: Optional[MeasuredImpedanceStore] = None):
+        if not parts:
+            raise ValueError("Part library is empty")
+        self.parts = list(parts)
+        self.calculator = calculator or DecapCalculator()
+        self.measured = measured
+        self.frequencies = self.calculator.frequency_points(freq_range, points)
+        self.costs = np.array([float(p.get("cost", 1.0)) for p in self.parts])
+        self.admittance = 1 / self._impedance(self.parts)  # (parts x frequencies)
+
+    def update_part(self, index: int, part: Dict[str, Union[float, str]]) -> None:
+        """Replace one part and recompute its admittance row"""
+        self.parts[index] = part
+        self.costs[index] = float(part.get("cost", 1.0))
+        self.admittance[index] = 1 / self._impedance([part])[0]
+
+    def _impedance(self, parts: Sequence[Dict[str, Union[float, str]]]) -> np.ndarray:
+        """Complex impedance rows: measured curves where available, the R-L-C model otherwise"""
+        impedance = np.empty((len(parts), len(self.frequencies)), dtype=complex)
+        measured = [self.measured is not None and p.get("name") in self.measured for p in parts]
+        rows = [i for i, m in enumerate(measured) if m]
+        if rows:
+            impedance[rows] = self.measured.impedance_at([parts[i]["name"] for i in rows], self.frequencies)
+        rows = [i for i, m in enumerate(measured) if not m]
+        if rows:
+            impedance[rows] = self.calculator.complex_impedance_at(
+                [parts[i]["capacitance"] for i in rows],
+                [parts[i]["esr"] for i in rows],
+                self.frequencies,
+                [parts[i].get("esl", 0.0) for i in rows])
+        return impedance
+
+    def bank_impedance(self, quantities: Sequence[int]) -> np.ndarray:
+        """Impedance magnitude of a bank given per-part quantities"""
+        admittance = np.asarray(quantities, dtype=float) @ self.admittance
+        with np.errstate(divide='ignore'):
+            return 1 / np.abs(admittance)
+
+    def optimize(self, z_target: float, max_per_part: int = 20, max_total: int = 200,
+                 candidates: int = 8, max_nodes: int = 100_000) -> Dict[str, object]:
+        """Find the cheapest compliant bank, or the best effort if none is found"""
+        quantities = self._greedy(z_target, max_per_part, max_total)
+        quantities = self._prune(quantities, z_target)
+        if self._compliant(quantities, z_target):
+            quantities = self._branch_and_bound(quantities, z_target, max_per_part,
+                                                candidates, max_nodes)
+        return self._result(quantities, z_target)
+
+    def _excess(self, admittance: np.ndarray, z_target: float) -> np.ndarray:
+        """Sum of impedance excess over the target, along the last axis"""
+        with np.errstate(divide='ignore'):
+            ratio = 1 / (np.abs(admittance) * z_target)
+        return np.maximum(ratio - 1, 0).sum(axis=-1)
+
+    def _compliant(self, quantities: np.ndarray, z_target: float) -> bool:
+        """Check the bank impedance against the target at every frequency"""
+        return bool((self.bank_impedance(quantities) <= z_target).all())
+
+    def _greedy(self, z_target: float, max_per_part: int, max_total: int) -> np.ndarray:
+        """Add parts by excess reduction per unit cost until compliant"""
+        quantities = np.zeros(len(self.parts), dtype=int)
+        bank = np.zeros(len(self.frequencies), dtype=complex)
+        excess = None
+        for _ in range(max_total):
+            trial = self._excess(bank[np.newaxis, :] + self.admittance, z_target)
+            if excess is None:
+                excess = trial.max()  # Empty bank: measure gains against the worst single part
+            gain = (excess - trial) / self.costs
+            gain[quantities >= max_per_part] = -np.inf
+            best = int(np.argmax(gain))
+            if not gain[best] > 0 and quantities.any():
+                break
+            quantities[best] += 1
+            bank = bank + self.admittance[best]
+            excess = trial[best]
+            if excess == 0:
+                break
+        return quantities
+
+    def _prune(self, quantities: np.ndarray, z_target: float) -> np.ndarray:
+        """Drop units, most expensive first, while the bank stays compliant"""
+        if not self._compliant(quantities, z_target):
+            return quantities
+        quantities = quantities.copy()
+        for idx in np.argsort(-self.costs, kind='stable'):
+            while quantities[idx] > 0:
+                quantities[idx] -= 1
+                if not self._compliant(quantities, z_target):
+                    quantities[idx] += 1
+                    break
+        return quantities
+
+    def _branch_and_bound(self, incumbent: np.ndarray, z_target: float, max_per_part: int,
+                          candidates: int, max_nodes: int) -> np.ndarray:
+        """Search quantities of the most useful parts for a cheaper compliant bank"""
+        # Candidate parts: those already in the bank plus the best standalone performers
+        standalone = self._excess(self.admittance, z_target) * self.costs
+        pool = list(np.flatnonzero(incumbent))
+        for idx in np.argsort(standalone, kind='stable'):
+            if len(pool) >= candidates:
+                break
+            if int(idx) not in pool:
+                pool.append(int(idx))
+        pool = sorted(pool, key=lambda i: -self.costs[i])
+
+        best = incumbent.copy()
+        best_cost = float(incumbent @ self.costs)
+        quantities = np.zeros(len(self.parts), dtype=int)
+        nodes = 0
+        # Admittance of every deeper pool part at full quantity, used as a reachability bound
+        reach = np.zeros((len(pool) + 1, len(self.frequencies)), dtype=complex)
+        for depth in range(len(pool) - 1, -1, -1):
+            reach[depth] = reach[depth + 1] + max_per_part * self.admittance[pool[depth]]
+
+        def search(depth: int, bank: np.ndarray, cost: float) -> None:
+            nonlocal best, best_cost, nodes
+            nodes += 1
+            if nodes > max_nodes or cost >= best_cost:
+                return
+            if self._excess(bank, z_target) == 0:
+                best, best_cost = quantities.copy(), cost
+                return  # Any further part only adds cost
+            if depth == len(pool) or self._excess(bank + reach[depth], z_target) > 0:
+                return  # Target out of reach even with every remaining part at full quantity
+            idx = pool[depth]
+            for count in range(max_per_part, -1, -1):
+                if cost + count * self.costs[idx] >= best_cost:
+                    continue
+                quantities[idx] = count
+                search(depth + 1, bank + count * self.admittance[idx], cost + count * self.costs[idx])
+            quantities[idx] = 0
+
+        search(0, np.zeros(len(self.frequencies), dtype=complex), 0.0)
+        return best
+
+    def _result(self, quantities: np.ndarray, z_target: float) -> Dict[str, object]:
+        """Summarize a bank as a result dict"""
+        impedance = self.bank_impedance(quantities)
+        bank: List[Dict[str, object]] = [
+            {"part": self.parts[idx], "index": int(idx), "quantity": int(quantities[idx])}
+            for idx in np.flatnonzero(quantities)
+        ]
+        return {
+            "bank": bank,
+            "total_cost": float(quantities @ self.costs),
+            "num_capacitors": int(quantities.sum()),
+            "z_target": z_target,
+            "max_impedance": float(impedance.max()),
+            "compliant": bool((impedance <= z_target).all()),
+            "frequencies": self.frequencies,
+            "impedance": impedance,
+        }
@@ -0,0 +1,107 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from .batch import BatchRunner
+from .optimizer import PDNOptimizer
+from .search import ParallelSearch, SeriesSearch
+
+ENGINES = {"parallel": ParallelSearch, "series": SeriesSearch}
+
+# Per-process state installed once by the pool initializer, so the library
+# is shipped to each worker a single time instead of with every task
+_worker_state: Dict[str, object] = {}
+
+def _init_search(topology: str, available_values: Sequence[float], max_components: int) -> None:
+    """Build the search engine for this worker"""
+    _worker_state["engine"] = ENGINES[topology](available_values, max_components)
+
+def _search_target(task: Tuple[float, float]) -> List[Tuple[int, ...]]:
+    """Run a full search for one target in a worker"""
+    target, tolerance = task
+    return sorted(_worker_state["engine"].iter_indices(target, tolerance))
+
+def _search_branch(task: Tuple[float, int, float]) -> List[Tuple[int, ...]]:
+    """Run one top-level branch of a search in a worker"""
+    target, first, tolerance = task
+    return sorted(_worker_state["engine"].iter_branch(target, first, tolerance))
+
+def _init_optimizer(parts: Sequence[Dict[str, Union[float, str]]],
+                    freq_range: Tuple[float, float], points: int) -> None:
+    """Build the PDN optimizer for this worker"""
+    _worker_state["optimizer"] = PDNOptimizer(parts, freq_range, points)
+
+def _optimize(task: Tuple[float, Dict[str, object]]) -> Dict[str, object]:
+    """Optimize one bank in a worker"""
+    z_target, options = task
+    return _worker_state["optimizer"].optimize(z_target, **options)
+
+def _run_jobs(task: Tuple[int, List[Dict[str, object]]]) -> List[Dict[str, object]]:
+    """Compute one chunk of calculator jobs, starting at input row `start`, in a worker"""
+    start, rows = task
+    return list(BatchRunner(chunk_size=len(rows) or 1).run(rows, start))
+
+class ParallelRunner:
+    """Fan combination, optimization and calculator jobs out over processes
+
+    Every method builds its pool with an initializer that hands the library
+    (or part list) to each worker once; tasks then carry only a target or
+    a branch index. Results always come back in input order, so output is
+    identical to the single-process calls.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def find_combinations(self, targets: Sequence[float], available_values: Sequence[float],
+                          topology: str = 'parallel', max_components: int = 3,
+                          tolerance: float = 0.01) -> List[List[List[float]]]:
+        """Search many targets against one library, one task per target"""
+        engine = ENGINES[topology](available_values, max_components)
+        tasks = [(target, tolerance) for target in targets]
+        chunksize = max(1, len(tasks) // (self.max_workers * 4))
+        with ProcessPoolExecutor(self.max_workers, initializer=_init_search,
+                                 initargs=(topology, engine.values, max_components)) as pool:
+            matches = list(pool.map(_search_target, tasks, chunksize=chunksize))
+        return [[[engine.values[i] for i in combo] for combo in found] for found in matches]
+
+    def find_combination_split(self, target: float, available_values: Sequence[float],
+                               topology: str = 'parallel', max_components: int = 3,
+                               tolerance: float = 0.01) -> List[List[float]]:
+        """Split one large search across workers at its top-level branches"""
+        engine = ENGINES[topology](available_values, max_components)
+        tasks = [(target, first, tolerance) for first in range(len(engine.values))]
+        with ProcessPoolExecutor(self.max_workers, initializer=_init_search,
+                                 initargs=(topology, engine.values, max_components)) as pool:
+            branches = list(pool.map(_search_branch, tasks))
+        # Branches are disjoint and ordered by first index, so concatenating keeps sorted order
+        return [[engine.values[i] for i in combo] for found in branches for combo in found]
+
+    def optimize_many(self, parts: Sequence[Dict[str, Union[float, str]]],
+                      freq_range: Tuple[float, float], z_targets: Sequence[float],
+                      points: int = 200, **options) -> List[Dict[str, object]]:
+        """Optimize one bank per target impedance against a shared part library"""
+        tasks = [(z_target, options) for z_target in z_targets]
+        with ProcessPoolExecutor(self.max_workers, initializer=_init_optimizer,
+                                 initargs=(list(parts), freq_range, points)) as pool:
+            return list(pool.map(_optimize, tasks))
+
+    def run_jobs(self, jobs: Iterable[Dict[str, object]],
+                 chunk_size: int = 4096) -> Iterator[Dict[str, object]]:
+        """Stream calculator job rows through workers, yielding results in order"""
+        jobs = iter(jobs)
+        pending = deque()
+        start = 0
+        with ProcessPoolExecutor(self.max_workers) as pool:
+            while True:
+                # Keep a bounded number of chunks in flight so memory stays flat
+                while len(pending) < self.max_workers * 2:
+                    chunk = list(islice(jobs, chunk_size))
+                    if not chunk:
+                        break
+                    pending.append(pool.submit(_run_jobs, (start, chunk)))
+                    start += len(chunk)
+                if not pending:
+                    return
+                yield from pending.popleft().result()
@@ -0,0 +1,177 @@
+import math
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from .calculator import DecapCalculator
+
+MU0 = 4e-7 * math.pi  # Permeability of free space (H/m)
+
+def candidate_grid(radius: float, pitch: float, keepout: float = 0.0) -> np.ndarray:
+    """(x, y) offsets in mm on a square grid within `radius` of a pin, outside `keepout`"""
+    steps = np.arange(-math.floor(radius / pitch), math.floor(radius / pitch) + 1) * pitch
+    x, y = np.meshgrid(steps, steps)
+    offsets = np.column_stack([x.ravel(), y.ravel()])
+    distance = np.hypot(offsets[:, 0], offsets[:, 1])
+    return offsets[(distance <= radius) & (distance > keepout)]
+
+class Stackup:
+    """Layer stackup, top to bottom
+
+    Conductor layers are {"name": ..., "type": "signal" | "plane"} and the
+    dielectrics between them are {"thickness": mm, "er": εr}. Conductor
+    thickness is neglected.
+    """
+
+    def __init__(self, layers: Sequence[Dict[str, Union[str, float]]]):
+        self.depths: Dict[str, float] = {}
+        self.types: Dict[str, str] = {}
+        self._dielectrics: List[Tuple[float, float, float]] = []  # (top depth, thickness, εr)
+        depth = 0.0
+        for layer in layers:
+            if "name" in layer:
+                if layer["name"] in self.depths:
+                    raise ValueError(f"Duplicate layer name: {layer['name']}")
+                self.depths[layer["name"]] = depth
+                self.types[layer["name"]] = layer.get("type", "signal")
+            else:
+                thickness, er = float(layer["thickness"]), float(layer["er"])
+                if thickness <= 0 or er < 1:
+                    raise ValueError("Dielectrics need a positive thickness and εr >= 1")
+                self._dielectrics.append((depth, thickness, er))
+                depth += thickness
+        if len(self.depths) < 2:
+            raise ValueError("Stackup needs at least two conductor layers")
+        self.thickness = depth
+
+    def spacing(self, upper: str, lower: str) -> float:
+        """Distance between two conductor layers in mm"""
+        return abs(self.depth(lower) - self.depth(upper))
+
+    def depth(self, layer: str) -> float:
+        """Depth of a conductor layer below the top surface in mm"""
+        if layer not in self.depths:
+            raise ValueError(f"Unknown layer: {layer}")
+        return self.depths[layer]
+
+    def dielectric_constant(self, upper: str, lower: str) -> float:
+        """Effective εr between two layers (dielectrics in series, weighted by thickness)"""
+        top, bottom = sorted((self.depth(upper), self.depth(lower)))
+        layers = [(t, er) for d, t, er in self._dielectrics if top <= d < bottom]
+        if not layers:
+            raise ValueError(f"No dielectric between {upper} and {lower}")
+        return sum(t for t, _ in layers) / sum(t / er for t, er in layers)
+
+class PlacementAnalyzer:
+    """Loop inductance and λ/10 limits of candidate decap positions around power pins
+
+    A capacitor mounted on `side` connects through a via pair to the
+    power/ground cavity, then through the cavity to the pin's own via pair.
+    Its loop inductance is
+
+    - ESL of the part
+    - mounting: pad-to-via traces over the nearest cavity plane (μ0·h·ℓ/w
+      each) plus the via pair down to the cavity (μ0·h/π·acosh(s/2r))
+    - spreading: plane-pair inductance between the capacitor and pin ports,
+      μ0·d/2π·ln(D²/(r_cap·r_pin))
+    - the pin's via pair down to the cavity
+
+    Geometry is in mm. Every quantity is computed for a whole
+    (pins x candidates) array at once.
+    """
+
+    def __init__(self, stackup: Stackup, power_plane: str, ground_plane: str,
+                 via_radius: float = 0.15, via_spacing: float = 1.0,
+                 trace_length: float = 0.3, trace_width: float = 0.3,
+                 pin_radius: float = 0.15, pin_via_spacing: float = 1.0,
+                 calculator: Optional[DecapCalculator] = None):
+        for plane in (power_plane, ground_plane):
+            if stackup.types.get(plane) != "plane":
+                raise ValueError(f"{plane} is not a plane layer")
+        self.stackup = stackup
+        self.power_plane = power_plane
+        self.ground_plane = ground_plane
+        self.via_radius = via_radius
+        self.via_spacing = via_spacing
+        self.trace_length = trace_length
+        self.trace_width = trace_width
+        self.pin_radius = pin_radius
+        self.pin_via_spacing = pin_via_spacing
+        self.calculator = calculator or DecapCalculator()
+        self.cavity_spacing = stackup.spacing(power_plane, ground_plane)
+        self.dielectric_constant = stackup.dielectric_constant(power_plane, ground_plane)
+
+    def via_height(self, side: str = 'top') -> float:
+        """Distance in mm from the mounting surface to the nearest cavity plane"""
+        depths = [self.stackup.depth(self.power_plane), self.stackup.depth(self.ground_plane)]
+        if side == 'top':
+            return min(depths)
+        if side == 'bottom':
+            return self.stackup.thickness - max(depths)
+        raise ValueError("Side must be 'top' or 'bottom'")
+
+    def mounting_inductance(self, side: str = 'top') -> float:
+        """Trace and via-pair inductance of a capacitor mounted on `side`"""
+        height = self.via_height(side) * 1e-3
+        traces = 2 * MU0 * height * self.trace_length / self.trace_width
+        return traces + self._via_pair(height, self.via_spacing, self.via_radius)
+
+    def spreading_inductance(self, distance: np.ndarray) -> np.ndarray:
+        """Cavity inductance between a capacitor and a pin `distance` mm apart"""
+        ratio = np.asarray(distance, dtype=float) ** 2 / (self.via_radius * self.pin_radius)
+        return MU0 * self.cavity_spacing * 1e-3 / (2 * math.pi) * np.log(np.maximum(ratio, 1.0))
+
+    def analyze(self, pins: Sequence[Sequence[float]], offsets: Sequence[Sequence[float]],
+                frequency: Union[float, Sequence[float]], capacitance: Optional[float] = None,
+                esr: float = 0.0, esl: float = 0.0, side: str = 'top',
+                pin_side: str = 'top') -> Dict[str, np.ndarray]:
+        """Evaluate every candidate offset around every pin
+
+        `frequency` is one noise frequency or one per pin. Arrays in the
+        result are (pins x candidates); with a capacitance, the impedance of
+        each placed capacitor at the frequency and its mounted SRF are
+        included.
+        """
+        pins = np.asarray(pins, dtype=float).reshape(-1, 2)
+        offsets = np.asarray(offsets, dtype=float).reshape(-1, 2)
+        frequency = np.broadcast_to(np.asarray(frequency, dtype=float).reshape(-1, 1), (len(pins), 1))
+        shape = (len(pins), len(offsets))
+
+        distance = np.broadcast_to(np.hypot(offsets[:, 0], offsets[:, 1]), shape)
+        limit = np.broadcast_to(self.calculator.calculate_lambda10_distance_batch(
+            frequency, self.dielectric_constant), shape)
+        mounting = self.mounting_inductance(side)
+        pin_height = self.via_height(pin_side) * 1e-3
+        pin = self._via_pair(pin_height, self.pin_via_spacing, self.pin_radius)
+        spreading = self.spreading_inductance(distance)
+        loop = esl + mounting + spreading + pin
+
+        result = {
+            "positions": pins[:, np.newaxis, :] + offsets[np.newaxis, :, :],
+            "distance": distance,
+            "lambda10_distance": limit,
+            "within_lambda10": distance <= limit,
+            "mounting_inductance": np.full(shape, mounting),
+            "spreading_inductance": spreading,
+            "pin_inductance": np.full(shape, pin),
+            "loop_inductance": loop,
+        }
+        if capacitance is not None:
+            omega = 2 * math.pi * frequency
+            result["impedance"] = np.abs(esr + 1j * (omega * loop - 1 / (omega * capacitance)))
+            result["srf"] = 1 / (2 * math.pi * np.sqrt(loop * capacitance))
+        return result
+
+    @staticmethod
+    def rank(result: Dict[str, np.ndarray], key: str = "loop_inductance") -> np.ndarray:
+        """Candidate indices per pin, best first; positions beyond λ/10 rank last"""
+        return np.lexsort((result[key], ~result["within_lambda10"]), axis=-1)
+
+    @staticmethod
+    def rank_board(result: Dict[str, np.ndarray], key: str = "loop_inductance") -> np.ndarray:
+        """(pin, candidate) index pairs over the whole board, best first"""
+        order = np.lexsort((result[key].ravel(), ~result["within_lambda10"].ravel()))
+        return np.column_stack(np.unravel_index(order, result[key].shape))
+
+    @staticmethod
+    def _via_pair(height: float, spacing: float, radius: float) -> float:
+        """Loop inductance of two parallel vias `height` m long (spacing and radius in mm)"""
+        return MU0 * height / math.pi * math.acosh(max(spacing / (2 * radius), 1.0))
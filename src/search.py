@@ -0,0 +1,318 @@
+from bisect import bisect_left, bisect_right
+import time
+from typing import Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+from .instrumentation import SearchStats, current_search_stats
+
+class SearchBudget:
+    """Wall-clock and node-count limits for a combination search
+
+    Searches call tick() once per node; once either limit is hit the budget
+    stays exhausted and every open branch unwinds without visiting more
+    nodes. The clock is only read every CLOCK_INTERVAL nodes.
+    """
+
+    CLOCK_INTERVAL = 256
+
+    def __init__(self, time_limit: Optional[float] = None, max_nodes: Optional[int] = None):
+        self.time_limit = time_limit
+        self.max_nodes = max_nodes
+        self.deadline = None if time_limit is None else time.perf_counter() + time_limit
+        self.nodes = 0
+        self.exhausted = False
+
+    @property
+    def limited(self) -> bool:
+        """Whether either limit is set; an unlimited budget only counts nodes"""
+        return self.time_limit is not None or self.max_nodes is not None
+
+    def tick(self) -> bool:
+        """Count one node and report whether the search may continue"""
+        if self.exhausted:
+            return False
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            self.exhausted = True
+        elif self.deadline is not None and self.nodes % self.CLOCK_INTERVAL == 0 \
+                and time.perf_counter() > self.deadline:
+            self.exhausted = True
+        return not self.exhausted
+
+
+def _counted(matches: Iterator[Tuple[int, ...]],
+             stats: Optional[SearchStats]) -> Iterator[Tuple[int, ...]]:
+    """Pass matches through, counting them when the call is being profiled"""
+    if stats is None:
+        yield from matches
+        return
+    for combo in matches:
+        stats.emitted += 1
+        yield combo
+
+class ParallelSearch:
+    """Bounded, pruned search for parallel capacitor combinations
+
+    The library is sorted once and searched depth-first over non-decreasing
+    index tuples, exactly like the original recursive finder. Each node is
+    bounded with the sorted values: a branch is cut when even filling every
+    remaining slot with the largest usable value cannot reach the tolerance
+    band, and first elements too small to matter are skipped outright. The
+    last two or three parts of every combination are answered by a range
+    query over precomputed, sorted pair and triple sums (meet-in-the-middle)
+    instead of further recursion. Under a budget, every tail candidate
+    counts as a node, and tables too large to build within the budget are
+    replaced by plain recursion.
+    """
+
+    TRIPLE_TABLE_LIMIT = 2_000_000  # Largest triple-sum table built, in entries
+    BUDGETED_TABLE_LIMIT = 250_000  # Largest table built during a budgeted search, in entries
+    TAIL_BLOCK = 4096  # Table entries converted to Python at a time in the tails
+
+    def __init__(self, available_values: Sequence[float], max_components: int = 3):
+        self.values = sorted(available_values)
+        self.max_components = max_components
+        self._pairs = None
+        self._triples = None
+
+    def find(self, target: float, tolerance: float = 0.01) -> List[List[float]]:
+        """Find parallel combinations within tolerance of the target"""
+        matches = sorted(self.iter_indices(target, tolerance))
+        return [[self.values[i] for i in combo] for combo in matches]
+
+    def iter_indices(self, target: float, tolerance: float = 0.01,
+                     budget: Optional[SearchBudget] = None) -> Iterator[Tuple[int, ...]]:
+        """Yield matching combinations as index tuples into the sorted library"""
+        tol = target * tolerance
+        if not self.values or self.max_components < 1 or target <= 0 or abs(target) < tol:
+            return
+        stats = current_search_stats()
+        yield from _counted(self._search(target, self.max_components, 0, (), tol, target * 1e-12,
+                                         budget, stats), stats)
+
+    def iter_branch(self, target: float, first: int, tolerance: float = 0.01,
+                    budget: Optional[SearchBudget] = None) -> Iterator[Tuple[int, ...]]:
+        """Yield only the matches whose smallest part is values[first]
+
+        The branches for every index together cover exactly the matches of
+        iter_indices, so a search can be split across workers.
+        """
+        tol = target * tolerance
+        if self.max_components < 1 or target <= 0 or abs(target) < tol or self.values[first] > target:
+            return
+        rest = target - self.values[first]
+        if abs(rest) < tol:
+            yield (first,)
+        elif self.max_components > 1 and self.values[first] <= rest:
+            stats = current_search_stats()
+            yield from _counted(self._search(rest, self.max_components - 1, first, (first,),
+                                             tol, target * 1e-12, budget, stats), stats)
+
+    def _search(self, remaining: float, slots: int, start: int, prefix: Tuple[int, ...],
+                tol: float, eps: float, budget: Optional[SearchBudget],
+                stats: Optional[SearchStats]) -> Iterator[Tuple[int, ...]]:
+        """Yield completions of 1..slots parts for a node that is not yet in band"""
+        if budget is not None and not budget.tick():
+            return
+        if stats is not None:
+            stats.enter(len(prefix))
+        values = self.values
+        hi = bisect_right(values, remaining, start)
+        if hi <= start:
+            return
+        vmax = values[hi - 1]
+        if slots * vmax < remaining - tol - eps:  # Band is out of reach from here
+            if stats is not None:
+                stats.pruned += 1
+            return
+
+        # Completions with a single part
+        for i in range(bisect_left(values, remaining - tol - eps, start), hi):
+            if budget is not None and not budget.tick():
+                return
+            if abs(remaining - values[i]) < tol:
+                yield prefix + (i,)
+
+        if slots == 1:
+            return
+        if slots == 2 and self._use_pairs(budget):
+            yield from self._pair_tail(remaining, start, prefix, tol, eps, budget)
+            return
+        if slots == 3 and self._use_triples(budget):
+            yield from self._triple_tail(remaining, start, prefix, tol, eps, budget)
+            return
+
+        # Smaller first parts are dominated: the remaining slots cannot make up the gap
+        first = max(start, bisect_left(values, remaining - tol - eps - (slots - 1) * vmax, start))
+        if stats is not None:
+            stats.pruned += first - start
+        for i in range(first, hi):
+            rest = remaining - values[i]
+            if abs(rest) < tol:
+                continue  # Already emitted as a single part
+            if values[i] > rest:
+                if stats is not None:
+                    stats.pruned += hi - i
+                break  # Every later part is at least this large
+            if budget is not None and budget.exhausted:
+                return
+            yield from self._search(rest, slots - 1, i, prefix + (i,), tol, eps, budget, stats)
+
+    def _use_pairs(self, budget: Optional[SearchBudget]) -> bool:
+        """Whether two-part tails come from the pair table"""
+        n = len(self.values)
+        return budget is None or not budget.limited or self._pairs is not None \
+            or n * (n + 1) // 2 <= self.BUDGETED_TABLE_LIMIT
+
+    def _use_triples(self, budget: Optional[SearchBudget]) -> bool:
+        """Whether three-part tails come from the triple table"""
+        n = len(self.values)
+        size = n * (n + 1) * (n + 2) // 6
+        if size > self.TRIPLE_TABLE_LIMIT:
+            return False
+        return budget is None or not budget.limited or self._triples is not None \
+            or size <= self.BUDGETED_TABLE_LIMIT
+
+    def _table_rows(self, table: Tuple[np.ndarray, ...], remaining: float, start: int,
+                    tol: float, eps: float) -> Iterator[Tuple[int, ...]]:
+        """Index tuples of table entries summing into the band, starting at `start` or later"""
+        sums, first = table[0], table[1]
+        lo, hi = np.searchsorted(sums, (remaining - tol - eps, remaining + eps), side='left')
+        for block in range(lo, hi, self.TAIL_BLOCK):
+            rows = slice(block, min(block + self.TAIL_BLOCK, hi))
+            mask = first[rows] >= start
+            yield from zip(*(column[rows][mask].tolist() for column in table[1:]))
+
+    def _pair_tail(self, remaining: float, start: int, prefix: Tuple[int, ...], tol: float,
+                   eps: float, budget: Optional[SearchBudget]) -> Iterator[Tuple[int, ...]]:
+        """Yield two-part completions from the sorted pair-sum table"""
+        values = self.values
+        for i, j in self._table_rows(self._pair_table(), remaining, start, tol, eps):
+            if budget is not None and not budget.tick():
+                return
+            rest = remaining - values[i]
+            if abs(rest) >= tol and values[j] <= rest and abs(rest - values[j]) < tol:
+                yield prefix + (i, j)
+
+    def _triple_tail(self, remaining: float, start: int, prefix: Tuple[int, ...], tol: float,
+                     eps: float, budget: Optional[SearchBudget]) -> Iterator[Tuple[int, ...]]:
+        """Yield two- and three-part completions from the pair and triple tables"""
+        yield from self._pair_tail(remaining, start, prefix, tol, eps, budget)
+        values = self.values
+        for i, j, k in self._table_rows(self._triple_table(), remaining, start, tol, eps):
+            if budget is not None and not budget.tick():
+                return
+            rest = remaining - values[i]
+            if abs(rest) < tol or values[j] > rest:
+                continue
+            rest2 = rest - values[j]
+            if abs(rest2) >= tol and values[k] <= rest2 and abs(rest2 - values[k]) < tol:
+                yield prefix + (i, j, k)
+
+    def _pair_table(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Build (once) all i <= j pair sums sorted by value"""
+        if self._pairs is None:
+            values = np.asarray(self.values, dtype=float)
+            first, second = np.triu_indices(len(values))
+            sums = values[first] + values[second]
+            order = np.argsort(sums, kind='stable')
+            self._pairs = (sums[order], first[order].astype(np.int32), second[order].astype(np.int32))
+        return self._pairs
+
+    def _triple_table(self) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        """Build (once) all i <= j <= k triple sums sorted by value, if small enough"""
+        n = len(self.values)
+        if n * (n + 1) * (n + 2) // 6 > self.TRIPLE_TABLE_LIMIT:
+            return None
+        if self._triples is None:
+            values = np.asarray(self.values, dtype=float)
+            _, pair_first, pair_second = self._pair_table()
+            firsts, seconds, thirds = [], [], []
+            for i in range(n):
+                mask = pair_first >= i
+                firsts.append(np.full(int(mask.sum()), i, dtype=np.int32))
+                seconds.append(pair_first[mask])
+                thirds.append(pair_second[mask])
+            first = np.concatenate(firsts)
+            second = np.concatenate(seconds)
+            third = np.concatenate(thirds)
+            sums = values[first] + values[second] + values[third]
+            order = np.argsort(sums, kind='stable')
+            self._triples = (sums[order], first[order], second[order], third[order])
+        return self._triples
+
+
+class SeriesSearch:
+    """Pruned search for series capacitor combinations
+
+    The library is sorted in descending order, so every added part lowers
+    the series value further. Each node carries the running reciprocal sum
+    instead of recomputing the series value from scratch, stops scanning as
+    soon as the value falls under the tolerance band and skips parts that
+    cannot pull the value down into the band with the slots left.
+    """
+
+    def __init__(self, available_values: Sequence[float], max_components: int = 3):
+        self.values = sorted(available_values, reverse=True)
+        self.reciprocals = [1 / c for c in self.values]
+        self.max_components = max_components
+
+    def find(self, target: float, tolerance: float = 0.01) -> List[List[float]]:
+        """Find series combinations within tolerance of the target"""
+        matches = sorted(self.iter_indices(target, tolerance))
+        return [[self.values[i] for i in combo] for combo in matches]
+
+    def iter_indices(self, target: float, tolerance: float = 0.01,
+                     budget: Optional[SearchBudget] = None) -> Iterator[Tuple[int, ...]]:
+        """Yield matching combinations as index tuples into the sorted library"""
+        if not self.values or self.max_components < 1 or target <= 0:
+            return
+        tol = target * tolerance
+        stats = current_search_stats()
+        yield from _counted(self._search(0, self.max_components, 0, (), target, tol, budget, stats), stats)
+
+    def iter_branch(self, target: float, first: int, tolerance: float = 0.01,
+                    budget: Optional[SearchBudget] = None) -> Iterator[Tuple[int, ...]]:
+        """Yield only the matches whose largest part is values[first]"""
+        if self.max_components < 1 or target <= 0:
+            return
+        tol = target * tolerance
+        total = self.reciprocals[first]
+        value = 1 / total
+        if abs(value - target) < tol:
+            yield (first,)
+        elif value > target and self.max_components > 1:
+            stats = current_search_stats()
+            yield from _counted(self._search(total, self.max_components - 1, first, (first,),
+                                             target, tol, budget, stats), stats)
+
+    def _search(self, reciprocal_sum: float, slots: int, start: int, prefix: Tuple[int, ...],
+                target: float, tol: float, budget: Optional[SearchBudget],
+                stats: Optional[SearchStats]) -> Iterator[Tuple[int, ...]]:
+        """Yield completions of 1..slots parts for a node above the tolerance band"""
+        if budget is not None and not budget.tick():
+            return
+        if stats is not None:
+            stats.enter(len(prefix))
+        reciprocals = self.reciprocals
+        slack = target * 1e-12
+        # Parts too large to pull the value under the upper band edge, even
+        # with every remaining slot filled by the smallest part, are skipped
+        needed = 1 / (target + tol + slack) - reciprocal_sum - (slots - 1) * reciprocals[-1]
+        first = max(start, bisect_left(reciprocals, needed * (1 - 1e-9), start))
+        if stats is not None:
+            stats.pruned += first - start
+        for i in range(first, len(reciprocals)):
+            total = reciprocal_sum + reciprocals[i]
+            value = 1 / total
+            if abs(value - target) < tol:
+                yield prefix + (i,)
+            elif value < target:
+                if stats is not None:
+                    stats.pruned += len(reciprocals) - i
+                break  # Smaller parts only lower the value further
+            elif slots > 1 and 1 / (total + (slots - 1) * reciprocals[-1]) - target < tol + slack:
+                if budget is not None and budget.exhausted:
+                    return
+                yield from self._search(total, slots - 1, i, prefix + (i,), target, tol, budget, stats)
+            elif stats is not None and slots > 1:
+                stats.pruned += 1  # Band out of reach below this part
@@ -0,0 +1,403 @@
+import asyncio
+import json
+import math
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, Hashable, List, Optional, Tuple
+import numpy as np
+from .calculator import DecapCalculator
+from .combinations import CapacitorCombinations
+from .search import ParallelSearch, SearchBudget, SeriesSearch
+
+MAX_BODY = 1 << 20
+
+# Limits on combination searches, so no request can hold a worker indefinitely
+MAX_COMPONENTS = 6
+MAX_LIBRARY = 2048
+SEARCH_TIME_LIMIT = 2.0  # Seconds; the default and the largest time_limit a client may ask for
+MAX_POINTS = 10_000  # Largest impedance sweep, which is also cached as JSON
+
+def _positive(value) -> float:
+    """A finite number above zero"""
+    value = float(value)
+    if not (math.isfinite(value) and value > 0):
+        raise ValueError("Expected a positive number")
+    return value
+
+def _non_negative(value) -> float:
+    """A finite number of zero or more"""
+    value = float(value)
+    if not (math.isfinite(value) and value >= 0):
+        raise ValueError("Expected a non-negative number")
+    return value
+
+def _float_list(value) -> List[float]:
+    """A JSON list of numbers as floats"""
+    if not isinstance(value, list):
+        raise ValueError("Expected a list of numbers")
+    return [float(v) for v in value]
+
+def _library(value) -> List[float]:
+    """A part library of positive values, sorted so equivalent libraries share a cache key"""
+    if not isinstance(value, list):
+        raise ValueError("Expected a list of numbers")
+    return sorted(_positive(v) for v in value)
+
+def _pair(value) -> List[float]:
+    """A two-number range"""
+    value = _float_list(value)
+    if len(value) != 2:
+        raise ValueError("Expected a [low, high] pair")
+    return value
+
+def _band(value) -> List[float]:
+    """A positive, increasing [low, high] frequency range"""
+    low, high = (_positive(v) for v in _pair(value))
+    if low >= high:
+        raise ValueError("Expected low < high")
+    return [low, high]
+
+# Request fields per endpoint as (converter, default); a None default means required
+ENDPOINT_FIELDS = {
+    "/power-decoupling": {"voltage": (_positive, None), "current_draw": (_positive, None),
+                          "voltage_ripple_percent": (_positive, 5.0),
+                          "switching_freq": (_non_negative, 0.0),  # 0 selects the AC-supply case
+                          "temp_range": (_pair, [25.0, 85.0])},
+    "/signal-decoupling": {"signal_freq": (_positive, None), "impedance": (_positive, 50.0),
+                           "bypass_factor": (_positive, 0.1)},
+    "/lambda10": {"frequency": (_positive, None)},
+    "/target-impedance": {"voltage": (_positive, None), "current_step": (_positive, None),
+                          "voltage_ripple_percent": (_positive, 5.0)},
+    "/impedance": {"capacitance": (_positive, None), "esr": (_non_negative, None),
+                   "freq_range": (_band, None), "points": (int, 100), "esl": (_non_negative, 0.0)},
+    "/combinations/parallel": {"target": (_positive, None), "available_values": (_library, None),
+                               "max_components": (int, 3), "tolerance": (_positive, 0.01),
+                               "top_k": (int, 0), "time_limit": (float, SEARCH_TIME_LIMIT),
+                               "max_nodes": (int, 0)},
+    "/combinations/series": {"target": (_positive, None), "available_values": (_library, None),
+                             "max_components": (int, 3), "tolerance": (_positive, 0.01),
+                             "top_k": (int, 0), "time_limit": (float, SEARCH_TIME_LIMIT),
+                             "max_nodes": (int, 0)},
+}
+
+# Endpoints whose work is large enough to run in the worker pool
+OFFLOADED = {"/impedance", "/combinations/parallel", "/combinations/series"}
+
+_calculator: Optional[DecapCalculator] = None
+
+def _compute(path: str, params: Dict[str, object]) -> object:
+    """Run one normalized request; module-level so worker processes can call it"""
+    # Overflow shows up as a non-finite result, which the server reports as an error
+    with np.errstate(over='ignore', divide='ignore', invalid='ignore'):
+        return _evaluate(path, params)
+
+def _evaluate(path: str, params: Dict[str, object]) -> object:
+    """Dispatch one normalized request to the calculator or combination finders"""
+    global _calculator
+    if _calculator is None:
+        _calculator = DecapCalculator()
+    c = _calculator
+    if path == "/power-decoupling":
+        return c.calculate_power_decoupling(params["voltage"], params["current_draw"],
+                                            params["voltage_ripple_percent"],
+                                            params["switching_freq"] or None,
+                                            tuple(params["temp_range"]))
+    if path == "/signal-decoupling":
+        return c.calculate_signal_decoupling(params["signal_freq"], params["impedance"],
+                                             params["bypass_factor"])
+    if path == "/lambda10":
+        return {"distance": c.calculate_lambda10_distance(params["frequency"])}
+    if path == "/target-impedance":
+        return {"z_target": c.calculate_target_impedance(params["voltage"], params["current_step"],
+                                                         params["voltage_ripple_percent"])}
+    if path == "/impedance":
+        return c.calculate_impedance_vs_frequency(params["capacitance"], params["esr"],
+                                                  tuple(params["freq_range"]), params["points"],
+                                                  esl=params["esl"])
+    topology = path.rsplit("/", 1)[1]
+    max_nodes = params["max_nodes"] or None
+    if params["top_k"] > 0:
+        find = CapacitorCombinations.top_parallel_combinations if topology == "parallel" \
+            else CapacitorCombinations.top_series_combinations
+        return find(params["target"], params["available_values"], params["top_k"],
+                    params["max_components"], params["tolerance"], params["time_limit"], max_nodes)
+    # The full list is only returned when the search finishes within its budget
+    engine = (ParallelSearch if topology == "parallel" else SeriesSearch)(
+        params["available_values"], params["max_components"])
+    budget = SearchBudget(params["time_limit"], max_nodes)
+    matches = sorted(engine.iter_indices(params["target"], params["tolerance"], budget))
+    if budget.exhausted:
+        raise ValueError("Search budget exhausted before every combination was found; "
+                         "set top_k for the best combinations found so far")
+    return [[engine.values[i] for i in combo] for combo in matches]
+
+def _check_sweep(params: Dict[str, object]) -> None:
+    """Reject impedance sweeps beyond the server's limits"""
+    if not 1 <= params["points"] <= MAX_POINTS:
+        raise ValueError(f"points must be between 1 and {MAX_POINTS}")
+
+def _check_search(params: Dict[str, object]) -> None:
+    """Reject combination searches beyond the server's limits"""
+    if not 1 <= params["max_components"] <= MAX_COMPONENTS:
+        raise ValueError(f"max_components must be between 1 and {MAX_COMPONENTS}")
+    if len(params["available_values"]) > MAX_LIBRARY:
+        raise ValueError(f"available_values is limited to {MAX_LIBRARY} values")
+    if not 0 < params["time_limit"] <= SEARCH_TIME_LIMIT:
+        raise ValueError(f"time_limit must be greater than 0 and at most {SEARCH_TIME_LIMIT:g} s")
+    if params["max_nodes"] < 0:
+        raise ValueError("max_nodes must not be negative")
+
+def normalize(path: str, payload: object) -> Dict[str, object]:
+    """Validate a request body, fill defaults and coerce types"""
+    fields = ENDPOINT_FIELDS.get(path)
+    if fields is None:
+        raise LookupError(path)
+    if not isinstance(payload, dict):
+        raise ValueError("Request body must be a JSON object")
+    unknown = set(payload) - set(fields)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    params = {}
+    for name, (convert, default) in fields.items():
+        if payload.get(name) is None:
+            if default is None:
+                raise ValueError(f"Missing required field: {name}")
+            params[name] = default
+            continue
+        try:
+            params[name] = convert(payload[name])
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid value for {name}: {payload[name]!r}")
+    if path.startswith("/combinations/"):
+        _check_search(params)
+    elif path == "/impedance":
+        _check_sweep(params)
+    return params
+
+
+class LRUCache:
+    """Bounded least-recently-used cache with hit and miss counters"""
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self._items: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, object]:
+        """Return (found, value) and refresh the entry"""
+        if key in self._items:
+            self._items.move_to_end(key)
+            self.hits += 1
+            return True, self._items[key]
+        self.misses += 1
+        return False, None
+
+    def put(self, key: Hashable, value: object) -> None:
+        """Store a value, evicting the least recently used entry when full"""
+        if self.capacity <= 0:
+            return
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.capacity:
+            self._items.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, object]:
+        """Counters and fill level"""
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "size": len(self._items), "capacity": self.capacity,
+                "hit_rate": self.hits / lookups if lookups else 0.0}
+
+
+class DecapServer:
+    """Asyncio HTTP/JSON front end for the calculator and combination finders
+
+    POST a JSON object to an endpoint in ENDPOINT_FIELDS; GET /health and
+    GET /stats report status and cache counters. Requests are normalized
+    (defaults filled, types coerced, libraries sorted) and keyed on the
+    result, so equivalent requests share one LRU cache entry. A request
+    that matches one already being computed waits for that computation
+    instead of starting another. Searches and sweeps run in a process
+    pool; the small closed-form calculations run on the event loop.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8080, workers: Optional[int] = None,
+                 cache_size: int = 1024, executor: Optional[Executor] = None):
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.cache = LRUCache(cache_size)
+        self.executor = executor
+        self._owns_executor = executor is None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.requests = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    async def start(self) -> Tuple[str, int]:
+        """Start listening; returns the bound address (port 0 picks a free port)"""
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(self.workers)
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.host, self.port = self._server.sockets[0].getsockname()[:2]
+        return self.host, self.port
+
+    async def stop(self) -> None:
+        """Stop listening and shut the worker pool down"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        # Closing the sockets ends each connection's read loop
+        for writer in self._connections.values():
+            writer.close()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        if self._owns_executor and self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    async def serve_forever(self) -> None:
+        """Run until cancelled"""
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    def stats(self) -> Dict[str, object]:
+        """Request, coalescing and cache counters"""
+        return {"requests": self.requests, "coalesced": self.coalesced, "errors": self.errors,
+                "inflight": len(self._inflight), "cache": self.cache.stats()}
+
+    async def handle(self, method: str, path: str, body: bytes) -> Tuple[int, object]:
+        """Route one request to (status, JSON-able response)"""
+        self.requests += 1
+        if method == "GET" and path == "/health":
+            return 200, {"status": "ok"}
+        if method == "GET" and path == "/stats":
+            return 200, self.stats()
+        if path not in ENDPOINT_FIELDS:
+            return 404, {"error": f"Unknown endpoint: {path}"}
+        if method != "POST":
+            return 405, {"error": "Use POST"}
+        try:
+            params = normalize(path, json.loads(body or b"{}"))
+            return 200, await self._result(path, params)
+        except json.JSONDecodeError:
+            self.errors += 1
+            return 400, {"error": "Body is not valid JSON"}
+        except (ValueError, ZeroDivisionError, OverflowError) as e:
+            self.errors += 1
+            return 400, {"error": str(e) or type(e).__name__}
+        except Exception as e:
+            self.errors += 1
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+
+    async def _result(self, path: str, params: Dict[str, object]) -> object:
+        """Serve from cache, join an identical in-flight request, or compute"""
+        key = path + json.dumps(params, sort_keys=True)
+        found, value = self.cache.get(key)
+        if found:
+            return value
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._compute(path, params)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody else was waiting
+            raise
+        finally:
+            del self._inflight[key]
+        self.cache.put(key, value)
+        future.set_result(value)
+        return value
+
+    async def _compute(self, path: str, params: Dict[str, object]) -> object:
+        """Run a request on the loop or in the worker pool, as JSON-ready data"""
+        if path in OFFLOADED:
+            value = await asyncio.get_running_loop().run_in_executor(self.executor, _compute, path, params)
+        else:
+            value = _compute(path, params)
+        try:
+            # Freeze as plain JSON types; NaN and infinities are not valid JSON
+            return json.loads(json.dumps(value, default=_json_default, allow_nan=False))
+        except ValueError:
+            raise ValueError("Result is not finite: check for zero or out-of-range inputs")
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve keep-alive HTTP/1.1 requests on one connection"""
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "Malformed request line"}, False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+
+                length = int(headers.get("content-length", 0) or 0)
+                if length > MAX_BODY:
+                    await self._respond(writer, 413, {"error": "Request body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                status, response = await self.handle(method.upper(), target.split("?", 1)[0], body)
+                await self._respond(writer, status, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            del self._connections[task]
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, response: object, keep_alive: bool) -> None:
+        """Write one JSON response"""
+        reasons = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                   413: "Payload Too Large", 500: "Internal Server Error"}
+        body = json.dumps(response).encode()
+        writer.write(f"HTTP/1.1 {status} {reasons.get(status, 'Error')}\r\n"
+                     f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                     f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + body)
+        await writer.drain()
+
+
+def _json_default(value: object) -> object:
+    """Convert NumPy values for json.dumps"""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+def serve(host: str = "127.0.0.1", port: int = 8080, workers: Optional[int] = None,
+          cache_size: int = 1024) -> None:
+    """Run a server in the foreground until interrupted"""
+    server = DecapServer(host, port, workers, cache_size)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
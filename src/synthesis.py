@@ -0,0 +1,175 @@
+from typing import Dict, List, Optional, Sequence, Union
+import numpy as np
+from .utils import format_capacitance
+
+LEAF, SERIES, PARALLEL = 0, 1, 2
+
+class NetworkSynthesizer:
+    """Bottom-up synthesis of mixed series-parallel capacitor networks
+
+    Level n of the table holds every capacitance reachable with exactly n
+    parts that is not already reachable with fewer, each stored once with
+    the first (cheapest) topology found for it. Level n is built by
+    combining levels a and n-a in series and in parallel, so larger
+    networks reuse the smaller ones instead of re-enumerating them. Values
+    are deduplicated on a log-scale grid of relative width `resolution`,
+    and the whole table is capped at `max_entries` rows.
+    """
+
+    CHUNK_SIZE = 1_000_000  # Candidate pairs evaluated per NumPy batch
+
+    def __init__(self, available_values: Sequence[float], max_parts: int = 4,
+                 resolution: float = 1e-4, max_entries: int = 1_000_000):
+        if not available_values:
+            raise ValueError("At least one capacitor value is required")
+        self.max_parts = max_parts
+        self.resolution = resolution
+        self.max_entries = max_entries
+        self.truncated = False
+        self.levels: List[Dict[str, np.ndarray]] = []
+        self._seen = np.empty(0, dtype=np.int64)
+
+        values = np.unique(np.asarray(available_values, dtype=float))
+        _, first = np.unique(self._keys(values), return_index=True)
+        values = values[first][:max_entries]
+        self.truncated = len(first) > max_entries
+        self._add_level(values, np.full(len(values), LEAF, dtype=np.int8),
+                        np.zeros(len(values), dtype=np.int8), np.arange(len(values), dtype=np.int32),
+                        np.zeros(len(values), dtype=np.int8), np.zeros(len(values), dtype=np.int32))
+
+    @property
+    def size(self) -> int:
+        """Total number of networks held in the table"""
+        return sum(len(level["value"]) for level in self.levels)
+
+    def build(self, max_parts: Optional[int] = None) -> None:
+        """Extend the table up to the given network size"""
+        max_parts = self.max_parts if max_parts is None else max_parts
+        while len(self.levels) < max_parts and not self.truncated:
+            self._build_level(len(self.levels) + 1)
+
+    def find(self, target: float, tolerance: float = 0.01, rank_by: str = 'parts',
+             limit: Optional[int] = None) -> List[Dict[str, Union[float, int, str, List[float]]]]:
+        """Find networks within tolerance of the target, ranked by part count or error"""
+        if rank_by not in ('parts', 'error'):
+            raise ValueError(f"Unknown ranking: {rank_by}")
+        self.build()
+
+        matches = []
+        tol = target * tolerance
+        for level_idx, level in enumerate(self.levels):
+            values = level["value"]
+            start, end = np.searchsorted(values, (target - tol, target + tol), side='left')
+            for idx in range(start, end):
+                error = abs(values[idx] - target) / target
+                if error < tolerance:
+                    matches.append((level_idx + 1, error, idx))
+
+        if rank_by == 'parts':
+            matches.sort(key=lambda m: (m[0], m[1]))
+        else:
+            matches.sort(key=lambda m: (m[1], m[0]))
+        if limit is not None:
+            matches = matches[:limit]
+
+        return [{
+            "value": float(self.levels[size - 1]["value"][idx]),
+            "error": float(error),
+            "num_parts": size,
+            "parts": self.parts(size, idx),
+            "topology": self.describe(size, idx),
+        } for size, error, idx in matches]
+
+    def parts(self, size: int, idx: int) -> List[float]:
+        """List the capacitor values used by a network"""
+        level = self.levels[size - 1]
+        if level["op"][idx] == LEAF:
+            return [float(level["value"][idx])]
+        return self.parts(int(level["left_size"][idx]), int(level["left_idx"][idx])) + \
+            self.parts(int(level["right_size"][idx]), int(level["right_idx"][idx]))
+
+    def describe(self, size: int, idx: int) -> str:
+        """Render a network as nested series(...) / parallel(...) terms"""
+        level = self.levels[size - 1]
+        op = level["op"][idx]
+        if op == LEAF:
+            return format_capacitance(float(level["value"][idx]))
+        left = self.describe(int(level["left_size"][idx]), int(level["left_idx"][idx]))
+        right = self.describe(int(level["right_size"][idx]), int(level["right_idx"][idx]))
+        return f"{'series' if op == SERIES else 'parallel'}({left}, {right})"
+
+    def _keys(self, values: np.ndarray) -> np.ndarray:
+        """Quantize values onto the log-scale deduplication grid"""
+        return np.round(np.log(values) / self.resolution).astype(np.int64)
+
+    def _build_level(self, size: int) -> None:
+        """Combine smaller levels into every new value reachable with `size` parts"""
+        candidates = []
+        for left_size in range(1, size // 2 + 1):
+            right_size = size - left_size
+            left = self.levels[left_size - 1]["value"]
+            right = self.levels[right_size - 1]["value"]
+            if len(left) == 0 or len(right) == 0:
+                continue
+            rows_per_chunk = max(1, self.CHUNK_SIZE // len(right))
+            for row in range(0, len(left), rows_per_chunk):
+                candidates.append(self._combine(left[row:row + rows_per_chunk], right, row,
+                                                left_size, right_size))
+
+        if not candidates:
+            candidates.append(self._combine(np.empty(0), np.empty(0), 0, 1, 1))
+        merged = {name: np.concatenate([c[name] for c in candidates]) for name in candidates[0]}
+        keys, first = np.unique(merged["key"], return_index=True)
+        fresh = ~np.isin(keys, self._seen, assume_unique=True)
+        keep = first[fresh]
+
+        budget = self.max_entries - self.size
+        if len(keep) > budget:
+            # Thin evenly across the value range rather than dropping one end
+            order = np.argsort(merged["value"][keep], kind='stable')
+            keep = keep[order[np.unique(np.linspace(0, len(keep) - 1, max(budget, 0)).astype(int))]] \
+                if budget > 0 else keep[:0]
+            self.truncated = True
+        self._add_level(merged["value"][keep], merged["op"][keep],
+                        merged["left_size"][keep], merged["left_idx"][keep],
+                        merged["right_size"][keep], merged["right_idx"][keep])
+
+    def _combine(self, left: np.ndarray, right: np.ndarray, row_offset: int,
+                 left_size: int, right_size: int) -> Dict[str, np.ndarray]:
+        """Series and parallel values for every pair in a block of rows"""
+        rows = np.arange(row_offset, row_offset + len(left), dtype=np.int32)[:, None]
+        cols = np.arange(len(right), dtype=np.int32)[None, :]
+        rows, cols = np.broadcast_arrays(rows, cols)
+        if left_size == right_size:
+            mask = cols >= rows  # Each unordered pair of equal-size networks once
+            rows, cols = rows[mask], cols[mask]
+        else:
+            rows, cols = rows.ravel(), cols.ravel()
+
+        a = left[rows - row_offset]
+        b = right[cols]
+        values = np.concatenate([a * b / (a + b), a + b])
+        ops = np.repeat(np.array([SERIES, PARALLEL], dtype=np.int8), len(a))
+        keys = self._keys(values)
+        keys, first = np.unique(keys, return_index=True)
+        pair = first % len(a)
+        return {
+            "key": keys,
+            "value": values[first],
+            "op": ops[first],
+            "left_size": np.full(len(first), left_size, dtype=np.int8),
+            "left_idx": rows[pair].astype(np.int32),
+            "right_size": np.full(len(first), right_size, dtype=np.int8),
+            "right_idx": cols[pair].astype(np.int32),
+        }
+
+    def _add_level(self, values, op, left_size, left_idx, right_size, right_idx) -> None:
+        """Store a level sorted by value and remember its keys"""
+        order = np.argsort(values, kind='stable')
+        level = {
+            "value": values[order], "op": op[order],
+            "left_size": left_size[order], "left_idx": left_idx[order],
+            "right_size": right_size[order], "right_idx": right_idx[order],
+        }
+        self.levels.append(level)
+        self._seen = np.union1d(self._seen, self._keys(level["value"]))
@@ -0,0 +1,205 @@
+import hashlib
+import json
+import os
+from typing import List, Optional, Sequence, TextIO, Tuple, Union
+import numpy as np
+
+FREQUENCY_UNITS = {"HZ": 1.0, "KHZ": 1e3, "MHZ": 1e6, "GHZ": 1e9}
+
+def parse_touchstone(source: Union[str, TextIO]) -> Tuple[np.ndarray, np.ndarray, float]:
+    """Frequencies (Hz), complex S21 and reference impedance of a 2-port Touchstone 1.0 file"""
+    if isinstance(source, str):
+        with open(source) as f:
+            return parse_touchstone(f)
+
+    unit, data_format, z0 = "GHZ", "MA", 50.0
+    numbers: List[str] = []
+    for line in source:
+        line = line.split("!", 1)[0].strip()
+        if not line:
+            continue
+        if line.startswith("["):
+            raise ValueError("Touchstone 2.0 keywords are not supported")
+        if line.startswith("#"):
+            tokens = line[1:].upper().split()
+            for position, token in enumerate(tokens):
+                if token in FREQUENCY_UNITS:
+                    unit = token
+                elif token in ("RI", "MA", "DB"):
+                    data_format = token
+                elif token == "R":
+                    z0 = float(tokens[position + 1])
+                elif token in ("Y", "Z", "H", "G"):
+                    raise ValueError(f"Only S-parameters are supported, not {token}")
+            continue
+        numbers.extend(line.split())
+
+    try:
+        values = np.array(numbers, dtype=float)
+    except ValueError:
+        raise ValueError("Touchstone data contains non-numeric values")
+    if len(values) == 0 or len(values) % 9:
+        raise ValueError("Expected 9 values per frequency point in a 2-port file")
+    rows = values.reshape(-1, 9)  # f, S11, S21, S12, S22 as pairs
+    first, second = rows[:, 3], rows[:, 4]
+    if data_format == "RI":
+        s21 = first + 1j * second
+    else:
+        magnitude = 10 ** (first / 20) if data_format == "DB" else first
+        s21 = magnitude * np.exp(1j * np.deg2rad(second))
+    return rows[:, 0] * FREQUENCY_UNITS[unit], s21, z0
+
+def shunt_through_impedance(s21: np.ndarray, z0: float = 50.0) -> np.ndarray:
+    """Impedance of a part measured shunt-through: Z = Z0·S21 / (2·(1 - S21))"""
+    s21 = np.asarray(s21, dtype=complex)
+    return z0 * s21 / (2 * (1 - s21))
+
+class MeasuredImpedanceStore:
+    """Measured impedance curves of many parts in one memory-mappable store
+
+    Curves are concatenated into flat arrays (log10 frequency as float64,
+    ln|Z| and phase as float32) with per-part offsets, saved as plain .npy
+    files next to JSON metadata so a saved store can be memory-mapped.
+    Interpolation onto a sweep grid is linear in log frequency for ln|Z|
+    and phase, holding the end values outside each part's measured band.
+    All requested parts are interpolated with a single search by offsetting
+    each part's log frequencies into its own disjoint key range.
+    """
+
+    FORMAT_VERSION = 1
+    ARRAYS = ('offsets', 'log_frequency', 'log_magnitude', 'phase')
+
+    def __init__(self, names: Sequence[str], offsets: np.ndarray, log_frequency: np.ndarray,
+                 log_magnitude: np.ndarray, phase: np.ndarray, fingerprint: Optional[str] = None):
+        self.names = list(names)
+        self.offsets = offsets
+        self.log_frequency = log_frequency
+        self.log_magnitude = log_magnitude
+        self.phase = phase
+        self.fingerprint = fingerprint
+        self._lookup = {name: idx for idx, name in enumerate(self.names)}
+        self._keys: Optional[np.ndarray] = None
+
+    @staticmethod
+    def files_fingerprint(paths: Sequence[str]) -> str:
+        """Hash file paths, sizes and modification times so a stale store can be detected"""
+        digest = hashlib.sha256(str(MeasuredImpedanceStore.FORMAT_VERSION).encode())
+        for path in paths:
+            stat = os.stat(path)
+            digest.update(f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+        return digest.hexdigest()
+
+    @classmethod
+    def from_curves(cls, names: Sequence[str], curves: Sequence[Tuple[np.ndarray, np.ndarray]],
+                    fingerprint: Optional[str] = None) -> 'MeasuredImpedanceStore':
+        """Build a store from (frequencies, complex impedance) pairs"""
+        if len(set(names)) != len(names):
+            raise ValueError("Part names must be unique")
+        if len(names) != len(curves):
+            raise ValueError("Expected one curve per part name")
+        counts = []
+        for name, (frequencies, _) in zip(names, curves):
+            frequencies = np.asarray(frequencies, dtype=float)
+            if len(frequencies) < 2 or not (np.diff(frequencies) > 0).all() or frequencies[0] <= 0:
+                raise ValueError(f"{name}: need two or more positive, increasing frequencies")
+            counts.append(len(frequencies))
+        offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        frequencies = np.concatenate([np.asarray(f, dtype=float) for f, _ in curves]) if curves else np.empty(0)
+        impedance = np.concatenate([np.asarray(z, dtype=complex) for _, z in curves]) if curves \
+            else np.empty(0, dtype=complex)
+        return cls(names, offsets, np.log10(frequencies), np.log(np.abs(impedance)).astype(np.float32),
+                   np.angle(impedance).astype(np.float32), fingerprint)
+
+    @classmethod
+    def from_touchstone(cls, paths: Sequence[str],
+                        names: Optional[Sequence[str]] = None) -> 'MeasuredImpedanceStore':
+        """Parse shunt-through .s2p files; parts are named after the files unless names are given"""
+        if names is None:
+            names = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+        curves = []
+        for path in paths:
+            frequencies, s21, z0 = parse_touchstone(path)
+            curves.append((frequencies, shunt_through_impedance(s21, z0)))
+        return cls.from_curves(names, curves, cls.files_fingerprint(paths))
+
+    def save(self, directory: str) -> None:
+        """Write the store as memory-mappable .npy files plus metadata"""
+        os.makedirs(directory, exist_ok=True)
+        for name in self.ARRAYS:
+            np.save(os.path.join(directory, f'{name}.npy'), getattr(self, name))
+        meta = {"format_version": self.FORMAT_VERSION, "names": self.names, "fingerprint": self.fingerprint}
+        with open(os.path.join(directory, 'store.json'), 'w') as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, directory: str, paths: Optional[Sequence[str]] = None,
+             mmap: bool = True) -> 'MeasuredImpedanceStore':
+        """Load a saved store, checking it still matches the given Touchstone files"""
+        with open(os.path.join(directory, 'store.json')) as f:
+            meta = json.load(f)
+        if meta.get("format_version") != cls.FORMAT_VERSION:
+            raise ValueError(f"Unsupported store format: {meta.get('format_version')}")
+        if paths is not None and cls.files_fingerprint(paths) != meta["fingerprint"]:
+            raise ValueError("Measured impedance store is stale: the files have changed")
+        mode = 'r' if mmap else None
+        arrays = {name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mode)
+                  for name in cls.ARRAYS}
+        return cls(meta["names"], fingerprint=meta["fingerprint"], **arrays)
+
+    @classmethod
+    def open_or_build(cls, directory: str, paths: Sequence[str],
+                      names: Optional[Sequence[str]] = None) -> 'MeasuredImpedanceStore':
+        """Load the store from disk, reparsing the files only when missing or stale"""
+        try:
+            store = cls.load(directory, paths)
+            if names is None or list(names) == store.names:
+                return store
+        except (OSError, ValueError, KeyError):
+            pass
+        store = cls.from_touchstone(paths, names)
+        store.save(directory)
+        return store
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._lookup
+
+    def index(self, name: str) -> int:
+        """Position of a part in the store"""
+        if name not in self._lookup:
+            raise ValueError(f"No measured data for {name}")
+        return self._lookup[name]
+
+    def curve(self, name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Measured frequencies and complex impedance of one part"""
+        idx = self.index(name)
+        segment = slice(self.offsets[idx], self.offsets[idx + 1])
+        magnitude = np.exp(self.log_magnitude[segment].astype(float))
+        return 10 ** self.log_frequency[segment], magnitude * np.exp(1j * self.phase[segment].astype(float))
+
+    def impedance_at(self, parts: Sequence[Union[str, int]], frequencies: Sequence[float]) -> np.ndarray:
+        """Complex impedance of each part interpolated onto a frequency grid (parts x frequencies)"""
+        idx = np.array([self.index(p) if isinstance(p, str) else int(p) for p in parts], dtype=np.int64)
+        query = np.log10(np.asarray(frequencies, dtype=float))
+        keys, width, low = self._search_keys()
+
+        # Offset every part's log frequencies by part * width so one search covers all parts
+        start, stop = self.offsets[idx][:, np.newaxis], self.offsets[idx + 1][:, np.newaxis]
+        target = idx[:, np.newaxis] * width + (np.clip(query, low, low + width / 2) - low)
+        lower = np.clip(np.searchsorted(keys, target, side='right') - 1, start, stop - 2)
+        f0, f1 = self.log_frequency[lower], self.log_frequency[lower + 1]
+        t = np.clip((query - f0) / (f1 - f0), 0.0, 1.0)
+        log_magnitude = self.log_magnitude[lower] + t * (self.log_magnitude[lower + 1] - self.log_magnitude[lower])
+        phase = self.phase[lower] + t * (self.phase[lower + 1] - self.phase[lower])
+        return np.exp(log_magnitude + 1j * phase)
+
+    def _search_keys(self) -> Tuple[np.ndarray, float, float]:
+        """Globally sorted search keys, part * width + (log10 f - low), built on first use"""
+        low = float(self.log_frequency.min())
+        width = 2 * (float(self.log_frequency.max()) - low) + 1  # Room for clamped queries
+        if self._keys is None:
+            part = np.repeat(np.arange(len(self.names)), np.diff(self.offsets))
+            self._keys = part * width + (self.log_frequency - low)
+        return self._keys, width, low
@@ -1,5 +1,7 @@
 import math
-from typing import Union
+from functools import lru_cache
+from typing import Sequence, Tuple, Union
+import numpy as np
 
 def format_capacitance(capacitance: float) -> str:
     """Format capacitance in appropriate units"""
@@ -30,4 +32,143 @@ def format_impedance(impedance: float) -> str:
     elif impedance >= 1e3:
         return f"{impedance/1e3:.2f} kΩ"
     else:
-        return f"{impedance:.2f} Ω" 
\ No newline at end of file
+        return f"{impedance:.2f} Ω"
+
+
+# SI units per quantity as (threshold, multiplier, divisor, suffix), ascending. Values below
+# the second threshold (including zero, negatives and NaN) use the first unit, like the
+# scalar formatters above, and scaling uses the same operation so the digits match.
+CAPACITANCE_UNITS = ((0.0, 1e12, 1.0, " pF"), (1e-9, 1e9, 1.0, " nF"),
+                     (1e-6, 1e6, 1.0, " µF"), (1e-3, 1e3, 1.0, " mF"))
+FREQUENCY_UNITS = ((0.0, 1.0, 1.0, " Hz"), (1e3, 1.0, 1e3, " kHz"),
+                   (1e6, 1.0, 1e6, " MHz"), (1e9, 1.0, 1e9, " GHz"))
+IMPEDANCE_UNITS = ((0.0, 1.0, 1.0, " Ω"), (1e3, 1.0, 1e3, " kΩ"), (1e6, 1.0, 1e6, " MΩ"))
+
+def _unit_index(values: np.ndarray, units: Sequence[Tuple[float, float, float, str]]) -> np.ndarray:
+    """Unit of each value from a per-decade lookup table on floor(log10(value))"""
+    thresholds = np.array([unit[0] for unit in units[1:]])
+    low = math.floor(math.log10(thresholds[0])) - 1
+    high = math.floor(math.log10(thresholds[-1])) + 1
+    table = np.searchsorted(thresholds, 10.0 ** np.arange(low, high + 1), side='right')
+
+    positive = values > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        decade = np.clip(np.floor(np.log10(np.where(positive, values, 1.0))), low, high)
+    index = np.where(positive, table[decade.astype(int) - low], 0)
+    # log10 can land one decade off right at a threshold; settle those against the thresholds
+    bounds = np.concatenate([[-np.inf], thresholds, [np.inf]])
+    index -= (index > 0) & (values < bounds[index])
+    index += (index < len(thresholds)) & (values >= bounds[index + 1])
+    return index
+
+def _near_half(scaled: np.ndarray) -> np.ndarray:
+    """Values whose rounding could go either way given floating-point error in the scaling"""
+    with np.errstate(invalid='ignore'):
+        return np.abs(scaled - np.floor(scaled) - 0.5) < 1e-9 + np.abs(scaled) * 1e-14
+
+@lru_cache(maxsize=None)
+def _digit_tables(decimals: int, suffixes: Tuple[str, ...]) -> Tuple[np.ndarray, np.ndarray]:
+    """Strings for whole parts 0..999 and for every (suffix, fractional digits) pair"""
+    point = "." if decimals else ""
+    heads = np.array([f"{whole}{point}" for whole in range(1000)])
+    tails = np.array([f"{fraction:0{decimals}d}{suffix}" if decimals else suffix
+                      for suffix in suffixes for fraction in range(10 ** decimals)])
+    return heads, tails
+
+def _format_fixed(values: np.ndarray, decimals: int, suffixes: Tuple[str, ...],
+                  suffix_index: np.ndarray) -> np.ndarray:
+    """f"{value:.{decimals}f}{suffix}" over an array, assembled from digit lookup tables"""
+    scale = 10 ** decimals
+    scaled = np.abs(values) * scale
+    with np.errstate(invalid='ignore'):
+        # Python formatting where rounding value·10^decimals in floating point could differ
+        fallback = ~np.isfinite(scaled) | (scaled >= 2 ** 52) | _near_half(scaled)
+    units = np.rint(np.where(fallback, 0.0, scaled)).astype(np.int64)
+    whole, fraction = units // scale, units % scale
+
+    heads, tails = _digit_tables(decimals, suffixes)
+    small = whole < len(heads)
+    head = heads[np.where(small, whole, 0)]
+    if not small.all():
+        head = head.astype(f"U{len(str(int(whole.max()))) + 1}")
+        head[~small] = np.char.add(whole[~small].astype(str), "." if decimals else "")
+    negative = np.signbit(values)
+    if negative.any():
+        head = np.char.add(np.where(negative, "-", ""), head)
+    text = np.char.add(head, tails[suffix_index * scale + fraction])
+    if fallback.any():
+        exact = [f"{v:.{decimals}f}{suffixes[i]}" for v, i in zip(values[fallback], suffix_index[fallback])]
+        width = max(len(e) for e in exact)
+        if width > text.dtype.itemsize // 4:
+            text = text.astype(f"U{width}")
+        text[fallback] = exact
+    return text
+
+def format_fixed(values: Sequence[float], decimals: int = 2) -> np.ndarray:
+    """Vectorized f"{value:.{decimals}f}" over an array"""
+    values = np.asarray(values, dtype=float)
+    return _format_fixed(values, decimals, ("",), np.zeros(values.shape, dtype=np.int64))
+
+@lru_cache(maxsize=None)
+def _exponent_table() -> np.ndarray:
+    """Exponent suffixes "e-324" .. "e+308" in Python's e-format"""
+    return np.array([f"e{exponent:+03d}" for exponent in range(-324, 309)])
+
+def format_scientific(values: Sequence[float], digits: int = 6) -> np.ndarray:
+    """Vectorized f"{value:.{digits - 1}e}" over an array"""
+    if not 1 <= digits <= 15:
+        raise ValueError("Digits must be between 1 and 15")
+    values = np.asarray(values, dtype=float)
+    magnitude = np.abs(values)
+    usable = np.isfinite(magnitude) & (magnitude > 1e-300) & (magnitude < 1e300)
+    safe = np.where(usable, magnitude, 1.0)
+    exponent = np.floor(np.log10(safe)).astype(np.int64)
+    mantissa = safe / 10.0 ** exponent
+    # log10 can be one decade off near powers of ten
+    exponent += (mantissa >= 10).astype(np.int64) - (mantissa < 1)
+    mantissa = safe / 10.0 ** exponent
+    scaled = mantissa * 10.0 ** (digits - 1)
+    fallback = ~usable | _near_half(scaled)
+    units = np.rint(scaled).astype(np.int64)
+    carry = units >= 10 ** digits  # 9.9999996 rounds up to the next decade
+    units = np.where(carry, units // 10, units)
+    exponent = exponent + carry
+
+    heads, _ = _digit_tables(0, ("",))
+    text = np.char.add(np.where(np.signbit(values), "-", ""), heads[units // 10 ** (digits - 1)])
+    if digits > 1:
+        text = np.char.add(text, ".")
+    remaining = digits - 1
+    while remaining:
+        group = min(3, remaining)
+        remaining -= group
+        part = units // 10 ** remaining % 10 ** group
+        text = np.char.add(text, _digit_tables(group, ("",))[1][part])
+    text = np.char.add(text, _exponent_table()[np.clip(exponent, -324, 308) + 324])
+    if fallback.any():
+        exact = [f"{v:.{digits - 1}e}" for v in values[fallback]]
+        width = max(len(e) for e in exact)
+        if width > text.dtype.itemsize // 4:
+            text = text.astype(f"U{width}")
+        text[fallback] = exact
+    return text
+
+def format_si_array(values: Sequence[float], units: Sequence[Tuple[float, float, float, str]]) -> np.ndarray:
+    """Vectorized SI formatting of an array with a unit table such as CAPACITANCE_UNITS"""
+    values = np.asarray(values, dtype=float)
+    index = _unit_index(values, units)
+    multiplier = np.array([unit[1] for unit in units])[index]
+    divisor = np.array([unit[2] for unit in units])[index]
+    return _format_fixed(values * multiplier / divisor, 2, tuple(unit[3] for unit in units), index)
+
+def format_capacitance_array(capacitances: Sequence[float]) -> np.ndarray:
+    """Vectorized format_capacitance"""
+    return format_si_array(capacitances, CAPACITANCE_UNITS)
+
+def format_frequency_array(frequencies: Sequence[float]) -> np.ndarray:
+    """Vectorized format_frequency"""
+    return format_si_array(frequencies, FREQUENCY_UNITS)
+
+def format_impedance_array(impedances: Sequence[float]) -> np.ndarray:
+    """Vectorized format_impedance"""
+    return format_si_array(impedances, IMPEDANCE_UNITS)
@@ -0,0 +1,271 @@
+import json
+import os
+from abc import ABC, abstractmethod
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+import numpy as np
+from .calculator import DecapCalculator
+from .utils import format_scientific
+
+Chunk = Dict[str, np.ndarray]
+Formatter = Callable[[np.ndarray], np.ndarray]
+
+def _float_text(column: np.ndarray, digits: Optional[int]) -> np.ndarray:
+    """Shortest round-trip repr of each float, or `digits` significant digits"""
+    return column.astype(str) if digits is None else format_scientific(column, digits)
+
+def _cells(column: np.ndarray, digits: Optional[int] = None) -> np.ndarray:
+    """Text of each value for CSV, empty for NaN"""
+    if column.dtype.kind == 'f':
+        return np.where(np.isnan(column), "", _float_text(column, digits))
+    if column.dtype.kind == 'b':
+        return np.where(column, "True", "False")
+    return column.astype(str)
+
+def _join(columns: Sequence[np.ndarray], separator: str) -> np.ndarray:
+    """Join string columns element-wise"""
+    row = columns[0]
+    for column in columns[1:]:
+        row = np.char.add(np.char.add(row, separator), column)
+    return row
+
+class _ChunkWriter(ABC):
+    """Shared column handling of the text writers"""
+
+    def __init__(self, stream: TextIO, formatters: Optional[Dict[str, Formatter]] = None,
+                 float_digits: Optional[int] = None):
+        self.stream = stream
+        self.formatters = formatters or {}
+        self.float_digits = float_digits
+        self.columns: Optional[List[str]] = None
+        self.rows = 0
+
+    def write(self, chunk: Chunk) -> int:
+        """Append one chunk of equal-length columns, returning its row count"""
+        if self.columns is None:
+            self.columns = list(chunk)
+            self._start(chunk)
+        elif list(chunk) != self.columns:
+            raise ValueError(f"Expected columns {self.columns}, got {list(chunk)}")
+        arrays = {name: np.asarray(chunk[name]) for name in self.columns}
+        rows = len(next(iter(arrays.values())))
+        if rows:
+            lines = self._rows(arrays)
+            self.stream.write("\n".join(lines.tolist()) + "\n")
+        self.rows += rows
+        return rows
+
+    def close(self) -> None:
+        self.stream.flush()
+
+    def __enter__(self) -> '_ChunkWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _start(self, chunk: Chunk) -> None:
+        """Write anything that precedes the first row, such as a header; nothing by default"""
+
+    @abstractmethod
+    def _rows(self, arrays: Chunk) -> np.ndarray:
+        """One text line per row of a chunk"""
+
+class CSVWriter(_ChunkWriter):
+    """Stream column chunks to CSV
+
+    Each chunk is turned into text with array operations and written with
+    one call. Columns listed in `formatters` go through their array
+    formatter (e.g. format_frequency_array); other floats are written as
+    shortest round-trip values, or with `float_digits` significant digits,
+    which is several times faster. A 2-D column becomes columns name_1..name_k
+    with NaN padding left empty.
+    """
+
+    def _start(self, chunk: Chunk) -> None:
+        header = []
+        for name in self.columns:
+            column = np.asarray(chunk[name])
+            header += [f"{name}_{k + 1}" for k in range(column.shape[1])] if column.ndim == 2 else [name]
+        self.stream.write(",".join(header) + "\n")
+
+    def _rows(self, arrays: Chunk) -> np.ndarray:
+        cells = []
+        for name, column in arrays.items():
+            if name in self.formatters:
+                cells.append(self._quote(np.asarray(self.formatters[name](column))))
+            elif column.ndim == 2:
+                cells += [_cells(column[:, k], self.float_digits) for k in range(column.shape[1])]
+            elif column.dtype.kind in 'USO':
+                cells.append(self._quote(_cells(column)))
+            else:
+                cells.append(_cells(column, self.float_digits))
+        return _join(cells, ",")
+
+    @staticmethod
+    def _quote(column: np.ndarray) -> np.ndarray:
+        """Quote text cells containing separators or quotes"""
+        column = column.astype(str)
+        special = (np.char.find(column, ",") >= 0) | (np.char.find(column, '"') >= 0) | \
+            (np.char.find(column, "\n") >= 0)
+        if not special.any():
+            return column
+        quoted = np.char.add(np.char.add('"', np.char.replace(column, '"', '""')), '"')
+        return np.where(special, quoted, column)
+
+class JSONLinesWriter(_ChunkWriter):
+    """Stream column chunks as one JSON object per row
+
+    Rows match json.dumps of the equivalent dict: floats as round-trip
+    numbers unless `float_digits` is set (NaN and infinities as
+    NaN/Infinity), strings escaped once per
+    distinct value, and 2-D columns as lists with NaN padding dropped.
+    """
+
+    def _rows(self, arrays: Chunk) -> np.ndarray:
+        fields = []
+        for name, column in arrays.items():
+            if name in self.formatters:
+                value = self._strings(np.asarray(self.formatters[name](column)))
+            elif column.ndim == 2:
+                value = self._lists(column)
+            else:
+                value = self._values(column)
+            fields.append(np.char.add(json.dumps(name) + ": ", value))
+        return np.char.add(np.char.add("{", _join(fields, ", ")), "}")
+
+    def _values(self, column: np.ndarray) -> np.ndarray:
+        """JSON text of each scalar value"""
+        if column.dtype.kind == 'f':
+            text = _float_text(column, self.float_digits)
+            text = np.where(np.isnan(column), "NaN", text)
+            return np.where(np.isinf(column), np.where(column > 0, "Infinity", "-Infinity"), text)
+        if column.dtype.kind == 'b':
+            return np.where(column, "true", "false")
+        if column.dtype.kind in 'iu':
+            return column.astype(str)
+        return self._strings(column)
+
+    @staticmethod
+    def _strings(column: np.ndarray) -> np.ndarray:
+        """JSON string literals, escaping each distinct value once"""
+        distinct, inverse = np.unique(column.astype(str), return_inverse=True)
+        return np.array([json.dumps(value) for value in distinct.tolist()])[inverse.ravel()]
+
+    def _lists(self, column: np.ndarray) -> np.ndarray:
+        """JSON lists of the non-NaN values in each row"""
+        text = np.char.add("[", self._values(column[:, 0]))
+        text = np.where(np.isnan(column[:, 0]), "[", text)
+        for k in range(1, column.shape[1]):
+            present = ~np.isnan(column[:, k])
+            text = np.where(present, np.char.add(np.char.add(text, ", "), self._values(column[:, k])), text)
+        return np.char.add(text, "]")
+
+class ColumnarWriter:
+    """Stream numeric column chunks into a directory of raw binary columns
+
+    Each column is appended to <name>.bin in native layout; columns.json,
+    written on close, records the dtype, trailing shape and row count so
+    read_columnar can memory-map the result.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.schema: Optional[Dict[str, Tuple[np.dtype, Tuple[int, ...]]]] = None
+        self.files: Dict[str, object] = {}
+        self.rows = 0
+
+    def write(self, chunk: Chunk) -> int:
+        """Append one chunk of equal-length numeric columns, returning its row count"""
+        arrays = {name: np.asarray(column) for name, column in chunk.items()}
+        if self.schema is None:
+            for name, array in arrays.items():
+                if array.dtype.kind not in 'biuf':
+                    raise ValueError(f"Column {name} is not numeric")
+            self.schema = {name: (array.dtype, array.shape[1:]) for name, array in arrays.items()}
+            self.files = {name: open(os.path.join(self.directory, f"{name}.bin"), "wb") for name in arrays}
+        elif list(arrays) != list(self.schema):
+            raise ValueError(f"Expected columns {list(self.schema)}, got {list(arrays)}")
+        rows = len(next(iter(arrays.values())))
+        for name, array in arrays.items():
+            dtype, shape = self.schema[name]
+            if array.shape[1:] != shape:
+                raise ValueError(f"Column {name} changed shape from {shape} to {array.shape[1:]}")
+            np.ascontiguousarray(array.astype(dtype, casting='same_kind', copy=False)).tofile(self.files[name])
+        self.rows += rows
+        return rows
+
+    def close(self) -> None:
+        """Close the column files and write the schema"""
+        for f in self.files.values():
+            f.close()
+        meta = {"format_version": self.FORMAT_VERSION, "rows": self.rows,
+                "columns": {name: {"dtype": dtype.str, "shape": list(shape)}
+                            for name, (dtype, shape) in (self.schema or {}).items()}}
+        with open(os.path.join(self.directory, "columns.json"), "w") as f:
+            json.dump(meta, f)
+
+    def __enter__(self) -> 'ColumnarWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+def read_columnar(directory: str, mmap: bool = True) -> Chunk:
+    """Load columns written by ColumnarWriter, memory-mapped by default"""
+    with open(os.path.join(directory, "columns.json")) as f:
+        meta = json.load(f)
+    if meta.get("format_version") != ColumnarWriter.FORMAT_VERSION:
+        raise ValueError(f"Unsupported columnar format: {meta.get('format_version')}")
+    columns = {}
+    for name, spec in meta["columns"].items():
+        path = os.path.join(directory, f"{name}.bin")
+        shape = (meta["rows"], *spec["shape"])
+        if mmap and meta["rows"]:
+            columns[name] = np.memmap(path, dtype=spec["dtype"], mode="r", shape=shape)
+        else:
+            columns[name] = np.fromfile(path, dtype=spec["dtype"]).reshape(shape)
+    return columns
+
+def write_chunks(writer, chunks: Iterable[Chunk]) -> int:
+    """Write every chunk and close the writer, returning the row count"""
+    with writer:
+        return sum(writer.write(chunk) for chunk in chunks)
+
+def sweep_chunks(capacitances: Sequence[float], esrs: Sequence[float], freq_range: Tuple[float, float],
+                 points: int = 100, esls: Optional[Sequence[float]] = None, chunk_size: int = 65536,
+                 calculator: Optional[DecapCalculator] = None) -> Iterator[Chunk]:
+    """Impedance sweeps of many parts as long-format chunks of (part, frequency, impedance)"""
+    calculator = calculator or DecapCalculator()
+    frequencies = calculator.frequency_points(freq_range, points)
+    esls = [0.0] * len(capacitances) if esls is None else esls
+    step = max(1, chunk_size // points)
+    for first in range(0, len(capacitances), step):
+        stop = min(first + step, len(capacitances))
+        z = calculator.impedance_at(capacitances[first:stop], esrs[first:stop], frequencies,
+                                    esls[first:stop])
+        yield {"part": np.repeat(np.arange(first, stop), points),
+               "frequency": np.tile(frequencies, stop - first),
+               "impedance": z.ravel()}
+
+def combination_chunks(matches: Iterable[Sequence[float]], max_components: int,
+                       topology: str = 'parallel', chunk_size: int = 65536) -> Iterator[Chunk]:
+    """Combination finder output as chunks of (total, count, values padded with NaN)"""
+    if topology not in ('parallel', 'series'):
+        raise ValueError("Topology must be 'parallel' or 'series'")
+    matches = iter(matches)
+    while True:
+        block = list(islice(matches, chunk_size))
+        if not block:
+            return
+        values = np.full((len(block), max_components), np.nan)
+        for row, combo in enumerate(block):
+            values[row, :len(combo)] = combo
+        if topology == 'parallel':
+            total = np.nansum(values, axis=1)
+        else:
+            total = 1 / np.nansum(1 / values, axis=1)
+        yield {"total": total, "count": (~np.isnan(values)).sum(axis=1), "values": values}
@@ -0,0 +1,66 @@
+import unittest
+import numpy as np
+from src.adaptive import AdaptiveSweep, interpolate_loglog, resonance_seeds
+from src.calculator import DecapCalculator
+
+BANK = ([10e-6, 100e-9], [0.001, 0.002], [1e-9, 0.3e-9])
+
+class TestAdaptiveSweep(unittest.TestCase):
+    def setUp(self):
+        self.calculator = DecapCalculator()
+        self.dense = np.logspace(3, 9, 200_001)
+
+    def max_error(self, freqs, z, capacitances, esrs, esls):
+        """Worst relative log-log interpolation error against a dense sweep"""
+        truth = self.calculator.bank_impedance_at(capacitances, esrs, self.dense, esls)
+        return np.max(np.abs(interpolate_loglog(freqs, z, self.dense) / truth - 1))
+
+    def test_resonance_seeds(self):
+        """Test series resonances, half-power edges and cross anti-resonances"""
+        seeds = resonance_seeds([1e-6], [1e-9])
+        np.testing.assert_allclose(seeds, [1 / (2 * np.pi * np.sqrt(1e-15))])
+        self.assertEqual(len(resonance_seeds([1e-6], [1e-9], [0.001])), 3)  # Q ≈ 31.6
+        self.assertEqual(len(resonance_seeds([1e-6], [1e-9], [1.0])), 1)    # Q < 1, no edges
+        self.assertEqual(len(resonance_seeds(*BANK[::2])), 4)
+        self.assertEqual(len(resonance_seeds([1e-6], [0.0])), 0)
+
+    def test_accuracy_within_tolerance(self):
+        """Test interpolation between adaptive points tracks a dense sweep"""
+        for capacitances, esrs, esls in ([[1e-6], [0.005], [0.5e-9]], BANK):
+            for tolerance in (0.01, 0.001):
+                with self.subTest(capacitances=capacitances, tolerance=tolerance):
+                    freqs, z = self.calculator.calculate_impedance_adaptive(
+                        capacitances, esrs, (1e3, 1e9), esls, tolerance=tolerance)
+                    self.assertTrue(np.all(np.diff(freqs) > 0))
+                    self.assertLess(self.max_error(freqs, z, capacitances, esrs, esls), tolerance)
+
+    def test_resonances_captured(self):
+        """Test the minimum at each SRF and the anti-resonance peak are sampled"""
+        capacitances, esrs, esls = BANK
+        freqs, z = self.calculator.calculate_impedance_adaptive(capacitances, esrs, (1e3, 1e9), esls)
+        truth = self.calculator.bank_impedance_at(capacitances, esrs, self.dense, esls)
+        self.assertLess(abs(z[freqs > 1e5].max() / truth[self.dense > 1e5].max() - 1), 0.01)
+        self.assertLess(abs(z.min() / truth.min() - 1), 0.01)
+
+    def test_fewer_evaluations_than_uniform(self):
+        """Test a uniform grid needs several times more points for the same accuracy"""
+        capacitances, esrs, esls = BANK
+        freqs, z = self.calculator.calculate_impedance_adaptive(capacitances, esrs, (1e3, 1e9), esls)
+        uniform = np.logspace(3, 9, 5 * len(freqs))
+        z_uniform = self.calculator.bank_impedance_at(capacitances, esrs, uniform, esls)
+        self.assertGreater(self.max_error(uniform, z_uniform, *BANK), 0.01)
+        self.assertLess(self.max_error(freqs, z, *BANK), 0.01)
+
+    def test_budget_and_validation(self):
+        """Test max_points caps evaluations and bad settings are rejected"""
+        sweep = AdaptiveSweep(lambda f: 1 + 1 / f, max_points=40)
+        freqs, values = sweep.run((1, 1e6))
+        self.assertEqual(len(freqs), sweep.evaluations)
+        self.assertLessEqual(sweep.evaluations, 40)
+        with self.assertRaises(ValueError):
+            AdaptiveSweep(np.ones_like, tolerance=0)
+        with self.assertRaises(ValueError):
+            AdaptiveSweep(np.ones_like, initial_points=1)
+
+if __name__ == '__main__':
+    unittest.main()
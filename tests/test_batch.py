@@ -0,0 +1,122 @@
+import io
+import json
+import unittest
+from src.batch import BatchRunner, read_jobs, write_results
+from src.calculator import DecapCalculator
+
+class TestBatchRunner(unittest.TestCase):
+    def setUp(self):
+        self.calculator = DecapCalculator()
+        self.runner = BatchRunner(self.calculator, chunk_size=2)
+
+    def test_batch_matches_single_calculations(self):
+        """Test that vectorized rows agree with the scalar calculators"""
+        jobs = [
+            {"id": "a", "type": "power", "voltage": 5, "current_draw": 1,
+             "voltage_ripple_percent": 5, "switching_freq": 100000},
+            {"id": "b", "type": "power", "voltage": 12, "current_draw": 10,
+             "voltage_ripple_percent": 1, "switching_freq": 100000},
+            {"id": "c", "type": "power", "voltage": 230, "current_draw": 0.5},
+            {"id": "d", "type": "signal", "signal_freq": 50e6},
+            {"id": "e", "type": "lambda10", "frequency": 1e9},
+        ]
+        results = list(self.runner.run(jobs))
+        self.assertEqual([r["id"] for r in results], ["a", "b", "c", "d", "e"])
+
+        for job, result in zip(jobs[:3], results[:3]):
+            expected = self.calculator.calculate_power_decoupling(
+                job["voltage"], job["current_draw"], job.get("voltage_ripple_percent", 5),
+                job.get("switching_freq"))
+            for key in ("total_capacitance", "max_esr", "num_capacitors",
+                        "capacitance_per_device", "temp_derated_capacitance"):
+                self.assertAlmostEqual(result[key], expected[key])
+
+        expected = self.calculator.calculate_signal_decoupling(50e6)
+        self.assertAlmostEqual(results[3]["capacitance"], expected["capacitance"])
+        self.assertEqual(results[3]["recommended_type"], expected["recommended_type"])
+        self.assertAlmostEqual(results[4]["distance"], self.calculator.calculate_lambda10_distance(1e9))
+
+    def test_bad_rows_become_error_rows(self):
+        """Test that invalid rows are reported without stopping the run"""
+        jobs = [
+            {"type": "power", "voltage": "abc", "current_draw": 1},
+            {"type": "power", "current_draw": 1},
+            {"type": "unknown"},
+            {"type": "lambda10", "frequency": 1e8},
+        ]
+        results = list(self.runner.run(jobs))
+        self.assertIn("Invalid value", results[0]["error"])
+        self.assertIn("Missing required field", results[1]["error"])
+        self.assertIn("Unknown job type", results[2]["error"])
+        self.assertNotIn("error", results[3])
+        self.assertEqual([r["id"] for r in results], [0, 1, 2, 3])  # Numbered across chunks
+
+    def test_zero_inputs_become_error_rows(self):
+        """Test that divisions by zero give error rows, never Infinity or NaN in the output"""
+        jobs = [
+            {"type": "power", "voltage": 3.3, "current_draw": 0},
+            {"type": "power", "voltage": 0, "current_draw": 1},
+            {"type": "signal", "signal_freq": 0},
+            {"type": "power", "voltage": 3.3, "current_draw": 1},
+        ]
+        results = list(self.runner.run(jobs))
+        self.assertIn("max_esr", results[0]["error"])
+        self.assertIn("total_capacitance", results[1]["error"])
+        self.assertIn("capacitance", results[2]["error"])
+        self.assertNotIn("max_esr", results[0])
+        self.assertNotIn("error", results[3])
+
+        out = io.StringIO()
+        write_results(results, out, "jsonl")
+        for line in out.getvalue().splitlines():
+            json.loads(line, parse_constant=lambda name: self.fail(f"{name} in output"))
+
+    def test_streams_lazily(self):
+        """Test that results are produced before the whole input is consumed"""
+        consumed = []
+
+        def jobs():
+            for i in range(10):
+                consumed.append(i)
+                yield {"type": "lambda10", "frequency": 1e6 * (i + 1)}
+
+        first = next(self.runner.run(jobs()))
+        self.assertIn("distance", first)
+        self.assertEqual(len(consumed), 2)  # One chunk
+
+    def test_csv_round_trip(self):
+        """Test reading CSV jobs and writing CSV and JSON-lines results"""
+        source = io.StringIO(
+            "id,type,voltage,current_draw,signal_freq\n"
+            "r1,power,3.3,2,\n"
+            "r2,signal,,,1e8\n"
+        )
+        results = list(self.runner.run(read_jobs(source, "csv")))
+
+        out = io.StringIO()
+        self.assertEqual(write_results(results, out, "csv"), 2)
+        lines = out.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith("id,type,error"))
+        self.assertTrue(lines[1].startswith("r1,power,,"))
+
+        out = io.StringIO()
+        write_results(results, out, "jsonl")
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(rows[1]["recommended_type"], "RF Ceramic")
+
+    def test_broken_jsonl_lines_become_error_rows(self):
+        """Test that unparsable JSON lines are reported and the run continues"""
+        source = io.StringIO(
+            '{"id": "a", "type": "lambda10", "frequency": 1e6}\n'
+            '{"id": "b", "type": "lambda10", "frequency": \n'
+            '[1, 2]\n'
+            '{"id": "c", "type": "lambda10", "frequency": 2e6}\n'
+        )
+        results = list(self.runner.run(read_jobs(source, "jsonl")))
+
+        self.assertEqual(len(results), 4)
+        self.assertIn("distance", results[0])
+        self.assertIn("Line 2: invalid JSON", results[1]["error"])
+        self.assertIn("Line 3: expected a JSON object", results[2]["error"])
+        self.assertEqual(results[3]["id"], "c")
+        self.assertIn("distance", results[3])
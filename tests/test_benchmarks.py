@@ -0,0 +1,54 @@
+import unittest
+from benchmarks.bench import compare, e_series, run_case, search_cases, sweep_cases
+
+class TestBenchmarks(unittest.TestCase):
+    def test_e_series_libraries(self):
+        """Test synthetic library sizes and ranges"""
+        library = e_series(96, 2)
+        self.assertEqual(len(library), 192)
+        self.assertAlmostEqual(min(library), 1e-7)
+        self.assertLess(max(library), 1e-5)
+
+    def test_grid_names_are_unique(self):
+        """Test that every case in the grid can be matched against a baseline"""
+        names = [case["name"] for case in search_cases() + sweep_cases()]
+        self.assertEqual(len(names), len(set(names)))
+
+    def test_run_case_reports_metrics(self):
+        """Test that a small case records runtime, memory, nodes and results"""
+        case = next(c for c in search_cases() if c["name"] == "series/E12x3/k3")
+        result = run_case(case, repeat=1)
+        self.assertGreater(result["seconds"], 0)
+        self.assertGreater(result["peak_bytes"], 0)
+        self.assertGreater(result["nodes"], 0)
+        self.assertGreater(result["results"], 0)
+
+    def test_compare_flags_regressions(self):
+        """Test node, result and runtime regression checks"""
+        baseline = {"results": [
+            {"name": "a", "seconds": 0.010, "nodes": 100, "results": 5},
+            {"name": "b", "seconds": 0.001, "nodes": None, "results": 10},
+        ]}
+        same = [dict(r) for r in baseline["results"]]
+        self.assertEqual(compare(same, baseline), [])
+
+        slower = [{"name": "a", "seconds": 0.050, "nodes": 101, "results": 4},
+                  {"name": "b", "seconds": 0.003, "nodes": None, "results": 10}]
+        failures = compare(slower, baseline, threshold=2.0, min_delta=0.005)
+        self.assertEqual(len(failures), 3)  # Nodes, results and runtime for "a"; "b" is noise
+        self.assertTrue(all(f.startswith("a:") for f in failures))
+
+    def test_compare_flags_memory_regressions(self):
+        """Test that peak memory beyond the ratio and delta fails, small growth does not"""
+        common = {"seconds": 0.01, "nodes": 10, "results": 1}
+        baseline = {"results": [dict(common, name="a", peak_bytes=1_000_000),
+                                dict(common, name="b", peak_bytes=10_000)]}
+        grown = [dict(common, name="a", peak_bytes=2_000_000), dict(common, name="b", peak_bytes=30_000)]
+        failures = compare(grown, baseline)
+        self.assertEqual(len(failures), 1)
+        self.assertIn("a: peak", failures[0])
+
+    def test_table_tails_count_nodes(self):
+        """Test that searches answered from the pair and triple tables still count their work"""
+        case = next(c for c in search_cases() if c["name"] == "parallel/E24x3/k3")
+        self.assertGreater(run_case(case, repeat=1)["nodes"], 1)
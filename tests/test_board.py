@@ -0,0 +1,113 @@
+import time
+import unittest
+import numpy as np
+from src.board import Board
+from src.calculator import DecapCalculator
+from src.optimizer import PDNOptimizer
+
+PARTS = [
+    {"name": "bulk", "capacitance": 100e-6, "esr": 0.01, "esl": 2e-9, "cost": 0.50},
+    {"name": "mid", "capacitance": 10e-6, "esr": 0.005, "esl": 0.8e-9, "cost": 0.08},
+    {"name": "hf", "capacitance": 1e-6, "esr": 0.01, "esl": 0.4e-9, "cost": 0.02},
+    {"name": "rf", "capacitance": 100e-9, "esr": 0.02, "esl": 0.3e-9, "cost": 0.01},
+]
+
+class TestBoard(unittest.TestCase):
+    def setUp(self):
+        self.board = Board(PARTS, (1e4, 1e8), points=100)
+        self.board.add_rail("VIN", 12.0, 0.5)
+        self.board.add_rail("3V3", 3.3, 1.0, source="VIN", efficiency=0.9, bank={"mid": 4})
+        self.board.add_rail("1V8", 1.8, 0.5, source="3V3", bank={"hf": 2, "rf": 2})
+
+    def test_results_match_direct_calculation(self):
+        """Test rail loads through regulators, sizing and bank impedance"""
+        results = self.board.evaluate()
+        # 1V8 is linear off 3V3; 3V3 is a 90% switcher off VIN
+        self.assertAlmostEqual(results["3V3"]["load_current"], 1.5)
+        self.assertAlmostEqual(results["VIN"]["load_current"], 0.5 + 1.5 * 3.3 / (12 * 0.9))
+
+        calculator = DecapCalculator()
+        sizing = calculator.calculate_power_decoupling(3.3, 1.5)
+        self.assertEqual({k: results["3V3"][k] for k in sizing}, sizing)
+        optimizer = PDNOptimizer(PARTS, (1e4, 1e8), points=100)
+        impedance = optimizer.bank_impedance([0, 0, 2, 2])
+        self.assertAlmostEqual(results["1V8"]["max_impedance"], impedance.max())
+        self.assertEqual(results["1V8"]["compliant"],
+                         bool((impedance <= calculator.calculate_target_impedance(1.8, 0.5)).all()))
+        self.assertAlmostEqual(results["1V8"]["bank_cost"], 0.06)
+        self.assertFalse(results["VIN"]["compliant"])  # Empty bank
+
+    def test_edits_recompute_only_affected_rails(self):
+        """Test load, bank and part edits invalidate only what depends on them"""
+        self.board.evaluate()
+        self.board.recomputed.clear()
+        self.board.set_rail("1V8", current_draw=1.0)
+        self.board.evaluate()
+        self.assertEqual(self.board.recomputed, {"load": 3, "result": 3})  # 1V8 and its upstream rails
+
+        self.board.recomputed.clear()
+        self.board.set_bank("3V3", {"mid": 2, "hf": 4})
+        results = self.board.evaluate()
+        self.assertEqual(self.board.recomputed, {"bank": 1, "result": 1})
+        self.assertAlmostEqual(results["3V3"]["load_current"], 2.0)
+
+        self.board.recomputed.clear()
+        self.board.update_part("rf", esr=0.05)
+        results = self.board.evaluate()
+        self.assertEqual(self.board.recomputed, {"bank": 1, "result": 1})  # Only 1V8 uses rf
+        expected = Board(self.board.parts, (1e4, 1e8), points=100)
+        expected.add_rail("1V8", 1.8, 1.0, bank={"hf": 2, "rf": 2})
+        self.assertAlmostEqual(results["1V8"]["max_impedance"], expected.evaluate()["1V8"]["max_impedance"])
+
+    def test_shared_grid_cache(self):
+        """Test rails on the same grid share one evaluated library"""
+        self.board.add_rail("LF", 5.0, 0.2, freq_range=(1e3, 1e6), points=50)
+        self.assertIs(self.board.rails["3V3"]["grid"], self.board.rails["1V8"]["grid"])
+        self.assertEqual(len(self.board._grids), 2)
+        self.assertEqual(self.board.rails["LF"]["grid"].frequencies.shape, (50,))
+
+    def test_topology_edits_and_validation(self):
+        """Test re-sourcing, removal, cycles and unknown names"""
+        self.board.set_rail("1V8", source="VIN")
+        results = self.board.evaluate()
+        self.assertAlmostEqual(results["3V3"]["load_current"], 1.0)
+        self.assertAlmostEqual(results["VIN"]["load_current"], 1.0 + 3.3 / (12 * 0.9))
+        self.board.remove_rail("1V8")
+        self.assertAlmostEqual(self.board.evaluate()["VIN"]["load_current"], 0.5 + 3.3 / (12 * 0.9))
+
+        with self.assertRaises(ValueError):
+            self.board.set_rail("VIN", source="3V3")
+        with self.assertRaises(ValueError):
+            self.board.set_bank("3V3", {"tantalum": 1})
+        with self.assertRaises(ValueError):
+            self.board.add_rail("3V3", 3.3, 1.0)
+        with self.assertRaises(ValueError):
+            self.board.add_rail("X", 1.0, 1.0, source="nowhere")
+        self.assertNotIn("X", self.board.rails)
+        with self.assertRaises(ValueError):
+            Board([{"capacitance": 1e-6, "esr": 0.01}])
+
+    def test_optimize_rail(self):
+        """Test optimizing one rail installs a compliant bank from the shared library"""
+        result = self.board.optimize_rail("1V8")
+        self.assertTrue(result["compliant"])
+        evaluated = self.board.evaluate(["1V8"])["1V8"]
+        self.assertTrue(evaluated["compliant"])
+        self.assertAlmostEqual(evaluated["bank_cost"], result["total_cost"])
+
+    def test_one_rail_edit_on_large_board(self):
+        """Test re-evaluating a one-rail change on a 100-rail board is fast"""
+        board = Board(PARTS, (1e3, 1e9), points=200)
+        board.add_rail("VIN", 12.0, 0.5)
+        for rail in range(100):
+            board.add_rail(f"R{rail}", 0.8 + rail / 100, 1 + rail % 5, 3, 1e6,
+                           bank={"mid": 4, "hf": 8}, source="VIN", efficiency=0.9)
+        board.evaluate()
+        start = time.perf_counter()
+        board.set_rail("R42", current_draw=3.5)
+        board.evaluate()
+        self.assertLess(time.perf_counter() - start, 0.1)
+        self.assertEqual(board.recomputed["result"], 103)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,4 @@
+import math
 import unittest
 from src.calculator import DecapCalculator
 
@@ -114,4 +115,54 @@ class TestDecapCalculator(unittest.TestCase):
         derated_cap = self.calculator.calculate_temperature_derating(
             100e-6, 'X7R', (-55, 125)
         )
-        self.assertGreater(derated_cap, 0)
\ No newline at end of file
+        self.assertGreater(derated_cap, 0)
+
+    def test_impedance_matrix_shape(self):
+        """Test batched impedance sweep over several capacitors"""
+        caps = [100e-6, 1e-6, 100e-9]
+        esrs = [0.05, 0.01, 0.02]
+        esls = [2e-9, 0.5e-9, 0.4e-9]
+        freqs, z = self.calculator.calculate_impedance_matrix(
+            caps, esrs, (1e3, 1e9), points=500, esls=esls
+        )
+
+        self.assertEqual(freqs.shape, (500,))
+        self.assertEqual(z.shape, (3, 500))
+        self.assertAlmostEqual(freqs[0], 1e3)
+        self.assertAlmostEqual(freqs[-1], 1e9, delta=1)
+
+        # Impedance never drops below ESR and bottoms out at the SRF
+        for row, esr, cap, esl in zip(z, esrs, caps, esls):
+            self.assertTrue((row >= esr * (1 - 1e-12)).all())
+            srf = 1 / (2 * math.pi * math.sqrt(cap * esl))
+            self.assertAlmostEqual(freqs[row.argmin()], srf, delta=srf * 0.05)
+
+    def test_impedance_matrix_matches_scalar_model(self):
+        """Test batched sweep against the closed-form single capacitor model"""
+        freqs, z = self.calculator.calculate_impedance_matrix(
+            [10e-6, 47e-6], [0.1, 0.2], (100, 1e6), points=50
+        )
+        for row, cap, esr in zip(z, [10e-6, 47e-6], [0.1, 0.2]):
+            for freq, value in zip(freqs, row):
+                xc = 1 / (2 * math.pi * freq * cap)
+                self.assertAlmostEqual(value, math.sqrt(esr**2 + xc**2))
+
+    def test_signal_decoupling_plan_matches_scalar(self):
+        """Test the bulk planner gives every net its scalar signal decoupling result"""
+        freqs = [25e6, 100e6, 25e6, 500e3, 100e6, 25e6]
+        impedances = [50, 50, 50, 75, 100, 50]
+        plan = self.calculator.plan_signal_decoupling(freqs, impedances, 0.1)
+
+        self.assertEqual(plan["group"].tolist(), [0, 1, 0, 2, 3, 0])
+        for i, (freq, impedance) in enumerate(zip(freqs, impedances)):
+            expected = self.calculator.calculate_signal_decoupling(freq, impedance, 0.1)
+            for key, value in expected.items():
+                self.assertEqual(plan[key][i], value)
+
+    def test_impedance_vs_frequency_with_esl(self):
+        """Test that ESL raises impedance above the self-resonant frequency"""
+        ideal = self.calculator.calculate_impedance_vs_frequency(1e-6, 0.01, (1e6, 1e9))
+        real = self.calculator.calculate_impedance_vs_frequency(1e-6, 0.01, (1e6, 1e9), esl=1e-9)
+
+        self.assertIsInstance(real[0][0], float)
+        self.assertGreater(real[-1][1], 10 * ideal[-1][1])
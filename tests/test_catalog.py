@@ -0,0 +1,152 @@
+import io
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.calculator import DecapCalculator
+from src.catalog import CapacitorCatalog, parse_quantity
+from src.combinations import CapacitorCombinations
+
+CATALOG_CSV = """MPN,Value,Voltage,TC,Case,ESR,ESL,Price
+GRM155R71A105,1uF,10V,X7R,0402,25mΩ,0.4nH,0.010
+GRM155R71A225,2.2uF,10V,X7R,0402,20mΩ,0.4nH,0.015
+GRM155R60J475,4.7µF,6.3V,X5R,0402,15mΩ,0.4nH,0.020
+GRM188R71A475,4.7uF,10V,X7R,0603,12mΩ,0.6nH,0.030
+GRM155R70J106,10uF,6.3,X7R,0402,10mΩ,0.4nH,0.045
+GRM1555C1H101,100pF,50V,C0G,0402,,,0.005
+EEE-FK1V101,100uF,35V,Al-Elec,6.3x7.7,0.3,5nH,
+"""
+
+def random_catalog(count, seed=0):
+    """Synthetic catalog plus its raw columns for brute-force checks"""
+    rng = np.random.default_rng(seed)
+    dielectrics, packages = ['C0G', 'X5R', 'X7R'], ['0201', '0402', '0603', '0805']
+    d = rng.integers(0, len(dielectrics), count)
+    p = rng.integers(0, len(packages), count)
+    columns = {"capacitance": np.round(10 ** rng.uniform(-11, -4, count), 14),
+               "voltage_rating": rng.choice([4, 6.3, 10, 16, 25, 50], count),
+               "esr": rng.uniform(0.001, 0.1, count), "price": rng.uniform(0.001, 0.5, count)}
+    catalog = CapacitorCatalog([f"P{i}" for i in range(count)], columns, d, dielectrics, p, packages)
+    return catalog, columns, np.array(dielectrics)[d], np.array(packages)[p]
+
+class TestCapacitorCatalog(unittest.TestCase):
+    def setUp(self):
+        self.catalog = CapacitorCatalog.from_csv(io.StringIO(CATALOG_CSV))
+
+    def test_parse_quantity(self):
+        """Test SI-prefixed values with and without units"""
+        self.assertAlmostEqual(parse_quantity("4.7uF"), 4.7e-6)
+        self.assertAlmostEqual(parse_quantity("4.7 µF"), 4.7e-6)
+        self.assertAlmostEqual(parse_quantity("25mΩ"), 0.025)
+        self.assertAlmostEqual(parse_quantity("6.3V"), 6.3)
+        self.assertAlmostEqual(parse_quantity("1e-6"), 1e-6)
+        with self.assertRaises(ValueError):
+            parse_quantity("ten")
+
+    def test_ingest(self):
+        """Test CSV ingest with vendor headers, units and blank fields"""
+        self.assertEqual(len(self.catalog), 7)
+        self.assertEqual(self.catalog.dielectrics, ['X7R', 'X5R', 'C0G', 'Al-Elec'])
+        parts = self.catalog.parts()
+        self.assertEqual(parts[0]["name"], "GRM155R71A105")
+        self.assertAlmostEqual(parts[0]["esl"], 0.4e-9)
+        self.assertNotIn("esr", parts[5])
+        self.assertNotIn("cost", parts[6])
+        with self.assertRaises(ValueError):
+            CapacitorCatalog.from_csv(io.StringIO("MPN,Value\nA,lots\n"))
+
+    def test_filtered_query(self):
+        """Test a dielectric, voltage, package and capacitance range query"""
+        result = self.catalog.query(dielectric="X7R", min_voltage=6.3, package="0402",
+                                    min_capacitance=1e-6, max_capacitance=10e-6)
+        self.assertEqual([p["name"] for p in result.parts()],
+                         ["GRM155R71A105", "GRM155R71A225", "GRM155R70J106"])
+        self.assertEqual(len(self.catalog.query(dielectric="NP0")), 0)
+        self.assertEqual(len(self.catalog.query(min_voltage=100)), 0)
+
+    def test_query_matches_brute_force(self):
+        """Test indexed queries against a full scan of the columns"""
+        catalog, columns, dielectrics, packages = random_catalog(5000)
+        queries = [
+            {"dielectric": "X7R", "package": "0402", "min_voltage": 6.3,
+             "min_capacitance": 1e-6, "max_capacitance": 10e-6},
+            {"dielectric": ["X5R", "X7R"], "max_voltage": 10},
+            {"package": "0805", "max_esr": 0.02, "max_price": 0.1},
+            {"min_voltage": 25, "max_voltage": 25},
+            {"min_capacitance": 1e-9, "max_capacitance": 1e-9},
+            {},
+        ]
+        for query in queries:
+            with self.subTest(query=query):
+                mask = np.ones(5000, dtype=bool)
+                for name, column in (("dielectric", dielectrics), ("package", packages)):
+                    if name in query:
+                        mask &= np.isin(column, [query[name]] if isinstance(query[name], str) else query[name])
+                for key, name, op in (("min_voltage", "voltage_rating", np.greater_equal),
+                                      ("max_voltage", "voltage_rating", np.less_equal),
+                                      ("min_capacitance", "capacitance", np.greater_equal),
+                                      ("max_capacitance", "capacitance", np.less_equal),
+                                      ("max_esr", "esr", np.less_equal), ("max_price", "price", np.less_equal)):
+                    if key in query:
+                        mask &= op(columns[name], query[key])
+                expected = np.flatnonzero(mask)
+                expected = expected[np.argsort(columns["capacitance"][expected], kind='stable')]
+                np.testing.assert_array_equal(catalog.query_rows(**query), expected)
+
+    def test_feeds_finders_and_calculator(self):
+        """Test query results plug into the combination finders and power decoupling"""
+        x7r = self.catalog.query(dielectric="X7R")
+        self.assertEqual(CapacitorCombinations.find_parallel_combination(3.2e-6, x7r, 2, 0.05),
+                         CapacitorCombinations.find_parallel_combination(3.2e-6, x7r.values(), 2, 0.05))
+        self.assertIn([1e-6, 2.2e-6], CapacitorCombinations.find_parallel_combination(3.2e-6, x7r, 2, 0.05))
+
+        result = DecapCalculator().calculate_power_decoupling(3.3, 0.5, 5, 1e6, catalog=self.catalog)
+        names = [p["name"] for p in result["suggested_parts"]]
+        # 4.5 µF per device at >= 4.95 V, cheapest first, unpriced last
+        self.assertEqual(names, ["GRM155R60J475", "GRM188R71A475", "GRM155R70J106", "EEE-FK1V101"])
+        self.assertNotIn("suggested_parts", DecapCalculator().calculate_power_decoupling(3.3, 0.5, 5, 1e6))
+
+    def test_cheapest_matches_brute_force(self):
+        """Test per-requirement part matching against a full scan"""
+        catalog, columns, _, _ = random_catalog(2000, seed=3)
+        catalog.columns["esl"] = np.random.default_rng(3).uniform(0.2e-9, 1e-9, 2000)
+        catalog.columns["esl"][::7] = np.nan
+        srf = catalog.srf()
+        caps = 10 ** np.random.default_rng(4).uniform(-12, -5, 300)
+        srfs = 10 ** np.random.default_rng(5).uniform(6, 10, 300)
+        rows = catalog.cheapest_matches(caps, srfs, block_size=50_000)
+        for row, c, f in zip(rows, caps, srfs):
+            ok = np.flatnonzero((columns["capacitance"] >= c) & (srf >= f))
+            self.assertEqual(row, ok[np.argmin(columns["price"][ok])] if len(ok) else -1)
+
+    def test_signal_decoupling_plan(self):
+        """Test nets sharing a requirement get one group and the cheapest adequate part"""
+        plan = DecapCalculator().plan_signal_decoupling([50e6, 1e6, 50e6, 5e9], [50, 50, 50, 50],
+                                                        catalog=self.catalog)
+        self.assertEqual(plan["group"].tolist(), [0, 1, 0, 2])
+        # 50 MHz needs 1.27 nF with SRF >= 150 MHz: the parts large enough resonate below 8 MHz and
+        # the 100 pF part has no ESL; 1 MHz needs 64 nF with SRF >= 3 MHz, met by the cheapest 1 µF part
+        self.assertEqual(plan["part_number"].tolist(), ["", "GRM155R71A105", "", ""])
+        self.assertEqual(plan["part_row"].tolist(), [-1, 0, -1, -1])
+        self.assertTrue(np.isnan(plan["part_srf"][0]))
+        self.assertGreaterEqual(plan["part_srf"][1], plan["min_srf"][1])
+
+        # An empty filtered catalog leaves every group unmatched instead of failing the gather
+        empty = self.catalog.query(dielectric="C0G", min_voltage=100)
+        plan = DecapCalculator().plan_signal_decoupling([50e6, 1e6], catalog=empty)
+        self.assertEqual(plan["part_row"].tolist(), [-1, -1])
+        self.assertEqual(plan["part_number"].tolist(), ["", ""])
+        self.assertTrue(np.isnan(plan["part_srf"]).all())
+        self.assertTrue(np.isnan(plan["part_price"]).all())
+
+    def test_save_and_load(self):
+        """Test the columnar store round-trips through .npz"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "catalog.npz")
+            self.catalog.save(path)
+            loaded = CapacitorCatalog.load(path)
+        self.assertEqual(loaded.parts(), self.catalog.parts())
+        self.assertEqual(len(loaded.query(dielectric="X7R", package="0402")), 3)
+
+if __name__ == '__main__':
+    unittest.main()
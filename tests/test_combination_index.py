@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+from src.combination_index import CombinationIndex
+from src.combinations import CapacitorCombinations
+
+class TestCombinationIndex(unittest.TestCase):
+    def setUp(self):
+        self.library = [1e-6, 2.2e-6, 4.7e-6, 10e-6, 22e-6, 47e-6]
+        self.index = CombinationIndex.build(self.library, max_components=3)
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_enumerates_all_combinations(self):
+        """Test that every multiset of up to three parts is indexed"""
+        # C(6,1) + C(7,2) + C(8,3) combinations with repetition
+        self.assertEqual(len(self.index.values['parallel']), 6 + 21 + 56)
+        self.assertEqual(len(self.index.values['series']), 6 + 21 + 56)
+
+    def test_lookups_agree_with_finders(self):
+        """Test that index hits are a superset of the recursive finder results"""
+        for target in (79e-6, 14.7e-6, 5e-6, 1.5e-6):
+            with self.subTest(target=target):
+                parallel = self.index.find_parallel(target)
+                for combo in CapacitorCombinations.find_parallel_combination(target, self.library):
+                    self.assertIn(combo, parallel)
+                for combo in parallel:
+                    self.assertLess(abs(sum(combo) - target), target * 0.01)
+
+                series = self.index.find_series(target)
+                for combo in CapacitorCombinations.find_series_combination(target, self.library):
+                    self.assertIn(sorted(combo), series)
+
+    def test_save_and_memory_map(self):
+        """Test that a saved index loads memory-mapped with identical answers"""
+        self.index.save(self.tmpdir.name)
+        loaded = CombinationIndex.load(self.tmpdir.name, self.library)
+
+        self.assertIsNotNone(getattr(loaded.values['parallel'], 'filename', None))
+        self.assertEqual(loaded.find_parallel(79e-6), self.index.find_parallel(79e-6))
+        self.assertEqual(loaded.find_series(5e-6), self.index.find_series(5e-6))
+
+    def test_stale_index_is_rejected_and_rebuilt(self):
+        """Test invalidation when the library changes"""
+        self.index.save(self.tmpdir.name)
+        changed = self.library + [100e-6]
+
+        self.assertFalse(self.index.is_current(changed))
+        with self.assertRaises(ValueError):
+            CombinationIndex.load(self.tmpdir.name, changed)
+
+        rebuilt = CombinationIndex.open_or_build(self.tmpdir.name, changed)
+        self.assertTrue(rebuilt.is_current(changed))
+        self.assertIn([100e-6], rebuilt.find_parallel(100e-6))
+        self.assertTrue(os.path.exists(os.path.join(self.tmpdir.name, 'index.json')))
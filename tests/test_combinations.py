@@ -1,3 +1,4 @@
+import time
 import unittest
 from src.combinations import CapacitorCombinations
 
@@ -93,4 +94,60 @@ class TestCapacitorCombinations(unittest.TestCase):
         combinations = self.combinations.find_series_combination(
             100e-6, [10e-6, 20e-6], max_components=2
         )
-        self.assertEqual(len(combinations), 0)
\ No newline at end of file
+        self.assertEqual(len(combinations), 0)
+
+    def test_iter_parallel_combination_streams(self):
+        """Test that the streaming finder yields the same set lazily"""
+        available = [1e-6, 2.2e-6, 4.7e-6, 10e-6, 22e-6]
+        stream = self.combinations.iter_parallel_combination(15e-6, available, tolerance=0.05)
+        first = next(stream)
+        self.assertLess(abs(sum(first) - 15e-6), 15e-6 * 0.05)
+
+        streamed = sorted([first] + list(stream))
+        self.assertEqual(streamed, sorted(
+            self.combinations.find_parallel_combination(15e-6, available, tolerance=0.05)))
+
+    def test_top_k_orders_by_error_then_parts(self):
+        """Test top_k ranking with a bounded heap"""
+        available = [1e-6, 2.2e-6, 4.7e-6, 10e-6, 22e-6]
+        best = self.combinations.top_parallel_combinations(
+            16e-6, available, top_k=3, max_components=4, tolerance=0.1)
+
+        self.assertEqual(len(best), 3)
+        keys = [(abs(sum(c) - 16e-6), len(c)) for c in best]
+        self.assertEqual(keys, sorted(keys))
+
+        series_best = self.combinations.top_series_combinations(
+            5e-6, [10e-6, 22e-6, 4.7e-6], top_k=1, tolerance=0.1)
+        self.assertEqual(series_best, [[10e-6, 10e-6]])
+
+    def test_node_budget_stops_search(self):
+        """Test that a node budget returns the best results found so far"""
+        available = [round(10 ** (i / 96), 2) * 1e-6 for i in range(96)]
+        unlimited = self.combinations.top_parallel_combinations(
+            4.7e-6, available, top_k=5, max_components=4)
+        limited = self.combinations.top_parallel_combinations(
+            4.7e-6, available, top_k=5, max_components=4, max_nodes=20)
+
+        self.assertLessEqual(len(limited), 5)
+        for combo in limited:
+            self.assertLess(abs(sum(combo) - 4.7e-6), 4.7e-6 * 0.01)
+        self.assertEqual(len(unlimited), 5)
+
+    def test_time_budget(self):
+        """Test that a wall-clock budget bounds a large search"""
+        available = [round(10 ** (i / 192), 3) * 10 ** d for d in (-7, -6, -5) for i in range(192)]
+        start = time.perf_counter()
+        best = self.combinations.top_parallel_combinations(
+            4.7e-6, available, top_k=10, max_components=6, time_limit=0.05)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertLessEqual(len(best), 10)
+
+    def test_time_budget_large_library(self):
+        """Test that a wall-clock budget holds for libraries of thousands of values"""
+        available = [round(10 ** (i / 1000), 4) * 10 ** d for d in (-8, -7, -6, -5, -4, -3) for i in range(1000)]
+        start = time.perf_counter()
+        best = self.combinations.top_parallel_combinations(
+            4.7e-6, available, top_k=10, max_components=6, time_limit=0.05)
+        self.assertLess(time.perf_counter() - start, 0.1)
+        self.assertEqual(len(best), 10)
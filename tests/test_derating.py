@@ -0,0 +1,122 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.calculator import DecapCalculator
+from src.combinations import CapacitorCombinations
+from src.derating import DeratingLibrary
+
+def write_table(path, rows):
+    with open(path, "w") as f:
+        f.write("dielectric,package,voltage,temperature,ratio\n")
+        for row in rows:
+            f.write(",".join(str(x) for x in row) + "\n")
+
+class TestDeratingLibrary(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "derating.csv")
+        write_table(self.path, [
+            ("X7R", "0402", 0, 25, 1.0), ("X7R", "0402", 0, 85, 0.9),
+            ("X7R", "0402", 10, 25, 0.5), ("X7R", "0402", 10, 85, 0.4),
+            ("C0G", "0402", 0, 25, 1.0), ("C0G", "0402", 0, 125, 0.99),
+            ("C0G", "0402", 50, 25, 1.0), ("C0G", "0402", 50, 125, 0.99),
+        ])
+        self.library = DeratingLibrary.from_csv(self.path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_grid_points_and_bilinear_interpolation(self):
+        """Test exact values at grid points and bilinear values between them"""
+        ratio = self.library.ratio("X7R", [0, 10, 5, 5], [25, 85, 25, 55], "0402")
+        np.testing.assert_allclose(ratio, [1.0, 0.4, 0.75, 0.7])
+        # C0G has a different grid; the shared grid must not change its surface
+        np.testing.assert_allclose(self.library.ratio("C0G", [10, 25], [85, 75], "0402"),
+                                   [0.994, 0.995])
+
+    def test_clamped_outside_grid(self):
+        """Test queries beyond the table edges use the edge values"""
+        np.testing.assert_allclose(self.library.ratio("X7R", [-5, 100], [0, 200], "0402"), [1.0, 0.4])
+
+    def test_vectorized_mixed_parts(self):
+        """Test per-part dielectric lists match one-at-a-time queries"""
+        rng = np.random.default_rng(1)
+        dielectrics = ["X7R", "C0G"] * 500
+        volts = rng.uniform(0, 60, 1000)
+        temps = rng.uniform(-20, 150, 1000)
+        batch = self.library.ratio(dielectrics, volts, temps, "0402")
+        single = [float(self.library.ratio(d, v, t, "0402")) for d, v, t in zip(dielectrics, volts, temps)]
+        np.testing.assert_allclose(batch, single)
+
+    def test_package_list_with_scalar_voltage(self):
+        """Test a per-part package list with one dielectric and one voltage derates every part"""
+        library = DeratingLibrary.load()
+        packages = ["0201", "1210", "0402"]
+        ratio = library.ratio("X7R", 3.3, 25, packages)
+        single = [float(library.ratio("X7R", 3.3, 25, p)) for p in packages]
+        np.testing.assert_allclose(ratio, single)
+        self.assertGreater(single[1], single[0])
+        np.testing.assert_allclose(library.derate([1e-6] * 3, "X7R", 3.3, 25, packages),
+                                   np.array(single) * 1e-6)
+        with self.assertRaises(ValueError):
+            library.ratio(["X7R", "X5R"], 3.3, 25, packages)
+
+    def test_worst_ratio_over_range(self):
+        """Test the worst case over a temperature range per bias voltage"""
+        np.testing.assert_allclose(self.library.worst_ratio("X7R", [0, 10], (25, 55), "0402"), [0.95, 0.45])
+
+    def test_load_is_cached(self):
+        """Test repeated loads reuse the parsed tables and unknown parts raise"""
+        self.assertIs(DeratingLibrary.load(self.path), DeratingLibrary.load(self.path))
+        self.assertIs(DeratingLibrary.load(), DeratingLibrary.load())
+        with self.assertRaises(ValueError):
+            self.library.ratio("X7R", 0, 25, "2220")
+
+    def test_incomplete_grid(self):
+        """Test a table with missing grid points is rejected"""
+        write_table(self.path, [("X7R", "0402", 0, 25, 1.0), ("X7R", "0402", 10, 85, 0.4)])
+        with self.assertRaises(ValueError):
+            DeratingLibrary.from_csv(self.path)
+
+class TestDeratedCalculations(unittest.TestCase):
+    def setUp(self):
+        self.calculator = DecapCalculator()
+
+    def test_power_decoupling_bias_derating(self):
+        """Test rail voltage reduces the effective MLCC capacitance"""
+        low = self.calculator.calculate_power_decoupling(1.0, 1.0, 5, 100e3)
+        high = self.calculator.calculate_power_decoupling(12.0, 1.0, 5, 100e3)
+        for result in (low, high):
+            self.assertLess(result["bias_derated_capacitance"], result["total_capacitance"])
+            self.assertGreater(result["required_nominal_capacitance"], result["total_capacitance"])
+        self.assertLess(high["bias_derated_capacitance"] / high["total_capacitance"],
+                        low["bias_derated_capacitance"] / low["total_capacitance"])
+
+        batch = self.calculator.calculate_power_decoupling_batch([1.0, 12.0], [1.0, 1.0], 5, [100e3, 100e3])
+        np.testing.assert_allclose(batch["bias_derated_capacitance"],
+                                   [low["bias_derated_capacitance"], high["bias_derated_capacitance"]])
+
+    def test_temperature_derating_follows_range(self):
+        """Test temperature derating depends on the actual temperature range"""
+        mild = self.calculator.calculate_temperature_derating(1e-6, "X7R", (25, 50))
+        hot = self.calculator.calculate_temperature_derating(1e-6, "X7R", (25, 125))
+        self.assertGreater(mild, hot)
+        self.assertAlmostEqual(self.calculator.calculate_dc_bias_derating(1e-6, "C0G", 25.0), 1e-6)
+
+    def test_derated_parallel_combination(self):
+        """Test combination search against effective capacitance at bias"""
+        values = [1e-6, 2.2e-6, 3.3e-6, 4.7e-6, 10e-6, 22e-6]
+        nominal = CapacitorCombinations.find_parallel_combination(10e-6, values, 2, 0.05)
+        derated = CapacitorCombinations.find_derated_parallel_combination(10e-6, values, 5.0,
+                                                                          max_components=2, tolerance=0.05)
+        self.assertIn([10e-6], nominal)
+        self.assertTrue(derated)
+        self.assertNotIn([10e-6], derated)
+        ratio = self.calculator.derating.ratio("X7R", 5.0)
+        for combo in derated:
+            self.assertLessEqual(sum(combo) * ratio, 10e-6 * (1 + 1e-9))
+            self.assertGreater(sum(combo) * ratio, 10e-6 * 0.95)
+
+if __name__ == '__main__':
+    unittest.main()
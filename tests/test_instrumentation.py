@@ -0,0 +1,89 @@
+import io
+import unittest
+from src.calculator import DecapCalculator
+from src.combinations import CapacitorCombinations
+from src.instrumentation import Profiler, active_profiler, current_search_stats, instrumented
+
+E12 = [v * 10 ** e for e in (-7, -6, -5) for v in (1.0, 1.2, 1.5, 1.8, 2.2, 2.7, 3.3, 3.9, 4.7, 5.6, 6.8, 8.2)]
+
+class TestInstrumentation(unittest.TestCase):
+    def test_disabled_by_default(self):
+        """Test instrumented calls record nothing outside a profiler"""
+        self.assertIsNone(active_profiler())
+        self.assertIsNone(current_search_stats())
+        with Profiler() as profiler:
+            pass
+        DecapCalculator().calculate_power_decoupling(3.3, 1.0, 5, 100e3)
+        self.assertEqual(len(profiler.records), 0)
+        self.assertIsNone(active_profiler())
+
+    def test_results_unchanged(self):
+        """Test profiling does not change search results"""
+        plain = CapacitorCombinations.find_parallel_combination(4.7e-6, E12, 3)
+        with Profiler():
+            profiled = CapacitorCombinations.find_parallel_combination(4.7e-6, E12, 3)
+        self.assertEqual(plain, profiled)
+
+    def test_search_counters(self):
+        """Test searches fill in node, prune, emit and depth counters"""
+        with Profiler() as profiler:
+            found = CapacitorCombinations.find_parallel_combination(4.7e-6, E12, 4)
+            CapacitorCombinations.find_series_combination(2.2e-6, E12, 3)
+        parallel = profiler.stats["CapacitorCombinations.find_parallel_combination"]
+        series = profiler.stats["CapacitorCombinations.find_series_combination"]
+        self.assertEqual(parallel.calls, 1)
+        self.assertEqual(parallel.emitted, len(found))
+        for stats in (parallel, series):
+            self.assertGreater(stats.nodes, 0)
+            self.assertGreater(stats.pruned, 0)
+            self.assertGreaterEqual(stats.peak_depth, 1)
+            self.assertGreater(stats.total_time, 0)
+
+    def test_nested_calls_collapse(self):
+        """Test nested calls produce collapsed stacks with self time"""
+        with Profiler() as profiler:
+            DecapCalculator().calculate_power_decoupling(3.3, 1.0, 5, 100e3)
+        self.assertEqual(set(profiler.collapsed), {
+            "DecapCalculator.calculate_power_decoupling",
+            "DecapCalculator.calculate_power_decoupling;DecapCalculator.calculate_temperature_derating",
+        })
+        outer, inner = sorted(profiler.records, key=lambda r: r.wall_time, reverse=True)
+        self.assertGreaterEqual(outer.wall_time, inner.wall_time)
+
+        out = io.StringIO()
+        profiler.dump_collapsed(out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        for line in lines:
+            path, micros = line.rsplit(" ", 1)
+            self.assertIn("calculate_power_decoupling", path)
+            self.assertGreaterEqual(int(micros), 1)
+
+    def test_report_and_records(self):
+        """Test the text report and per-call records"""
+        with Profiler(max_records=2) as profiler:
+            for _ in range(3):
+                DecapCalculator().calculate_lambda10_distance(100e6)
+        self.assertEqual(len(profiler.records), 2)
+        self.assertEqual(profiler.stats["DecapCalculator.calculate_lambda10_distance"].calls, 3)
+        report = profiler.report()
+        self.assertIn("DecapCalculator.calculate_lambda10_distance", report)
+        self.assertEqual(profiler.records[0].as_dict()["name"], "DecapCalculator.calculate_lambda10_distance")
+
+    def test_nested_profilers(self):
+        """Test the innermost profiler records and the outer one resumes"""
+        @instrumented("double")
+        def double(x):
+            return 2 * x
+
+        with Profiler() as outer:
+            double(1)
+            with Profiler() as inner:
+                self.assertEqual(double(2), 4)
+            double(3)
+        self.assertEqual(outer.stats["double"].calls, 2)
+        self.assertEqual(inner.stats["double"].calls, 1)
+        self.assertIsNone(active_profiler())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import numpy as np
+from src.montecarlo import MonteCarloAnalyzer
+
+class TestMonteCarloAnalyzer(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = MonteCarloAnalyzer(chunk_size=5_000)
+        self.parts = [
+            {"capacitance": 100e-6, "esr": 0.01, "esl": 2e-9},
+            {"capacitance": 1e-6, "esr": 0.01, "esl": 0.4e-9},
+        ]
+
+    def test_combination_statistics(self):
+        """Test sampled combination totals centre on the nominal value"""
+        result = self.analyzer.analyze_combination([2.2e-6, 2.2e-6, 0.33e-6], 4.7e-6,
+                                                   samples=50_000, dielectric='C0G')
+        self.assertAlmostEqual(result["nominal"], 4.73e-6)
+        self.assertAlmostEqual(result["mean"] / result["nominal"], 1.0, places=2)
+        values = list(result["percentiles"].values())
+        self.assertEqual(values, sorted(values))
+        self.assertGreater(result["yield"], 0.99)
+
+    def test_series_and_zero_tolerance(self):
+        """Test a series combination with no spread reproduces the nominal value"""
+        result = self.analyzer.analyze_combination([10e-6, 10e-6], 5e-6, topology='series',
+                                                   tolerance=0.0, temp_range=(25, 25),
+                                                   samples=1_000)
+        self.assertAlmostEqual(result["mean"], 5e-6)
+        self.assertAlmostEqual(result["std"], 0.0)
+        self.assertEqual(result["yield"], 1.0)
+
+    def test_yield_drops_with_tolerance(self):
+        """Test wider part tolerance and hotter boards lower the yield"""
+        tight = self.analyzer.analyze_combination([4.7e-6], 4.7e-6, spec_tolerance=0.05,
+                                                  tolerance=0.05, samples=20_000)
+        loose = self.analyzer.analyze_combination([4.7e-6], 4.7e-6, spec_tolerance=0.05,
+                                                  tolerance=0.2, temp_range=(-40, 125),
+                                                  samples=20_000)
+        self.assertGreater(tight["yield"], loose["yield"])
+
+    def test_reproducible_and_chunk_independent_of_workers(self):
+        """Test the same seed gives the same result in-process and over a pool"""
+        a = self.analyzer.analyze_combination([1e-6, 2.2e-6], 3.2e-6, samples=20_000, seed=7)
+        b = MonteCarloAnalyzer(chunk_size=5_000, workers=2).analyze_combination(
+            [1e-6, 2.2e-6], 3.2e-6, samples=20_000, seed=7)
+        c = self.analyzer.analyze_combination([1e-6, 2.2e-6], 3.2e-6, samples=20_000, seed=8)
+        self.assertEqual(a, b)
+        self.assertNotEqual(a["mean"], c["mean"])
+
+    def test_bank_percentile_curves(self):
+        """Test bank percentile curves bracket the nominal impedance"""
+        result = self.analyzer.analyze_bank(self.parts, 0.1, (1e4, 1e8), quantities=[2, 10],
+                                            points=50, samples=10_000)
+        self.assertEqual(result["frequencies"].shape, (50,))
+        low, median, high = (result["percentiles"][p] for p in (1, 50, 99))
+        self.assertTrue((low <= median).all() and (median <= high).all())
+        np.testing.assert_allclose(median, result["nominal"], rtol=0.05)
+        self.assertEqual(result["yield"], 1.0)  # Nominal peak is ~0.076 Ω
+
+        strict = self.analyzer.analyze_bank(self.parts, 0.076, (1e4, 1e8), quantities=[2, 10],
+                                            points=50, samples=10_000)
+        self.assertLess(strict["yield"], 1.0)
+        self.assertLessEqual(strict["max_impedance"][1], strict["max_impedance"][99])
+
+    def test_invalid_inputs(self):
+        """Test invalid analysis inputs"""
+        with self.assertRaises(ValueError):
+            self.analyzer.analyze_combination([1e-6], 1e-6, topology='mesh')
+        with self.assertRaises(ValueError):
+            self.analyzer.analyze_combination([1e-6], 1e-6, dielectric='NPO')
+        with self.assertRaises(ValueError):
+            self.analyzer.analyze_combination([1e-6], 1e-6, distribution='beta')
+        with self.assertRaises(ValueError):
+            self.analyzer.analyze_bank(self.parts, 0.1, (1e4, 1e8), quantities=[0, 0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import itertools
+import unittest
+import numpy as np
+from src.calculator import DecapCalculator
+from src.optimizer import PDNOptimizer
+
+class TestPDNOptimizer(unittest.TestCase):
+    def setUp(self):
+        self.parts = [
+            {"name": "bulk", "capacitance": 100e-6, "esr": 0.01, "esl": 2e-9, "cost": 0.50},
+            {"name": "mid", "capacitance": 10e-6, "esr": 0.005, "esl": 0.8e-9, "cost": 0.08},
+            {"name": "hf", "capacitance": 1e-6, "esr": 0.01, "esl": 0.4e-9, "cost": 0.02},
+            {"name": "rf", "capacitance": 100e-9, "esr": 0.02, "esl": 0.3e-9, "cost": 0.01},
+        ]
+        self.z_target = DecapCalculator().calculate_target_impedance(1.0, 2.0, 5)
+
+    def test_target_impedance(self):
+        """Test Z_target = ΔV / ΔI"""
+        self.assertAlmostEqual(self.z_target, 0.025)
+
+    def test_bank_is_compliant(self):
+        """Test that the optimized bank meets the target over the band"""
+        optimizer = PDNOptimizer(self.parts, (1e4, 1e8), points=100)
+        result = optimizer.optimize(self.z_target)
+
+        self.assertTrue(result["compliant"])
+        self.assertLessEqual(result["max_impedance"], self.z_target)
+        self.assertEqual(result["impedance"].shape, (100,))
+        self.assertEqual(result["num_capacitors"], sum(b["quantity"] for b in result["bank"]))
+        self.assertAlmostEqual(result["total_cost"],
+                               sum(b["quantity"] * b["part"]["cost"] for b in result["bank"]))
+
+    def test_matches_exhaustive_optimum(self):
+        """Test that the result is the cheapest bank on a small brute-forceable problem"""
+        optimizer = PDNOptimizer(self.parts, (1e4, 1e8), points=60)
+        result = optimizer.optimize(self.z_target, max_per_part=6)
+
+        best_cost = np.inf
+        for quantities in itertools.product(range(7), repeat=len(self.parts)):
+            if (optimizer.bank_impedance(quantities) <= self.z_target).all():
+                best_cost = min(best_cost, float(np.dot(quantities, optimizer.costs)))
+        self.assertAlmostEqual(result["total_cost"], best_cost)
+
+    def test_anti_resonance_is_captured(self):
+        """Test that parallel parts with different ESL produce an anti-resonance peak"""
+        optimizer = PDNOptimizer(self.parts[1:3], (1e5, 1e9), points=400)
+        pair = optimizer.bank_impedance([1, 1])
+        single = optimizer.bank_impedance([1, 0])
+        # Between the two SRFs the bank peaks above the 10µF part alone
+        self.assertTrue((pair > single).any())
+
+    def test_infeasible_target(self):
+        """Test best-effort result when the target cannot be met"""
+        optimizer = PDNOptimizer(self.parts[3:], (1e3, 1e8), points=50)
+        result = optimizer.optimize(1e-4, max_per_part=5)
+        self.assertFalse(result["compliant"])
+        self.assertGreater(result["max_impedance"], 1e-4)
+
+    def test_empty_library(self):
+        """Test that an empty library is rejected"""
+        with self.assertRaises(ValueError):
+            PDNOptimizer([], (1e3, 1e6))
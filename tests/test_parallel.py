@@ -0,0 +1,54 @@
+import unittest
+from src.batch import BatchRunner
+from src.combinations import CapacitorCombinations
+from src.optimizer import PDNOptimizer
+from src.parallel import ParallelRunner
+
+class TestParallelRunner(unittest.TestCase):
+    def setUp(self):
+        self.runner = ParallelRunner(max_workers=2)
+        self.library = [round(10 ** (i / 24), 1) * 10 ** d for d in (-7, -6) for i in range(24)]
+
+    def test_many_targets_match_serial_results(self):
+        """Test per-target fan-out keeps order and results"""
+        targets = [4.7e-6, 1.23e-6, 15e-6, 0.33e-6]
+        for topology, finder in (('parallel', CapacitorCombinations.find_parallel_combination),
+                                 ('series', CapacitorCombinations.find_series_combination)):
+            with self.subTest(topology=topology):
+                results = self.runner.find_combinations(targets, self.library, topology)
+                self.assertEqual(results, [finder(t, self.library) for t in targets])
+
+    def test_split_search_matches_serial_result(self):
+        """Test that a search split at its top-level branches is unchanged"""
+        self.assertEqual(
+            self.runner.find_combination_split(4.7e-6, self.library, max_components=4),
+            CapacitorCombinations.find_parallel_combination(4.7e-6, self.library, 4)
+        )
+        self.assertEqual(
+            self.runner.find_combination_split(1.5e-6, self.library, 'series', max_components=3),
+            CapacitorCombinations.find_series_combination(1.5e-6, self.library, 3)
+        )
+
+    def test_optimize_many(self):
+        """Test bank optimization for several targets with a shared part list"""
+        parts = [
+            {"capacitance": 100e-6, "esr": 0.01, "esl": 2e-9, "cost": 0.5},
+            {"capacitance": 1e-6, "esr": 0.01, "esl": 0.4e-9, "cost": 0.02},
+        ]
+        targets = [0.05, 0.02]
+        results = self.runner.optimize_many(parts, (1e4, 1e7), targets, points=50, max_per_part=10)
+        serial = PDNOptimizer(parts, (1e4, 1e7), 50)
+        for z_target, result in zip(targets, results):
+            expected = serial.optimize(z_target, max_per_part=10)
+            self.assertEqual(result["total_cost"], expected["total_cost"])
+
+    def test_run_jobs_in_order(self):
+        """Test streamed calculator jobs come back in input order"""
+        jobs = [{"id": i, "type": "lambda10", "frequency": 1e6 * (i + 1)} for i in range(25)]
+        results = list(self.runner.run_jobs(jobs, chunk_size=4))
+        self.assertEqual([r["id"] for r in results], list(range(25)))
+        self.assertEqual(results, list(BatchRunner().run(jobs)))
+
+        unnamed = [{"type": "lambda10", "frequency": 1e6}] * 10
+        results = list(self.runner.run_jobs(unnamed, chunk_size=4))
+        self.assertEqual([r["id"] for r in results], list(range(10)))
@@ -0,0 +1,82 @@
+import math
+import unittest
+import numpy as np
+from src.calculator import DecapCalculator
+from src.placement import MU0, PlacementAnalyzer, Stackup, candidate_grid
+
+LAYERS = [
+    {"name": "L1", "type": "signal"}, {"thickness": 0.1, "er": 4.2},
+    {"name": "GND", "type": "plane"}, {"thickness": 0.05, "er": 3.7},
+    {"name": "PWR", "type": "plane"}, {"thickness": 1.2, "er": 4.5},
+    {"name": "L4", "type": "signal"},
+]
+
+class TestPlacement(unittest.TestCase):
+    def setUp(self):
+        self.stackup = Stackup(LAYERS)
+        self.analyzer = PlacementAnalyzer(self.stackup, "PWR", "GND")
+
+    def test_stackup(self):
+        """Test depths, cavity spacing and series effective εr"""
+        self.assertAlmostEqual(self.stackup.depth("PWR"), 0.15)
+        self.assertAlmostEqual(self.stackup.spacing("GND", "PWR"), 0.05)
+        self.assertAlmostEqual(self.stackup.dielectric_constant("GND", "PWR"), 3.7)
+        self.assertAlmostEqual(self.stackup.dielectric_constant("L1", "PWR"), 0.15 / (0.1 / 4.2 + 0.05 / 3.7))
+        with self.assertRaises(ValueError):
+            Stackup([{"name": "L1"}, {"thickness": 0, "er": 4}, {"name": "L2"}])
+        with self.assertRaises(ValueError):
+            PlacementAnalyzer(self.stackup, "L1", "GND")
+
+    def test_lambda10_uses_cavity_dielectric(self):
+        """Test λ/10 limits use the cavity εr and match the calculator with that εr"""
+        calculator = DecapCalculator()
+        result = self.analyzer.analyze([[0, 0]], [[1, 0]], 1e9)
+        self.assertAlmostEqual(result["lambda10_distance"][0, 0],
+                               calculator.calculate_lambda10_distance(1e9, 3.7))
+        self.assertAlmostEqual(calculator.calculate_lambda10_distance(1e9),
+                               calculator.calculate_lambda10_distance(1e9, calculator.FR4_ER))
+
+    def test_inductance_terms(self):
+        """Test mounting, spreading and loop inductance against the closed forms"""
+        via = MU0 * 0.1e-3 / math.pi * math.acosh(1.0 / 0.3)
+        self.assertAlmostEqual(self.analyzer.mounting_inductance(), 2 * MU0 * 0.1e-3 + via)
+        self.assertGreater(self.analyzer.mounting_inductance('bottom'), 10 * self.analyzer.mounting_inductance())
+        self.assertAlmostEqual(float(self.analyzer.spreading_inductance(2.0)),
+                               MU0 * 0.05e-3 / (2 * math.pi) * math.log(4 / 0.0225))
+        result = self.analyzer.analyze([[0, 0]], [[2, 0]], 1e8, esl=0.3e-9)
+        self.assertAlmostEqual(result["loop_inductance"][0, 0],
+                               0.3e-9 + self.analyzer.mounting_inductance()
+                               + float(self.analyzer.spreading_inductance(2.0)) + result["pin_inductance"][0, 0])
+
+    def test_candidate_grid(self):
+        """Test grid offsets stay inside the radius and outside the keepout"""
+        offsets = candidate_grid(2.0, 0.5, keepout=0.5)
+        distance = np.hypot(offsets[:, 0], offsets[:, 1])
+        self.assertTrue(((distance <= 2.0) & (distance > 0.5)).all())
+        self.assertIn([1.5, -1.0], offsets.tolist())
+        self.assertNotIn([0.5, 0.0], offsets.tolist())
+
+    def test_ranking_many_placements(self):
+        """Test per-pin and board-wide ranking over tens of thousands of candidates"""
+        pins = np.random.default_rng(0).uniform(0, 50, (100, 2))
+        offsets = candidate_grid(20.0, 0.5, keepout=1.0)
+        frequencies = np.linspace(1e9, 5e9, 100)
+        result = self.analyzer.analyze(pins, offsets, frequencies, capacitance=100e-9, esr=0.02, esl=0.3e-9)
+        self.assertGreater(result["loop_inductance"].size, 100_000)
+        self.assertEqual(result["positions"].shape, (100, len(offsets), 2))
+
+        order = self.analyzer.rank(result)
+        for pin in (0, 99):  # 99 has the tightest λ/10 limit
+            within = result["within_lambda10"][pin, order[pin]]
+            self.assertFalse((~within[:-1] & within[1:]).any())  # Valid candidates come first
+            loop = result["loop_inductance"][pin, order[pin]][within]
+            self.assertTrue((np.diff(loop) >= 0).all())
+        self.assertAlmostEqual(result["distance"][0, order[0, 0]], math.hypot(1.0, 0.5))
+
+        best = self.analyzer.rank_board(result, key="impedance")[0]
+        valid = np.where(result["within_lambda10"], result["impedance"], np.inf)
+        self.assertEqual(valid[tuple(best)], valid.min())
+        self.assertFalse(result["within_lambda10"][99].all())
+
+if __name__ == '__main__':
+    unittest.main()
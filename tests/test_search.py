@@ -0,0 +1,136 @@
+import random
+import time
+import unittest
+from src.search import ParallelSearch, SeriesSearch
+
+def reference_parallel(target, available_values, max_components=3):
+    """Original exhaustive recursive parallel search, kept as the reference"""
+    results = []
+    available_values = sorted(available_values)
+
+    def find_combinations(remaining, current, start_idx):
+        if len(current) > max_components:
+            return
+        if abs(remaining) < target * 0.01:
+            results.append(current.copy())
+            return
+        for i in range(start_idx, len(available_values)):
+            if available_values[i] <= remaining:
+                current.append(available_values[i])
+                find_combinations(remaining - available_values[i], current, i)
+                current.pop()
+
+    find_combinations(target, [], 0)
+    return results
+
+def reference_series(target, available_values, max_components=3):
+    """Original exhaustive recursive series search, kept as the reference"""
+    results = []
+    available_values = sorted(available_values, reverse=True)
+
+    def find_combinations(current, start_idx):
+        current_cap = 1 / sum(1/c for c in current) if current else float('inf')
+        if len(current) > max_components:
+            return
+        if abs(current_cap - target) < target * 0.01:
+            results.append(current.copy())
+            return
+        for i in range(start_idx, len(available_values)):
+            current.append(available_values[i])
+            find_combinations(current, i)
+            current.pop()
+
+    find_combinations([], 0)
+    return results
+
+def e_series(count, decades):
+    """Build a synthetic E-series library over the given decades"""
+    base = [round(10 ** (i / count), 2) for i in range(count)]
+    return [b * 10 ** d for d in decades for b in base]
+
+class TestParallelSearch(unittest.TestCase):
+    def test_matches_reference_search(self):
+        """Test that the pruned search returns exactly the reference result list"""
+        rng = random.Random(1)
+        decade = [1, 2.2, 3.3, 4.7, 6.8, 10, 15, 22, 33, 47, 68, 100]
+        for trial in range(200):
+            library = [rng.choice(decade) * rng.choice([0.1, 1, 10])
+                       for _ in range(rng.randint(1, 12))]
+            max_components = rng.randint(1, 5)
+            target = rng.choice([1, 5, 10, 12.5, 33.3, 47, 79, 100, 150, 250])
+            with self.subTest(trial=trial):
+                self.assertEqual(
+                    ParallelSearch(library, max_components).find(target),
+                    reference_parallel(target, library, max_components)
+                )
+
+    def test_triple_table_matches_recursion(self):
+        """Test that triple-sum lookups agree with the pair-only search"""
+        library = e_series(24, [-6])
+        with_triples = ParallelSearch(library, 4)
+        without_triples = ParallelSearch(library, 4)
+        without_triples.TRIPLE_TABLE_LIMIT = 0
+
+        for target in (4.7e-6, 10e-6, 15.5e-6):
+            with self.subTest(target=target):
+                self.assertEqual(with_triples.find(target), without_triples.find(target))
+
+    def test_custom_tolerance(self):
+        """Test that a wider tolerance admits more combinations"""
+        library = [10e-6, 22e-6, 47e-6]
+        exact = ParallelSearch(library).find(80e-6)
+        loose = ParallelSearch(library).find(80e-6, tolerance=0.05)
+        self.assertEqual(exact, [])
+        self.assertIn([10e-6, 22e-6, 47e-6], loose)
+
+    def test_unreachable_target_is_pruned(self):
+        """Test that tiny parts next to a huge target return immediately"""
+        library = e_series(192, [-12, -11])
+        start = time.perf_counter()
+        results = ParallelSearch(library, 6).find(1e-3)
+        self.assertEqual(results, [])
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+    def test_large_library_is_fast(self):
+        """Test a three-part search over a 288-value E96 library"""
+        library = e_series(96, [-7, -6, -5])
+        start = time.perf_counter()
+        results = ParallelSearch(library, 3).find(4.7e-6)
+        self.assertLess(time.perf_counter() - start, 1.0)
+        for combo in results:
+            self.assertLess(abs(sum(combo) - 4.7e-6), 4.7e-6 * 0.01 * (1 + 1e-9))
+
+
+class TestSeriesSearch(unittest.TestCase):
+    def test_matches_reference_search(self):
+        """Test that the pruned search returns exactly the reference result list"""
+        rng = random.Random(2)
+        decade = [1, 2.2, 3.3, 4.7, 6.8, 10, 15, 22, 33, 47, 68, 100]
+        for trial in range(200):
+            library = [rng.choice(decade) * rng.choice([0.1, 1, 10])
+                       for _ in range(rng.randint(1, 10))]
+            max_components = rng.randint(1, 4)
+            target = rng.choice([0.5, 1, 1.1, 2.35, 2.5, 3.3, 4.7, 5, 7.9, 10])
+            with self.subTest(trial=trial):
+                self.assertEqual(
+                    SeriesSearch(library, max_components).find(target),
+                    reference_series(target, library, max_components)
+                )
+
+    def test_custom_tolerance(self):
+        """Test that the tolerance band is configurable"""
+        library = [10e-6, 22e-6]
+        self.assertEqual(SeriesSearch(library, 2).find(7e-6), [])
+        self.assertEqual(SeriesSearch(library, 2).find(7e-6, tolerance=0.02),
+                         [[22e-6, 10e-6]])
+
+    def test_large_library_is_fast(self):
+        """Test a three-part series search over a 288-value E96 library"""
+        library = e_series(96, [-7, -6, -5])
+        start = time.perf_counter()
+        results = SeriesSearch(library, 3).find(2.2e-6)
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertGreater(len(results), 0)
+        for combo in results:
+            value = 1 / sum(1 / c for c in combo)
+            self.assertLess(abs(value - 2.2e-6), 2.2e-6 * 0.01 * (1 + 1e-9))
@@ -0,0 +1,172 @@
+import asyncio
+import json
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.loadgen import request, request_mix, run_load
+from src.calculator import DecapCalculator
+from src.combinations import CapacitorCombinations
+from src.server import (MAX_COMPONENTS, MAX_LIBRARY, MAX_POINTS, SEARCH_TIME_LIMIT, DecapServer, LRUCache,
+                        normalize)
+
+LIBRARY = [1e-6, 2.2e-6, 4.7e-6, 10e-6, 22e-6, 47e-6]
+
+class TestServerParts(unittest.TestCase):
+    def test_lru_cache(self):
+        """Test eviction order and hit/miss counters"""
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), (True, 1))
+        cache.put("c", 3)  # Evicts "b", the least recently used
+        self.assertEqual(cache.get("b"), (False, None))
+        self.assertEqual(cache.get("c"), (True, 3))
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"], stats["size"]), (2, 1, 1, 2))
+
+    def test_normalize(self):
+        """Test defaults, coercion, library ordering and validation"""
+        params = normalize("/combinations/parallel", {"target": "1e-5", "available_values": [2e-6, 1e-6]})
+        self.assertEqual(params, {"target": 1e-5, "available_values": [1e-6, 2e-6],
+                                  "max_components": 3, "tolerance": 0.01, "top_k": 0,
+                                  "time_limit": SEARCH_TIME_LIMIT, "max_nodes": 0})
+        with self.assertRaises(ValueError):
+            normalize("/lambda10", {})
+        with self.assertRaises(ValueError):
+            normalize("/lambda10", {"frequency": 1e6, "speed": 3})
+        with self.assertRaises(ValueError):
+            normalize("/impedance", {"capacitance": 1e-6, "esr": 0.1, "freq_range": [1e3]})
+
+    def test_search_limits(self):
+        """Test that oversized or unbounded combination searches are rejected"""
+        base = {"target": 1e-5, "available_values": [1e-6, 2e-6]}
+        for extra in ({"max_components": MAX_COMPONENTS + 1}, {"max_components": 0},
+                      {"available_values": [1e-6] * (MAX_LIBRARY + 1)},
+                      {"time_limit": SEARCH_TIME_LIMIT * 10}, {"time_limit": 0}, {"max_nodes": -1}):
+            with self.subTest(extra=list(extra)):
+                with self.assertRaises(ValueError):
+                    normalize("/combinations/parallel", dict(base, **extra))
+
+    def test_sweep_limits(self):
+        """Test that impedance sweeps beyond MAX_POINTS or below one point are rejected"""
+        base = {"capacitance": 1e-6, "esr": 0.01, "freq_range": [1e3, 1e9]}
+        self.assertEqual(normalize("/impedance", dict(base, points=MAX_POINTS))["points"], MAX_POINTS)
+        for points in (MAX_POINTS + 1, 0):
+            with self.subTest(points=points):
+                with self.assertRaises(ValueError):
+                    normalize("/impedance", dict(base, points=points))
+
+class TestDecapServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.executor = ThreadPoolExecutor(2)
+        self.server = DecapServer("127.0.0.1", 0, cache_size=64, executor=self.executor)
+        self.host, self.port = await self.server.start()
+
+    async def asyncTearDown(self):
+        await self.server.stop()
+        self.executor.shutdown()
+
+    async def test_endpoints_match_library_calls(self):
+        """Test responses over localhost against direct calls"""
+        self.assertEqual(await request(self.host, self.port, "GET", "/health"), (200, {"status": "ok"}))
+
+        status, body = await request(self.host, self.port, "POST", "/power-decoupling",
+                                     {"voltage": 3.3, "current_draw": 2.0, "switching_freq": 500e3})
+        expected = DecapCalculator().calculate_power_decoupling(3.3, 2.0, 5, 500e3)
+        self.assertEqual(status, 200)
+        self.assertEqual(body, json.loads(json.dumps(expected)))
+
+        status, body = await request(self.host, self.port, "POST", "/combinations/parallel",
+                                     {"target": 12e-6, "available_values": LIBRARY, "tolerance": 0.1})
+        self.assertEqual(body, CapacitorCombinations.find_parallel_combination(12e-6, LIBRARY, 3, 0.1))
+
+        status, body = await request(self.host, self.port, "POST", "/combinations/series",
+                                     {"target": 3e-6, "available_values": LIBRARY, "top_k": 2,
+                                      "tolerance": 0.1})
+        self.assertEqual(body, CapacitorCombinations.top_series_combinations(3e-6, LIBRARY, 2, 3, 0.1))
+
+    async def test_cache_hits_on_equivalent_requests(self):
+        """Test repeated and reordered requests are served from the cache"""
+        payload = {"target": 12e-6, "available_values": LIBRARY, "tolerance": 0.1}
+        first = await request(self.host, self.port, "POST", "/combinations/parallel", payload)
+        shuffled = dict(payload, available_values=list(reversed(LIBRARY)), max_components=3)
+        second = await request(self.host, self.port, "POST", "/combinations/parallel", shuffled)
+        self.assertEqual(first, second)
+        _, stats = await request(self.host, self.port, "GET", "/stats")
+        self.assertEqual((stats["cache"]["hits"], stats["cache"]["misses"]), (1, 1))
+
+    async def test_errors(self):
+        """Test unknown endpoints, wrong methods and bad bodies"""
+        self.assertEqual((await request(self.host, self.port, "POST", "/nope", {}))[0], 404)
+        self.assertEqual((await request(self.host, self.port, "GET", "/lambda10"))[0], 405)
+        status, body = await request(self.host, self.port, "POST", "/lambda10", {})
+        self.assertEqual(status, 400)
+        self.assertIn("frequency", body["error"])
+        status, _ = await request(self.host, self.port, "POST", "/power-decoupling",
+                                  {"voltage": 3.3, "current_draw": 0})
+        self.assertEqual(status, 400)
+
+    async def test_rejects_non_physical_inputs_and_non_finite_results(self):
+        """Test negative or infinite inputs and results that overflow give 400, never bare Infinity"""
+        for path, payload in (("/power-decoupling", {"voltage": 3.3, "current_draw": 1,
+                                                     "switching_freq": -5}),
+                              ("/signal-decoupling", {"signal_freq": 1e400}),
+                              ("/impedance", {"capacitance": 0, "esr": 0.01, "freq_range": [1e3, 1e6]}),
+                              ("/impedance", {"capacitance": 1e-6, "esr": 0.01, "freq_range": [1e6, 1e3]}),
+                              ("/combinations/parallel", {"target": 1e-6, "available_values": [-1e-6]})):
+            with self.subTest(path=path, payload=payload):
+                status, body = await request(self.host, self.port, "POST", path, payload)
+                self.assertEqual(status, 400)
+                self.assertIn("Invalid value", body["error"])
+
+        status, body = await request(self.host, self.port, "POST", "/impedance",
+                                     {"capacitance": 1e-320, "esr": 0.01, "freq_range": [1e3, 1e6]})
+        self.assertEqual(status, 400)
+        self.assertIn("not finite", body["error"])
+
+    async def test_search_budgets(self):
+        """Test that searches stop at their budget: top_k answers, full lists report an error"""
+        library = [round(10 ** (i / 192), 3) * 10 ** d for d in (-7, -6, -5) for i in range(192)]
+        payload = {"target": 4.7e-6, "available_values": library, "max_components": 6, "time_limit": 0.05}
+        status, body = await request(self.host, self.port, "POST", "/combinations/parallel",
+                                     dict(payload, top_k=5))
+        self.assertEqual(status, 200)
+        self.assertEqual(len(body), 5)
+
+        status, body = await request(self.host, self.port, "POST", "/combinations/parallel",
+                                     dict(payload, max_nodes=100))
+        self.assertEqual(status, 400)
+        self.assertIn("budget", body["error"])
+
+    async def test_coalesces_identical_inflight_requests(self):
+        """Test concurrent identical requests share one computation"""
+        body = json.dumps({"target": 47e-6, "available_values": LIBRARY, "max_components": 4}).encode()
+        results = await asyncio.gather(*(self.server.handle("POST", "/combinations/parallel", body)
+                                         for _ in range(5)))
+        self.assertEqual(len({json.dumps(r) for r in results}), 1)
+        self.assertEqual(self.server.coalesced, 4)
+        self.assertEqual(self.server.cache.stats()["size"], 1)
+
+    async def test_load_generator(self):
+        """Test the load generator reports throughput and latency percentiles"""
+        report = await run_load(self.host, self.port, request_mix(200, distinct=5), concurrency=8)
+        self.assertEqual(report["requests"], 200)
+        self.assertEqual(report["errors"], 0)
+        self.assertGreater(report["throughput"], 0)
+        self.assertLessEqual(report["p50_ms"], report["p99_ms"])
+        self.assertGreater(self.server.cache.hits, 0)
+
+class TestProcessPoolServer(unittest.IsolatedAsyncioTestCase):
+    async def test_search_in_worker_process(self):
+        """Test an offloaded search through the default process pool"""
+        server = DecapServer("127.0.0.1", 0, workers=1)
+        host, port = await server.start()
+        try:
+            status, body = await request(host, port, "POST", "/combinations/series",
+                                         {"target": 3e-6, "available_values": LIBRARY, "tolerance": 0.1})
+        finally:
+            await server.stop()
+        self.assertEqual(status, 200)
+        self.assertEqual(body, CapacitorCombinations.find_series_combination(3e-6, LIBRARY, 3, 0.1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+from src.combinations import CapacitorCombinations
+from src.synthesis import NetworkSynthesizer
+
+class TestNetworkSynthesizer(unittest.TestCase):
+    def setUp(self):
+        self.library = [1e-6, 2.2e-6, 4.7e-6, 10e-6, 22e-6, 47e-6]
+        self.synthesizer = NetworkSynthesizer(self.library, max_parts=4)
+
+    def test_mixed_topology_reaches_new_targets(self):
+        """Test a target that needs a series pair in parallel with a third part"""
+        # 22µF in parallel with (10µF series 10µF) = 27µF
+        library = [10e-6, 22e-6]
+        target = 27e-6
+        self.assertEqual(CapacitorCombinations.find_parallel_combination(target, library), [])
+        self.assertEqual(CapacitorCombinations.find_series_combination(target, library), [])
+
+        results = NetworkSynthesizer(library, max_parts=3).find(target)
+        self.assertTrue(results)
+        self.assertEqual(results[0]["num_parts"], 3)
+        self.assertAlmostEqual(results[0]["value"], target)
+        self.assertIn("series(", results[0]["topology"])
+        self.assertIn("parallel(", results[0]["topology"])
+
+    def test_table_is_deduplicated_across_sizes(self):
+        """Test that each value is stored once, at its smallest network size"""
+        self.synthesizer.build()
+        sizes = [len(level["value"]) for level in self.synthesizer.levels]
+        self.assertEqual(sizes[0], len(self.library))
+        self.assertEqual(self.synthesizer.size, sum(sizes))
+
+        keys = [k for level in self.synthesizer.levels
+                for k in self.synthesizer._keys(level["value"]).tolist()]
+        self.assertEqual(len(keys), len(set(keys)))
+
+    def test_parts_reproduce_network_value(self):
+        """Test that reported parts and values are consistent"""
+        for result in self.synthesizer.find(8e-6, tolerance=0.02):
+            with self.subTest(topology=result["topology"]):
+                self.assertEqual(len(result["parts"]), result["num_parts"])
+                self.assertLess(result["error"], 0.02)
+                for part in result["parts"]:
+                    self.assertIn(part, self.library)
+
+    def test_ranking(self):
+        """Test ranking by part count and by error"""
+        by_parts = self.synthesizer.find(8e-6, tolerance=0.05, rank_by='parts')
+        by_error = self.synthesizer.find(8e-6, tolerance=0.05, rank_by='error', limit=5)
+
+        counts = [r["num_parts"] for r in by_parts]
+        self.assertEqual(counts, sorted(counts))
+        errors = [r["error"] for r in by_error]
+        self.assertEqual(errors, sorted(errors))
+        self.assertEqual(len(by_error), 5)
+
+        with self.assertRaises(ValueError):
+            self.synthesizer.find(8e-6, rank_by='cost')
+
+    def test_memory_budget(self):
+        """Test that the table never grows past its entry budget"""
+        synthesizer = NetworkSynthesizer(self.library, max_parts=5, max_entries=100)
+        synthesizer.build()
+        self.assertLessEqual(synthesizer.size, 100)
+        self.assertTrue(synthesizer.truncated)
@@ -0,0 +1,108 @@
+import io
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.calculator import DecapCalculator
+from src.optimizer import PDNOptimizer
+from src.touchstone import MeasuredImpedanceStore, parse_touchstone, shunt_through_impedance
+
+PARTS = [
+    {"name": "mid", "capacitance": 10e-6, "esr": 0.005, "esl": 0.8e-9, "cost": 0.08},
+    {"name": "hf", "capacitance": 1e-6, "esr": 0.01, "esl": 0.4e-9, "cost": 0.02},
+    {"name": "rf", "capacitance": 100e-9, "esr": 0.02, "esl": 0.3e-9, "cost": 0.01},
+]
+
+def write_s2p(path, part, frequencies, data_format="MA"):
+    """Shunt-through S-parameters of an R-L-C part as a Touchstone file"""
+    z = DecapCalculator().complex_impedance_at([part["capacitance"]], [part["esr"]], frequencies,
+                                               [part["esl"]])[0]
+    s21 = 2 * z / (2 * z + 50)
+    s11 = s21 - 1
+    with open(path, "w") as f:
+        f.write(f"! {part['name']}\n# MHZ S {data_format} R 50\n")
+        for freq, a, b in zip(frequencies / 1e6, s11, s21):
+            pairs = []
+            for value in (a, b, b, a):
+                if data_format == "RI":
+                    pairs += [value.real, value.imag]
+                else:
+                    magnitude = 20 * np.log10(abs(value)) if data_format == "DB" else abs(value)
+                    pairs += [magnitude, np.degrees(np.angle(value))]
+            f.write(f"{freq:.12g} " + " ".join(f"{x:.12g}" for x in pairs) + "\n")
+
+class TestTouchstone(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.frequencies = np.logspace(4, 9, 501)
+        self.paths = []
+        for part, data_format in zip(PARTS, ("MA", "DB", "RI")):
+            path = os.path.join(self.tmp.name, f"{part['name']}.s2p")
+            write_s2p(path, part, self.frequencies, data_format)
+            self.paths.append(path)
+        self.calculator = DecapCalculator()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_parse_formats_and_shunt_through(self):
+        """Test MA, DB and RI files convert back to the model impedance"""
+        for part, path in zip(PARTS, self.paths):
+            with self.subTest(part=part["name"]):
+                frequencies, s21, z0 = parse_touchstone(path)
+                np.testing.assert_allclose(frequencies, self.frequencies)
+                expected = self.calculator.complex_impedance_at([part["capacitance"]], [part["esr"]],
+                                                                frequencies, [part["esl"]])[0]
+                np.testing.assert_allclose(shunt_through_impedance(s21, z0), expected, rtol=1e-6)
+
+    def test_parse_errors(self):
+        """Test unsupported and malformed files are rejected"""
+        for text in ("# GHZ Z MA R 50\n1 0 0 0 0 0 0 0 0\n", "# GHZ S MA R 50\n1 0 0 0\n",
+                     "[Version] 2.0\n", "# GHZ S MA R 50\n1 a 0 0 0 0 0 0 0\n"):
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                parse_touchstone(io.StringIO(text))
+
+    def test_interpolation_onto_grid(self):
+        """Test interpolated impedance tracks the model between and beyond measured points"""
+        store = MeasuredImpedanceStore.from_touchstone(self.paths)
+        self.assertEqual(store.names, ["mid", "hf", "rf"])
+        grid = np.logspace(3.5, 9.5, 333)
+        z = store.impedance_at(["rf", "mid"], grid)
+        inside = (grid >= 1e4) & (grid <= 1e9)
+        for row, part in zip(z, (PARTS[2], PARTS[0])):
+            expected = self.calculator.complex_impedance_at([part["capacitance"]], [part["esr"]], grid,
+                                                            [part["esl"]])[0]
+            np.testing.assert_allclose(np.abs(row[inside]), np.abs(expected[inside]), rtol=0.01)
+            self.assertAlmostEqual(abs(row[0]), abs(store.curve(part["name"])[1][0]), places=6)
+        freqs, magnitude = self.calculator.calculate_measured_impedance(store, ["hf"], (1e4, 1e9), 50)
+        np.testing.assert_allclose(magnitude[0], np.abs(store.impedance_at(["hf"], freqs)[0]))
+
+    def test_save_mmap_and_staleness(self):
+        """Test the store reloads memory-mapped and rebuilds when a file changes"""
+        directory = os.path.join(self.tmp.name, "store")
+        store = MeasuredImpedanceStore.open_or_build(directory, self.paths)
+        loaded = MeasuredImpedanceStore.load(directory, self.paths)
+        self.assertIsInstance(loaded.log_magnitude, np.memmap)
+        grid = np.logspace(4, 9, 50)
+        np.testing.assert_array_equal(loaded.impedance_at(["hf"], grid), store.impedance_at(["hf"], grid))
+
+        write_s2p(self.paths[1], dict(PARTS[1], esr=0.05), self.frequencies[::2])
+        os.utime(self.paths[1], ns=(0, 1))
+        with self.assertRaises(ValueError):
+            MeasuredImpedanceStore.load(directory, self.paths)
+        rebuilt = MeasuredImpedanceStore.open_or_build(directory, self.paths)
+        self.assertEqual(len(rebuilt.curve("hf")[0]), 251)
+
+    def test_optimizer_uses_measured_parts(self):
+        """Test PDNOptimizer rows come from measured curves for parts in the store"""
+        store = MeasuredImpedanceStore.from_touchstone(self.paths[:2])
+        lossy = [dict(PARTS[0], esr=1.0), dict(PARTS[1], esr=1.0), PARTS[2]]  # Model values ignored
+        measured = PDNOptimizer(lossy, (1e4, 1e8), points=100, measured=store)
+        model = PDNOptimizer(PARTS, (1e4, 1e8), points=100)
+        np.testing.assert_allclose(np.abs(1 / measured.admittance), np.abs(1 / model.admittance), rtol=0.01)
+        z_target = self.calculator.calculate_target_impedance(1.0, 2.0, 5)
+        self.assertEqual([b["quantity"] for b in measured.optimize(z_target)["bank"]],
+                         [b["quantity"] for b in model.optimize(z_target)["bank"]])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import numpy as np
+from src.calculator import DecapCalculator
+from src.transient import TransientSimulator, load_pulse
+
+BANK = [{"capacitance": 10e-6, "esr": 0.005, "esl": 0.5e-9},
+        {"capacitance": 100e-9, "esr": 0.02, "esl": 0.3e-9, "quantity": 4}]
+
+def step_by_step(simulator, current):
+    """Reference: the discrete recurrence one step at a time"""
+    state, voltage = np.zeros(len(simulator.a)), []
+    for value in current:
+        state = simulator.a @ state + simulator.b * value
+        voltage.append(state[0])
+    return np.array(voltage)
+
+class TestTransientSimulator(unittest.TestCase):
+    def test_blocks_match_recurrence(self):
+        """Test blocked FFT evaluation against the step-by-step recurrence"""
+        current = np.random.default_rng(0).standard_normal(3000)
+        for options in ({}, {"source_resistance": 0.01, "source_inductance": 20e-9}):
+            with self.subTest(options=options):
+                simulator = TransientSimulator(BANK, 1e-9, block_size=256, **options)
+                np.testing.assert_allclose(simulator.simulate(current),
+                                           step_by_step(simulator, current), atol=1e-12)
+
+    def test_chunking_does_not_change_result(self):
+        """Test arbitrary input chunk sizes give the same waveform"""
+        simulator = TransientSimulator(BANK, 1e-9, block_size=128)
+        current = np.concatenate(list(load_pulse(2.0, 1e-6, 3e-6, 1e-9, rise_time=1e-8)))
+        streamed = np.concatenate(list(simulator.stream([current[:5], current[5:1000], current[1000:]])))
+        np.testing.assert_allclose(streamed, simulator.simulate(current), atol=1e-15)
+
+    def test_capacitor_charge_and_source_droop(self):
+        """Test long-step droop against I·t/C + I·ESR and the regulator's I·R"""
+        part = [{"capacitance": 10e-6, "esr": 0.01, "esl": 1e-9}]
+        caps_only = TransientSimulator(part, 1e-8, plane_capacitance=1e-12)
+        self.assertAlmostEqual(caps_only.simulate(np.ones(100_000))[-1], -(1e-3 / 10e-6 + 0.01), places=4)
+        regulated = TransientSimulator(part, 1e-8, source_resistance=0.02, source_inductance=50e-9)
+        self.assertAlmostEqual(regulated.simulate(np.ones(200_000))[-1], -0.02, places=9)
+
+    def test_streams_millions_of_steps(self):
+        """Test peak droop over a two-million-step waveform streamed in chunks"""
+        simulator = TransientSimulator(BANK, 1e-9, source_resistance=0.01, source_inductance=10e-9)
+        report = simulator.peak_droop(load_pulse(1.0, 1e-3, 2e-3, 1e-9, rise_time=1e-7), 3.3)
+        self.assertEqual(report["steps"], 2_000_000)
+        self.assertGreater(report["peak_droop"], 0.01)  # At least the regulator's I·R
+        self.assertTrue(report["within_ripple"])
+        self.assertLess(report["time_of_peak_droop"], 1e-3)
+
+    def test_power_decoupling_check(self):
+        """Test the sized bank's droop over one switching period against the ripple budget"""
+        calculator = DecapCalculator()
+        sizing = calculator.calculate_power_decoupling(5, 1, 5)
+        report = calculator.calculate_load_step_droop(5, 1, 5)
+        # 120 Hz: the charge drawn over one period dominates, I/(C·f) = ΔV / 1.5
+        self.assertAlmostEqual(report["peak_droop"], 1 / (sizing["total_capacitance"] * 120), delta=0.01)
+        self.assertTrue(report["within_ripple"])
+        # 1 MHz, 10 A: the ESL·di/dt spike alone exceeds a 3% budget on a 1 V rail
+        self.assertFalse(calculator.calculate_load_step_droop(1.0, 10, 3, 1e6)["within_ripple"])
+
+    def test_validation(self):
+        """Test rejected banks and settings"""
+        with self.assertRaises(ValueError):
+            TransientSimulator([], 1e-9)
+        with self.assertRaises(ValueError):
+            TransientSimulator([{"capacitance": 1e-6, "esr": 0.0}], 1e-9)
+        with self.assertRaises(ValueError):
+            TransientSimulator(BANK, 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import csv
+import io
+import json
+import math
+import tempfile
+import unittest
+import numpy as np
+from src.combinations import CapacitorCombinations
+from src.utils import (format_capacitance, format_capacitance_array, format_fixed, format_frequency,
+                       format_frequency_array, format_impedance, format_impedance_array,
+                       format_scientific)
+from src.writers import (ColumnarWriter, CSVWriter, JSONLinesWriter, combination_chunks, read_columnar,
+                         sweep_chunks, write_chunks)
+
+E12 = [v * 10.0 ** e for e in range(-9, -5) for v in (1.0, 1.2, 1.5, 1.8, 2.2, 2.7, 3.3, 3.9, 4.7, 5.6, 6.8, 8.2)]
+
+def sample_values():
+    """Log-spaced values plus unit boundaries, rounding ties and non-finite values"""
+    rng = np.random.default_rng(7)
+    values = 10 ** rng.uniform(-14, 11, 20000)
+    edges = [0.0, -0.0, 1e-12, 1e-9, 999.995, 999.994999, 1e3, 1e6, 0.125, 2.675, 1e9,
+             -4.7e-6, 0.005, 1e-320, 1e300, math.inf, -math.inf, math.nan]
+    return np.concatenate([values, -values[:100], edges])
+
+class TestArrayFormatters(unittest.TestCase):
+    def test_si_formatters_match_scalar_versions(self):
+        """Array SI formatters give exactly the scalar formatters' strings"""
+        values = sample_values()
+        for array, scalar in ((format_capacitance_array, format_capacitance),
+                              (format_frequency_array, format_frequency),
+                              (format_impedance_array, format_impedance)):
+            self.assertEqual(array(values).tolist(), [scalar(v) for v in values.tolist()])
+
+    def test_fixed_and_scientific_match_format_specs(self):
+        """format_fixed and format_scientific match Python's f and e formatting"""
+        values = sample_values()
+        for decimals in (0, 2, 3):
+            self.assertEqual(format_fixed(values, decimals).tolist(),
+                             [f"{v:.{decimals}f}" for v in values.tolist()])
+        for digits in (1, 6, 15):
+            self.assertEqual(format_scientific(values, digits).tolist(),
+                             [f"{v:.{digits - 1}e}" for v in values.tolist()])
+        with self.assertRaises(ValueError):
+            format_scientific(values, 17)
+
+class TestWriters(unittest.TestCase):
+    def setUp(self):
+        self.chunks = list(sweep_chunks(E12[:10], [0.01] * 10, (1e3, 1e9), 50, [0.5e-9] * 10,
+                                        chunk_size=120))
+
+    def test_csv_matches_csv_module(self):
+        """CSV output equals csv.writer fed the scalar formatters"""
+        buffer = io.StringIO()
+        rows = write_chunks(CSVWriter(buffer, {"frequency": format_frequency_array}), self.chunks)
+        self.assertEqual(rows, 500)
+
+        expected = io.StringIO()
+        writer = csv.writer(expected, lineterminator="\n")
+        writer.writerow(["part", "frequency", "impedance"])
+        for chunk in self.chunks:
+            for part, freq, z in zip(*(chunk[name].tolist() for name in chunk)):
+                writer.writerow([part, format_frequency(freq), repr(z)])
+        self.assertEqual(buffer.getvalue(), expected.getvalue())
+
+    def test_jsonl_matches_json_dumps(self):
+        """JSON lines equal json.dumps of each row, including strings and NaN"""
+        chunk = {"name": np.array(['a "quoted", part', "µF", "a \"quoted\", part"]),
+                 "value": np.array([1.5e-6, math.nan, -math.inf]),
+                 "ok": np.array([True, False, True])}
+        buffer = io.StringIO()
+        write_chunks(JSONLinesWriter(buffer), [chunk])
+        expected = [json.dumps({"name": n, "value": v, "ok": o})
+                    for n, v, o in zip(*(chunk[name].tolist() for name in chunk))]
+        self.assertEqual(buffer.getvalue().splitlines(), expected)
+
+        buffer = io.StringIO()
+        write_chunks(JSONLinesWriter(buffer, float_digits=3), [{"value": np.array([1.2345e-6])}])
+        self.assertEqual(buffer.getvalue(), '{"value": 1.23e-06}\n')
+
+    def test_combination_chunks(self):
+        """Finder output becomes padded 2-D columns: CSV columns and JSON lists"""
+        matches = list(CapacitorCombinations.iter_parallel_combination(10e-6, E12, 3, 0.02))
+        buffer = io.StringIO()
+        rows = write_chunks(JSONLinesWriter(buffer), combination_chunks(iter(matches), 3, chunk_size=5))
+        self.assertEqual(rows, len(matches))
+        for line, combo in zip(buffer.getvalue().splitlines(), matches):
+            row = json.loads(line)
+            self.assertEqual(row["values"], list(combo))
+            self.assertEqual(row["count"], len(combo))
+            self.assertAlmostEqual(row["total"], sum(combo))
+
+        buffer = io.StringIO()
+        write_chunks(CSVWriter(buffer), combination_chunks(iter(matches[:1]), 3))
+        header, first = buffer.getvalue().splitlines()
+        self.assertEqual(header, "total,count,values_1,values_2,values_3")
+        self.assertEqual(first.count(","), 4)
+        with self.assertRaises(ValueError):
+            next(combination_chunks(iter(matches), 3, topology="ladder"))
+
+    def test_columnar_round_trip(self):
+        """Columnar output memory-maps back to the written arrays"""
+        with tempfile.TemporaryDirectory() as directory:
+            rows = write_chunks(ColumnarWriter(directory), self.chunks)
+            columns = read_columnar(directory)
+            self.assertEqual(rows, 500)
+            self.assertIsInstance(columns["impedance"], np.memmap)
+            for name in ("part", "frequency", "impedance"):
+                np.testing.assert_array_equal(columns[name], np.concatenate([c[name] for c in self.chunks]))
+            del columns
+
+            with self.assertRaises(ValueError):
+                ColumnarWriter(directory).write({"name": np.array(["a"])})
+
+    def test_column_mismatch_raises(self):
+        """Chunks must keep the first chunk's columns"""
+        writer = CSVWriter(io.StringIO())
+        writer.write(self.chunks[0])
+        with self.assertRaises(ValueError):
+            writer.write({"part": np.array([0])})
+
+if __name__ == '__main__':
+    unittest.main()